@@ -18,10 +18,13 @@ from .config_schema import *
 from .configurable_csc import *
 from .controller import *
 from .csc_commander import *
+from .csc_host import *
 from .csc_utils import *
 from .domain import *
 from .hierarchical_update import *
 from .make_mock_write_topics import *
+from .multi_index_controller import *
+from .periodic_scheduler import *
 from .remote import *
 from .sal_enums import *
 from .sal_info import *
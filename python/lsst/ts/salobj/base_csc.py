@@ -26,12 +26,12 @@ __all__ = ["BaseCsc"]
 import argparse
 import asyncio
 import enum
+import math
 import signal
 import sys
 import typing
 from collections.abc import Sequence
 
-from lsst.ts import utils
 from lsst.ts.xml import __version__ as xml_version
 from lsst.ts.xml import type_hints
 from lsst.ts.xml.sal_enums import State
@@ -40,6 +40,7 @@ from . import base
 from .controller import Controller
 from .csc_utils import make_state_transition_dict
 from .domain import Domain
+from .periodic_scheduler import PeriodicCallback
 from .remote import Remote
 
 HEARTBEAT_INTERVAL = 1  # seconds
@@ -47,6 +48,14 @@ HEARTBEAT_INTERVAL = 1  # seconds
 # How many heartbeats to wait for in
 DUPLICATE_HEARTBEAT_INTERVAL_FACTOR = 5
 
+# Timeout for reading recent heartbeats
+# (in units of heartbeat_interval).
+DUPLICATE_HEARTBEAT_MAX_AGE_FACTOR = 3
+
+# Delay between the two reads of recent heartbeats that look for
+# a heartbeat from a live duplicate CSC (in units of heartbeat_interval).
+DUPLICATE_HEARTBEAT_RECHECK_FACTOR = 1.5
+
 
 class BaseCsc(Controller):
     """Base class for a Commandable SAL Component (CSC)
@@ -92,6 +101,9 @@ class BaseCsc(Controller):
     discard_out_of_order_events : `bool`
         If True, discard event messages that arrive out of order. The default
         is True.
+    domain : `Domain` or `None`, optional
+        Domain to share with other CSCs; see `CscHost`.
+        If None (the usual case) then the CSC makes its own domain.
 
     Raises
     ------
@@ -142,6 +154,8 @@ class BaseCsc(Controller):
         at startup (before starting the heartbeat loop)?
     heartbeat_interval : `float`
         Interval between heartbeat events, in seconds.
+        If changed while the CSC is running, the next heartbeat
+        is rescheduled to use the new value.
 
     Notes
     -----
@@ -196,6 +210,7 @@ class BaseCsc(Controller):
         extra_commands: set[str] = set(),
         discard_out_of_order_telemetry: bool = True,
         discard_out_of_order_events: bool = True,
+        domain: Domain | None = None,
     ) -> None:
         # Check class variables
         if not hasattr(self, "version"):
@@ -222,7 +237,7 @@ class BaseCsc(Controller):
         self._summary_state = State(self.default_initial_state)
         self._initial_state = initial_state
         self._faulting = False
-        self._heartbeat_task = utils.make_done_future()
+        self._heartbeat_callback: PeriodicCallback | None = None
         # Interval between heartbeat events (sec)
         self.heartbeat_interval = HEARTBEAT_INTERVAL
 
@@ -240,6 +255,7 @@ class BaseCsc(Controller):
             extra_commands=extra_commands,
             discard_out_of_order_telemetry=discard_out_of_order_telemetry,
             discard_out_of_order_events=discard_out_of_order_events,
+            domain=domain,
         )
 
         # Set evt_simulationMode, now that it is available.
@@ -256,36 +272,92 @@ class BaseCsc(Controller):
     async def check_for_duplicate_heartbeat(
         self, num_messages: int = DUPLICATE_HEARTBEAT_INTERVAL_FACTOR
     ) -> int:
-        """Monitor heartbeat events and return True if any have a different
-        private_origin.
+        """Look for a recent heartbeat event from another instance
+        of this CSC, and return its private_origin if found.
 
         Intended for use by check_if_duplicate.
 
-        The heartbeat loop should be running before this is called.
-        This avoids the issue that if 2 CSCs are started at the same
-        time then neither will see the other one's heartbeat.
-        This code also assumes that will be true; it will likely raise
-        asyncio.TimeoutError if not.
+        Read the most recent heartbeat events directly from the broker
+        (see `SalInfo.read_latest_data`). If any have a different
+        private_origin, wait ``heartbeat_interval *
+        DUPLICATE_HEARTBEAT_RECHECK_FACTOR`` seconds and read them again.
+        A duplicate is reported only if it is alive: if it wrote
+        a heartbeat between the two reads. Thus the last heartbeat
+        of a CSC that has died (e.g. the previous instance of a CSC
+        that is being restarted) is ignored. Only the private_sndStamp
+        of heartbeats from the same origin are compared, so clocks
+        need not agree between hosts.
+
+        This is called before the heartbeat is started,
+        so if 2 CSCs are started at the same time then
+        neither may see the other one's heartbeat.
 
         Parameters
         ----------
         num_messages : `float`
-            The number of heartbeat messages to read.
+            The number of recent heartbeat messages to check.
 
         Returns
         -------
         origin : `int`
             private_origin field of duplicate heartbeat, or 0 if none detected.
+        """
+        if num_messages < 1:
+            raise ValueError(f"{num_messages=} must be positive")
+        try:
+            first_stamps = await self._read_foreign_heartbeat_stamps(num_messages)
+            if not first_stamps:
+                return 0
+            await asyncio.sleep(
+                self.heartbeat_interval * DUPLICATE_HEARTBEAT_RECHECK_FACTOR
+            )
+            second_stamps = await self._read_foreign_heartbeat_stamps(num_messages)
+        except Exception as e:
+            self.log.warning(
+                f"Could not read recent heartbeats: {e!r}; "
+                "waiting for a new heartbeat instead."
+            )
+            return await self._wait_for_duplicate_heartbeat()
 
-        Raises
-        ------
-        asyncio.TimeoutError
-            If no heartbeat seen within the specified time.
+        for origin, snd_stamp in second_stamps.items():
+            if snd_stamp > first_stamps.get(origin, -math.inf):
+                return origin
+        return 0
+
+    async def _read_foreign_heartbeat_stamps(
+        self, num_messages: int
+    ) -> dict[int, float]:
+        """Read recent heartbeats and return a dict of
+        private_origin: latest private_sndStamp,
+        for heartbeats from other origins.
+
+        Parameters
+        ----------
+        num_messages : `int`
+            The number of recent heartbeat messages to read.
+        """
+        data_list = await self.salinfo.read_latest_data(
+            "evt_heartbeat",
+            num_messages=num_messages,
+            timeout=self.heartbeat_interval * DUPLICATE_HEARTBEAT_MAX_AGE_FACTOR,
+        )
+        stamps: dict[int, float] = dict()
+        for data in data_list:
+            if data.private_origin != self.salinfo.domain.origin:
+                stamps[data.private_origin] = max(
+                    data.private_sndStamp,
+                    stamps.get(data.private_origin, -math.inf),
+                )
+        return stamps
+
+    async def _wait_for_duplicate_heartbeat(self) -> int:
+        """Wait for a heartbeat event using a new `Remote`,
+        and return its private_origin, or 0 if none seen.
+
+        A slow fallback for `check_for_duplicate_heartbeat`.
         """
         # Create a separate SalInfo because we only want to listen
         # to the heartbeat topic for a short time.
-        if num_messages < 1:
-            raise ValueError(f"{num_messages=} must be positive")
         async with Domain() as domain, Remote(
             domain=domain,
             name=self.salinfo.name,
@@ -295,7 +367,9 @@ class BaseCsc(Controller):
         ) as remote:
             try:
                 data = await remote.evt_heartbeat.next(  # type: ignore[attr-defined]
-                    flush=True, timeout=self.heartbeat_interval * 3
+                    flush=True,
+                    timeout=self.heartbeat_interval
+                    * DUPLICATE_HEARTBEAT_MAX_AGE_FACTOR,
                 )
             except asyncio.TimeoutError:
                 return 0
@@ -311,7 +385,7 @@ class BaseCsc(Controller):
         * Set ``self.start_task`` done.
         """
         await super().start()
-        self._heartbeat_task.cancel()  # Paranoia
+        self._cancel_heartbeat()  # Paranoia
         if self.check_if_duplicate:
             descr = f"{self.salinfo.name}:{self.salinfo.index} with origin={self.salinfo.domain.origin}"
             self.log.info(f"{descr} checking for an already-running instance.")
@@ -320,7 +394,9 @@ class BaseCsc(Controller):
                 raise base.ExpectedError(
                     f"{descr} quitting: found another instance with origin={duplicate_origin}."
                 )
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        self._heartbeat_callback = self.domain.periodic_scheduler.add(
+            self._write_heartbeat, interval=self.heartbeat_interval
+        )
         await self.set_simulation_mode(self.simulation_mode)
         await self.evt_softwareVersions.write()  # type: ignore
 
@@ -353,9 +429,11 @@ class BaseCsc(Controller):
             try:
                 for command in state_transition_commands:
                     method = getattr(self, f"do_{command}")
-                    data = getattr(self, f"cmd_{command}").DataType()
+                    DataType = getattr(self, f"cmd_{command}").DataType
                     if command == "start":
-                        data.configurationOverride = self._override
+                        data = DataType(configurationOverride=self._override)
+                    else:
+                        data = DataType()
                     self.log.info(f"Executing {command} command during startup")
                     await method(data)
                     # Wait briefly, to be sure the new summaryState event
@@ -368,7 +446,7 @@ class BaseCsc(Controller):
 
     async def close_tasks(self) -> None:
         """Shut down pending tasks. Called by `close`."""
-        self._heartbeat_task.cancel()
+        self._cancel_heartbeat()
         await super().close_tasks()
 
     @classmethod
@@ -863,6 +941,18 @@ class BaseCsc(Controller):
                 why = f"in state={self.summary_state!r}"
             raise base.ExpectedError(f"{what} {why}")
 
+    @property
+    def heartbeat_interval(self) -> float:
+        return self._heartbeat_interval
+
+    @heartbeat_interval.setter
+    def heartbeat_interval(self, interval: float) -> None:
+        if interval <= 0:
+            raise ValueError(f"heartbeat_interval={interval} must be > 0")
+        self._heartbeat_interval = interval
+        if self._heartbeat_callback is not None:
+            self._heartbeat_callback.interval = interval
+
     @property
     def disabled_or_enabled(self) -> bool:
         """Return True if the summary state is `State.DISABLED` or
@@ -957,15 +1047,20 @@ class BaseCsc(Controller):
         await self.handle_summary_state()
         await self._report_summary_state()
 
-    async def _heartbeat_loop(self) -> None:
-        """Output heartbeat at regular intervals."""
-        while True:
-            try:
-                await self.evt_heartbeat.write()  # type: ignore
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                # don't use the log because it also uses DDS messaging
-                print(f"Heartbeat output failed: {e!r}", file=sys.stderr)
-            finally:
-                await asyncio.sleep(self.heartbeat_interval)
+    def _cancel_heartbeat(self) -> None:
+        """Stop writing the heartbeat event."""
+        if self._heartbeat_callback is not None:
+            self._heartbeat_callback.cancel()
+            self._heartbeat_callback = None
+
+    async def _write_heartbeat(self) -> None:
+        """Output the heartbeat event.
+
+        Called every ``heartbeat_interval`` seconds by
+        ``self.domain.periodic_scheduler``.
+        """
+        try:
+            await self.evt_heartbeat.write(snapshot=False)  # type: ignore
+        except Exception as e:
+            # don't use the log because it also uses DDS messaging
+            print(f"Heartbeat output failed: {e!r}", file=sys.stderr)
@@ -45,6 +45,7 @@ from lsst.ts.xml.enums.Script import (
 )
 
 from . import base, controller, validator
+from .periodic_scheduler import PeriodicCallback
 
 HEARTBEAT_INTERVAL = 5  # seconds
 
@@ -118,7 +119,7 @@ class BaseScript(controller.Controller, abc.ABC):
         # A dict of state: timestamp (TAI seconds).
         self.timestamps: dict[ScriptState, float] = dict()
 
-        self._heartbeat_task: asyncio.Future = asyncio.Future()
+        self._heartbeat_callback: PeriodicCallback | None = None
 
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
@@ -134,8 +135,10 @@ class BaseScript(controller.Controller, abc.ABC):
 
     async def start(self) -> None:
         await super().start()
-        self._heartbeat_task.cancel()  # Paranoia
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        self._cancel_heartbeat()  # Paranoia
+        self._heartbeat_callback = self.domain.periodic_scheduler.add(
+            self._write_heartbeat, interval=HEARTBEAT_INTERVAL, delay=None
+        )
 
         remote_names = set()
         remote_start_tasks = []
@@ -409,7 +412,7 @@ class BaseScript(controller.Controller, abc.ABC):
     async def close_tasks(self) -> None:
         self._is_exiting = True
         await super().close_tasks()
-        self._heartbeat_task.cancel()
+        self._cancel_heartbeat()
         if self._run_task is not None:
             self._run_task.cancel()
         if self._pause_future is not None:
@@ -764,16 +767,22 @@ class BaseScript(controller.Controller, abc.ABC):
             raise base.ExpectedError(f"stop={stop!r} not a valid regex: {e}")
         await self.evt_checkpoints.set_write(pause=pause, stop=stop, force_output=True)  # type: ignore
 
-    async def _heartbeat_loop(self) -> None:
-        """Output heartbeat at regular intervals."""
-        while True:
-            try:
-                await asyncio.sleep(HEARTBEAT_INTERVAL)
-                await self.evt_heartbeat.write()  # type: ignore
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                self.log.exception("Heartbeat output failed")
+    def _cancel_heartbeat(self) -> None:
+        """Stop writing the heartbeat event."""
+        if self._heartbeat_callback is not None:
+            self._heartbeat_callback.cancel()
+            self._heartbeat_callback = None
+
+    async def _write_heartbeat(self) -> None:
+        """Output the heartbeat event.
+
+        Called every ``HEARTBEAT_INTERVAL`` seconds by
+        ``self.domain.periodic_scheduler``.
+        """
+        try:
+            await self.evt_heartbeat.write(snapshot=False)  # type: ignore
+        except Exception:
+            self.log.exception("Heartbeat output failed")
 
     async def _exit(self) -> None:
         """Call cleanup (if the script was run) and exit the script."""
@@ -783,7 +792,7 @@ class BaseScript(controller.Controller, abc.ABC):
         try:
             if self._run_task is not None:
                 await self.cleanup()
-            self._heartbeat_task.cancel()
+            self._cancel_heartbeat()
 
             reason = None
             final_state = {
@@ -36,6 +36,7 @@ from lsst.ts.xml import type_hints
 
 from . import base
 from .base_csc import BaseCsc, State
+from .domain import Domain
 from .hierarchical_update import hierarchical_update
 from .validator import StandardValidator
 
@@ -82,6 +83,9 @@ class ConfigurableCsc(BaseCsc, abc.ABC):
     discard_out_of_order_events : `bool`
         If True, discard event messages that arrive out of order. The default
         is True.
+    domain : `Domain` or `None`, optional
+        Domain to share with other CSCs; see `CscHost`.
+        If None (the usual case) then the CSC makes its own domain.
 
     Raises
     ------
@@ -153,6 +157,7 @@ class ConfigurableCsc(BaseCsc, abc.ABC):
         extra_commands: set[str] = set(),
         discard_out_of_order_telemetry: bool = True,
         discard_out_of_order_events: bool = True,
+        domain: Domain | None = None,
     ) -> None:
         self.site = os.environ.get("LSST_SITE")
         if self.site is None:
@@ -194,6 +199,7 @@ class ConfigurableCsc(BaseCsc, abc.ABC):
             extra_commands=extra_commands,
             discard_out_of_order_telemetry=discard_out_of_order_telemetry,
             discard_out_of_order_events=discard_out_of_order_events,
+            domain=domain,
         )
 
         # Set static fields of the generic configuration events.
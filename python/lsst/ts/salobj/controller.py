@@ -26,6 +26,7 @@ __all__ = ["Controller"]
 import asyncio
 import types
 import typing
+from collections.abc import Iterable
 
 from lsst.ts.xml import type_hints
 from lsst.ts.xml.type_hints import BaseMsgType
@@ -34,7 +35,12 @@ from .base import ExpectedError
 from .domain import Domain
 from .sal_info import SalInfo
 from .sal_log_handler import SalLogHandler
-from .topics import ControllerCommand, ControllerEvent, ControllerTelemetry
+from .topics import (
+    CommandScheduler,
+    ControllerCommand,
+    ControllerEvent,
+    ControllerTelemetry,
+)
 
 # Delay before closing the domain participant (seconds).
 # This gives remotes time to read final DDS messages before they disappear.
@@ -107,6 +113,25 @@ class Controller:
     discard_out_of_order_events : `bool`
         If True, discard event messages that arrive out of order. The default
         is True.
+    slots : `bool`, optional
+        If True then messages use ``__slots__``, to save memory.
+        See `SalInfo` for details.
+    frozen : `bool`, optional
+        If True and ``slots`` is true then messages of read topics
+        are immutable. See `SalInfo` for details.
+    producer_profiles : `dict` [`str`, `dict` [`str`, `typing.Any`]], optional
+        Kafka producer configuration overrides, by topic kind
+        or attribute name. See `SalInfo` for details.
+    priority_topics : `collections.abc.Iterable` [`str`] or `None`, optional
+        Read topics, by topic kind or attribute name, to read with
+        a separate high-priority consumer. See `SalInfo` for details.
+    domain : `Domain` or `None`, optional
+        Domain to use. If None (the usual case) then the controller
+        makes its own domain and closes it when the controller is closed.
+        If specified, the domain is shared, typically with other
+        controllers (see `CscHost`); the controller only closes its
+        own `SalInfo`, and it does not change the domain's
+        ``default_identity``.
 
     Attributes
     ----------
@@ -128,6 +153,10 @@ class Controller:
     cmd_<command_name> : `topics.ControllerCommand`
         Controller command topic. There is one for each command supported by
         the SAL component.
+    command_scheduler : `topics.CommandScheduler`
+        Schedules commands by priority, with concurrency limits.
+        By default no commands are scheduled;
+        see `topics.CommandScheduler.add_command`.
     evt_<event_name> : `topics.ControllerEvent`
         Controller event topic. There is one for each event topic supported by
         the SAL component.
@@ -233,6 +262,11 @@ class Controller:
         extra_commands: set[str] = set(),
         discard_out_of_order_telemetry: bool = True,
         discard_out_of_order_events: bool = True,
+        slots: bool = False,
+        frozen: bool = False,
+        producer_profiles: dict[str, dict[str, typing.Any]] | None = None,
+        priority_topics: Iterable[str] | None = None,
+        domain: Domain | None = None,
     ) -> None:
         if do_callbacks and write_only:
             raise ValueError("Cannot specify do_callbacks and write_only both true")
@@ -242,6 +276,7 @@ class Controller:
         self.start_called = False
         self.done_task: asyncio.Future = asyncio.Future()
         self._do_callbacks = do_callbacks
+        self.command_scheduler = CommandScheduler()
 
         # The start method will pause until this event is set (which it is,
         # by default). Unit tests may delay `start` by clearing this event
@@ -250,7 +285,10 @@ class Controller:
         self.delay_start_event = asyncio.Event()
         self.delay_start_event.set()
 
-        domain = Domain()
+        # Does this controller own its domain?
+        self._owns_domain = domain is None
+        if domain is None:
+            domain = Domain()
         try:
             self.salinfo = SalInfo(
                 domain=domain,
@@ -259,10 +297,15 @@ class Controller:
                 write_only=write_only,
                 discard_out_of_order_telemetry=discard_out_of_order_telemetry,
                 discard_out_of_order_events=discard_out_of_order_events,
+                slots=slots,
+                frozen=frozen,
+                producer_profiles=producer_profiles,
+                priority_topics=priority_topics,
             )
             new_identity = self.salinfo.name_index
             self.salinfo.identity = new_identity
-            domain.default_identity = new_identity
+            if self._owns_domain:
+                domain.default_identity = new_identity
             self.log = self.salinfo.log
 
             if not write_only:
@@ -300,7 +343,10 @@ class Controller:
 
         except Exception:
             # Note: Domain.basic_close closes all its SalInfo instances.
-            domain.basic_close()
+            if self._owns_domain:
+                domain.basic_close()
+            elif hasattr(self, "salinfo"):
+                self.salinfo.basic_close()
             raise
         self.isopen = True
 
@@ -336,7 +382,9 @@ class Controller:
                 # constructed with start=False.
                 continue
             start_tasks.append(salinfo.start_task)
-        await asyncio.gather(*start_tasks)
+        # If the domain is shared then some of these salinfos belong
+        # to other controllers, whose failures should not affect this one.
+        await asyncio.gather(*start_tasks, return_exceptions=not self._owns_domain)
         await self.salinfo.start()
 
         # Assign command callbacks; give up if this fails, since the CSC
@@ -364,6 +412,15 @@ class Controller:
     def domain(self) -> Domain:
         return self.salinfo.domain
 
+    @property
+    def sal_log_handler(self) -> SalLogHandler:
+        """Get the log handler that writes the ``logMessage`` event.
+
+        Use it to adjust rate limiting or to read the counts of
+        coalesced and dropped log messages.
+        """
+        return self._sal_log_handler
+
     async def close(
         self, exception: Exception | None = None, cancel_start: bool = True
     ) -> None:
@@ -423,11 +480,14 @@ class Controller:
             # Give remotes time to read final DDS messages before closing
             # the domain participant.
             await asyncio.sleep(SHUTDOWN_DELAY)
-            await self.domain.close()
+            if self._owns_domain:
+                await self.domain.close()
+            else:
+                await self.salinfo.close()
         except asyncio.CancelledError:
-            self.domain.basic_close()
+            self._basic_close_salinfos()
         except Exception:
-            self.domain.basic_close()
+            self._basic_close_salinfos()
             self.log.exception("Controller.close failed near the end; close continues")
         finally:
             if not self.done_task.done():
@@ -436,6 +496,13 @@ class Controller:
                 else:
                     self.done_task.set_result(None)
 
+    def _basic_close_salinfos(self) -> None:
+        """Synchronously close the domain, if owned, else the salinfo."""
+        if self._owns_domain:
+            self.domain.basic_close()
+        else:
+            self.salinfo.basic_close()
+
     async def close_tasks(self) -> None:
         """Shut down pending tasks. Called by `close`.
 
@@ -38,7 +38,7 @@ from collections.abc import AsyncGenerator, Callable, Sequence
 
 from lsst.ts.xml import sal_enums, type_hints
 
-from . import csc_utils, domain, remote
+from . import csc_utils, domain, remote, topics
 
 # A dict of valid values for bool command arguments.
 # The argument should be converted to lowercase before using.
@@ -371,7 +371,7 @@ help  # print this help
         """
         return dict(
             (key, value)
-            for key, value in vars(data).items()
+            for key, value in topics.get_data_dict(data).items()
             if self.field_is_public(key)
         )
 
@@ -383,7 +383,7 @@ help  # print this help
         """
         return {
             key: round_any(value, digits=digits)
-            for key, value in vars(data).items()
+            for key, value in topics.get_data_dict(data).items()
             if self.field_is_public(key)
         }
 
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["CscHost"]
+
+import asyncio
+import logging
+import signal
+import types
+import typing
+
+from .base_csc import BaseCsc
+from .domain import Domain
+
+
+class CscHost:
+    """Run several CSCs in one process, sharing one `Domain`
+    and its Kafka resources.
+
+    The CSCs may be different components or different indices
+    of one component. They share a thread pool, Kafka producers,
+    a schema registry client and parsed component information
+    (see ``Domain.share_kafka_resources``), which uses much less memory
+    than running each CSC in its own process.
+
+    Attributes
+    ----------
+    domain : `Domain`
+        The shared domain.
+    cscs : `list` [`BaseCsc`]
+        The CSCs that have been constructed.
+    failures : `dict` [`str`, `BaseException`]
+        Dict of CSC description: exception, for each CSC
+        that could not be constructed or started, or that quit
+        with an exception.
+    done_task : `asyncio.Future`
+        Set done when all CSCs are done, e.g. after a termination signal.
+    log : `logging.Logger`
+        A logger.
+
+    Notes
+    -----
+    Failures are isolated: if one CSC fails to construct or start,
+    or quits, the error is logged and recorded in ``failures``,
+    and the other CSCs keep running.
+
+    Each CSC class must accept a ``domain`` constructor argument
+    and pass it to `BaseCsc` (or `ConfigurableCsc`).
+    Typical use::
+
+        async with CscHost() as host:
+            for index in (1, 2, 3):
+                host.add_csc(MyCsc, index=index)
+            await host.start()
+            await host.done_task
+    """
+
+    def __init__(self) -> None:
+        self.domain = Domain(share_kafka_resources=True)
+        self.cscs: list[BaseCsc] = []
+        self.failures: dict[str, BaseException] = dict()
+        self.done_task: asyncio.Future = asyncio.Future()
+        self.log = logging.getLogger("CscHost")
+        self.isopen = True
+
+    def add_csc(
+        self, csc_class: typing.Type[BaseCsc], **kwargs: typing.Any
+    ) -> BaseCsc | None:
+        """Construct a CSC that uses the shared domain.
+
+        Parameters
+        ----------
+        csc_class : `type` [`BaseCsc`]
+            CSC class.
+        **kwargs : `dict` [`str`, `typing.Any`]
+            Constructor arguments, other than ``domain``.
+
+        Returns
+        -------
+        csc : `BaseCsc` | `None`
+            The CSC, or None if construction failed.
+
+        Raises
+        ------
+        RuntimeError
+            If closed.
+        """
+        if not self.isopen:
+            raise RuntimeError("Closed")
+        descr = self._get_descr(csc_class, kwargs.get("index"))
+        try:
+            csc = csc_class(domain=self.domain, **kwargs)
+        except Exception as e:
+            self.log.exception(f"Could not construct {descr}")
+            self.failures[descr] = e
+            return None
+        self.cscs.append(csc)
+        csc.done_task.add_done_callback(self._csc_done)
+        # Each CSC installs its own signal handlers, replacing the
+        # handlers of the CSCs before it; handle signals for all of them.
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.signal_handler)
+        return csc
+
+    async def start(self) -> None:
+        """Wait for all CSCs to start.
+
+        A CSC that fails to start is recorded in ``failures``
+        (and closes itself).
+        """
+        await asyncio.gather(
+            *[csc.start_task for csc in self.cscs], return_exceptions=True
+        )
+        for csc in self.cscs:
+            if csc.start_task.done() and not csc.start_task.cancelled():
+                exception = csc.start_task.exception()
+                if exception is not None:
+                    self.failures[self._get_csc_descr(csc)] = exception
+
+    def signal_handler(self) -> None:
+        """Handle termination signals by stopping all CSCs."""
+        self.log.info("signal_handler")
+        for csc in self.cscs:
+            if not csc.done_task.done():
+                csc.signal_handler()
+
+    async def close(self) -> None:
+        """Close all CSCs, then the shared domain."""
+        if not self.isopen:
+            return
+        self.isopen = False
+        await asyncio.gather(
+            *[csc.close() for csc in self.cscs], return_exceptions=True
+        )
+        await self.domain.close()
+        if not self.done_task.done():
+            self.done_task.set_result(None)
+
+    def _csc_done(self, done_task: asyncio.Future) -> None:
+        """Record a CSC quitting with an exception,
+        and set ``done_task`` done when all CSCs are done.
+        """
+        if not done_task.cancelled() and done_task.exception() is not None:
+            for csc in self.cscs:
+                if csc.done_task is done_task:
+                    descr = self._get_csc_descr(csc)
+                    self.log.error(f"{descr} quit: {done_task.exception()!r}")
+                    self.failures.setdefault(descr, done_task.exception())
+        if all(csc.done_task.done() for csc in self.cscs):
+            if not self.done_task.done():
+                self.done_task.set_result(None)
+
+    @staticmethod
+    def _get_descr(csc_class: typing.Type[BaseCsc], index: typing.Any) -> str:
+        """Get a description of a CSC from its class and index."""
+        return f"{csc_class.__name__}:{index}" if index else csc_class.__name__
+
+    def _get_csc_descr(self, csc: BaseCsc) -> str:
+        """Get a description of a CSC."""
+        return self._get_descr(type(csc), csc.salinfo.index)
+
+    async def __aenter__(self) -> CscHost:
+        return self
+
+    async def __aexit__(
+        self,
+        type: typing.Type[BaseException] | None,
+        value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        await self.close()
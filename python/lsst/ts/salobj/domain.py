@@ -24,13 +24,21 @@ from __future__ import annotations
 __all__ = ["Domain"]
 
 import asyncio
+import json
 import os
+import threading
 import types
 import typing
 import warnings
 import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from confluent_kafka import Producer
+from confluent_kafka.schema_registry import SchemaRegistryClient
+from lsst.ts.xml.component_info import ComponentInfo
 
 from . import base
+from .periodic_scheduler import PeriodicScheduler
 
 # Avoid circular imports by only importing SalInfo when type checking
 if typing.TYPE_CHECKING:
@@ -38,6 +46,18 @@ if typing.TYPE_CHECKING:
 
 MAX_RANDOM_HOST = (1 << 31) - 1
 
+# Maximum number of threads in the thread pool shared by all SalInfo,
+# if sharing Kafka resources. Threads are only started as needed;
+# each SalInfo uses one or two threads for its read loops,
+# plus threads for writing.
+SHARED_POOL_MAX_WORKERS = 1000
+
+# Interval between flushes of the shared Kafka producers (seconds).
+SHARED_FLUSH_INTERVAL = 0.025
+
+# Maximum time to wait for a shared Kafka producer to flush (seconds).
+SHARED_FLUSH_TIMEOUT = 1
+
 
 class Domain:
     r"""Information common to all SalInfo instances.
@@ -45,6 +65,21 @@ class Domain:
     The name comes from DDS; the class originally contained a DDS domain
     participant and associated quality of service information.
 
+    Parameters
+    ----------
+    share_kafka_resources : `bool`, optional
+        If True then all `SalInfo` instances in this domain share
+        one thread pool, one Kafka producer for each distinct producer
+        configuration, one schema registry client (and thus its cache
+        of registered schemas), and one parsed `ComponentInfo` for each
+        SAL component. This greatly reduces the resources needed to run
+        many controllers in one process; see `CscHost`.
+        Each `SalInfo` still has its own consumers.
+        The shared producers are flushed by a single loop owned
+        by the domain, in a background thread, so that a slow topic
+        does not block the event loop.
+        The shared resources are released when the domain is closed.
+
     Attributes
     ----------
     origin : `int`
@@ -60,6 +95,12 @@ class Domain:
     user_host : `str`
         username@host. This will match ``identity`` unless the latter
         is set to a CSC name.
+    periodic_scheduler : `PeriodicScheduler`
+        Calls periodic callbacks, such as heartbeat writers, for all
+        controllers that use this domain, from a single timer.
+    share_kafka_resources : `bool`
+        Do the `SalInfo` instances in this domain share Kafka resources?
+        See the constructor argument.
 
     Notes
     -----
@@ -114,7 +155,7 @@ class Domain:
             test_remote = salobj.Remote(domain=domain, name="Test", index=5)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, share_kafka_resources: bool = False) -> None:
         self.isopen = True
         self.user_host = base.get_user_host()
         self.default_identity = self.user_host
@@ -129,6 +170,24 @@ class Domain:
 
         self.origin = os.getpid()
 
+        self.periodic_scheduler = PeriodicScheduler()
+
+        self.share_kafka_resources = share_kafka_resources
+        # Shared Kafka resources, if share_kafka_resources.
+        # The getters may be called from threads, so protect them.
+        self._shared_lock = threading.Lock()
+        self._shared_pool: ThreadPoolExecutor | None = None
+        # Single-thread pool for unacknowledged writes.
+        self._shared_unacknowledged_write_pool: ThreadPoolExecutor | None = None
+        # Dict of producer configuration as json: producer.
+        self._shared_producers: dict[str, Producer] = dict()
+        # Dict of url: schema registry client.
+        self._shared_schema_registry_clients: dict[str, SchemaRegistryClient] = dict()
+        # Dict of (topic_subname, name): ComponentInfo.
+        self._shared_component_infos: dict[tuple[str, str], ComponentInfo] = dict()
+        # Task that flushes the shared producers; see `start_shared_flush_loop`.
+        self._shared_flush_task: asyncio.Task | None = None
+
     @property
     def salinfo_set(self) -> weakref.WeakSet[SalInfo]:
         return self._salinfo_set
@@ -150,6 +209,131 @@ class Domain:
             raise RuntimeError(f"salinfo {salinfo} already added")
         self._salinfo_set.add(salinfo)
 
+    def get_shared_pool(self) -> ThreadPoolExecutor:
+        """Get the thread pool shared by all SalInfo in this domain.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        with self._shared_lock:
+            if self._shared_pool is None:
+                self._shared_pool = ThreadPoolExecutor(
+                    max_workers=SHARED_POOL_MAX_WORKERS
+                )
+            return self._shared_pool
+
+    def get_shared_unacknowledged_write_pool(self) -> ThreadPoolExecutor:
+        """Get the single-thread pool shared by all SalInfo in this domain
+        for unacknowledged writes, which must be written in order.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        with self._shared_lock:
+            if self._shared_unacknowledged_write_pool is None:
+                self._shared_unacknowledged_write_pool = ThreadPoolExecutor(
+                    max_workers=1
+                )
+            return self._shared_unacknowledged_write_pool
+
+    def get_shared_producer(self, configuration: dict[str, typing.Any]) -> Producer:
+        """Get a Kafka producer with the specified configuration,
+        creating it if necessary.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        key = json.dumps(configuration, sort_keys=True)
+        with self._shared_lock:
+            producer = self._shared_producers.get(key)
+            if producer is None:
+                producer = Producer(configuration)
+                self._shared_producers[key] = producer
+            return producer
+
+    def get_shared_schema_registry_client(self, url: str) -> SchemaRegistryClient:
+        """Get a schema registry client, creating it if necessary.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        with self._shared_lock:
+            client = self._shared_schema_registry_clients.get(url)
+            if client is None:
+                client = SchemaRegistryClient(dict(url=url))
+                self._shared_schema_registry_clients[url] = client
+            return client
+
+    def get_shared_component_info(self, topic_subname: str, name: str) -> ComponentInfo:
+        """Get information about a SAL component, parsing it if necessary.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        key = (topic_subname, name)
+        with self._shared_lock:
+            component_info = self._shared_component_infos.get(key)
+            if component_info is None:
+                component_info = ComponentInfo(topic_subname=topic_subname, name=name)
+                self._shared_component_infos[key] = component_info
+            return component_info
+
+    def start_shared_flush_loop(self) -> None:
+        """Start the loop that flushes the shared Kafka producers,
+        if it is not already running.
+
+        Only intended for use by `SalInfo`, if ``share_kafka_resources``.
+        """
+        if not self.isopen:
+            return
+        if self._shared_flush_task is None or self._shared_flush_task.done():
+            self._shared_flush_task = asyncio.create_task(self._shared_flush_loop())
+
+    async def _shared_flush_loop(self) -> None:
+        """Flush the shared producers and report delivery errors."""
+        loop = asyncio.get_running_loop()
+        while self.isopen:
+            with self._shared_lock:
+                producers = list(self._shared_producers.values())
+            if producers:
+                await loop.run_in_executor(
+                    self.get_shared_pool(), self._blocking_flush, producers
+                )
+            for salinfo in list(self._salinfo_set):
+                salinfo.report_delivery_errors_if_due()
+            await asyncio.sleep(SHARED_FLUSH_INTERVAL)
+
+    def _blocking_flush(self, producers: list[Producer]) -> None:
+        """Flush Kafka producers, waiting at most SHARED_FLUSH_TIMEOUT
+        for each.
+        """
+        for producer in producers:
+            producer.flush(SHARED_FLUSH_TIMEOUT)
+
+    async def _stop_shared_flush_loop(self) -> None:
+        """Stop the shared flush loop and wait for it to finish."""
+        if self._shared_flush_task is None:
+            return
+        self._shared_flush_task.cancel()
+        try:
+            await self._shared_flush_task
+        except asyncio.CancelledError:
+            pass
+        self._shared_flush_task = None
+
+    def _close_shared_resources(self) -> None:
+        """Release the shared Kafka resources.
+
+        This may block, so `close` runs it in a thread.
+        """
+        with self._shared_lock:
+            for producer in self._shared_producers.values():
+                producer.flush(SHARED_FLUSH_TIMEOUT)
+                producer.purge()
+            self._shared_producers = dict()
+            self._shared_schema_registry_clients = dict()
+            self._shared_component_infos = dict()
+            for pool in (self._shared_pool, self._shared_unacknowledged_write_pool):
+                if pool is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+            self._shared_pool = None
+            self._shared_unacknowledged_write_pool = None
+
     def remove_salinfo(self, salinfo: SalInfo) -> bool:
         """Remove the specified salinfo from the internal registry.
 
@@ -174,9 +358,14 @@ class Domain:
 
         Intended for exit handlers and constructor error handlers.
         """
+        self.periodic_scheduler.close()
+        if self._shared_flush_task is not None:
+            self._shared_flush_task.cancel()
+            self._shared_flush_task = None
         while self._salinfo_set:
             salinfo = self._salinfo_set.pop()
             salinfo.basic_close()
+        self._close_shared_resources()
 
     async def close(self) -> None:
         """Close all registered `SalInfo`.
@@ -188,9 +377,14 @@ class Domain:
             await self.done_task
             return
         self.isopen = False
+        self.periodic_scheduler.close()
         while self._salinfo_set:
             salinfo = self._salinfo_set.pop()
             await salinfo.close()
+        await self._stop_shared_flush_loop()
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._close_shared_resources
+        )
         if self.num_read_loops != 0:
             warnings.warn(
                 f"After Domain.close num_read_loops={self.num_read_loops}; it should be 0",
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["MultiIndexController"]
+
+import asyncio
+import collections
+import functools
+import inspect
+import types
+import typing
+from collections.abc import Callable, Iterable
+
+from lsst.ts.xml import type_hints
+
+from .base import ExpectedError
+from .controller import Controller
+from .domain import Domain
+from .sal_info import SalInfo
+from .topics import ControllerCommand
+
+
+class MultiIndexController:
+    """Serve several indices of an indexed SAL component,
+    reading the commands for all of them with one `SalInfo`.
+
+    Each index has a handler: a write-only `Controller` for that index,
+    which writes the events and telemetry for that index
+    and handles its commands with ``do_{command}`` methods.
+    Commands are read and decoded once, by a single `SalInfo`
+    with index 0 that only reads the served indices,
+    and dispatched to the handler for their ``salIndex``.
+
+    Parameters
+    ----------
+    name : `str`
+        Name of SAL component. The component must be indexed.
+    indices : `collections.abc.Iterable` [`int`]
+        The indices to serve. Must not be empty or contain 0.
+    handler_factory : `collections.abc.Callable`
+        Function that makes a handler, called as
+        ``handler_factory(index=index, domain=domain)`` for each index.
+        It must return a write-only `Controller` for component ``name``
+        and the specified index, that uses the specified domain.
+        A handler class with a suitable constructor will do.
+    domain : `Domain` or `None`, optional
+        Domain to use. If None then make a domain with
+        ``share_kafka_resources=True``, and close it in `close`.
+
+    Raises
+    ------
+    ValueError
+        If the component is not indexed, ``indices`` is empty
+        or contains 0, or a handler is not a write-only `Controller`
+        for the specified component and index.
+
+    Attributes
+    ----------
+    domain : `Domain`
+        The domain.
+    salinfo : `SalInfo`
+        SAL info for reading commands and writing acknowledgements.
+    handlers : `dict` [`int`, `Controller`]
+        Dict of index: handler.
+    log : `logging.Logger`
+        A logger.
+    isopen : `bool`
+        Is this instance open? `True` until `close` is called.
+    start_task : `asyncio.Task`
+        A task which is finished when `start` is done,
+        or to an exception if `start` fails.
+    done_task : `asyncio.Future`
+        A future which is finished when `close` is done.
+    cmd_<command_name> : `topics.ControllerCommand`
+        Controller command topic, for all served indices.
+
+    Notes
+    -----
+    Commands are acknowledged as usual: a handler's ``do_{command}``
+    method may return an acknowledgement or raise an exception
+    (see `topics.ControllerCommand`). A command for which the handler
+    has no ``do_{command}`` method fails with "not supported".
+    Commands for different indices run concurrently, but, as for
+    a `Controller`, each index runs one instance of a given command
+    at a time, in the order received.
+
+    Typical use::
+
+        class Sensor(salobj.Controller):
+            def __init__(self, index, domain):
+                super().__init__(
+                    "Test", index=index, write_only=True, domain=domain
+                )
+
+            async def do_setScalars(self, data):
+                await self.evt_scalars.set_write(int0=data.int0)
+
+        async with salobj.MultiIndexController(
+            name="Test", indices=range(1, 101), handler_factory=Sensor
+        ) as controller:
+            await controller.done_task
+    """
+
+    def __init__(
+        self,
+        name: str,
+        indices: Iterable[int],
+        handler_factory: Callable[..., Controller],
+        domain: Domain | None = None,
+    ) -> None:
+        self.isopen = False
+        self.done_task: asyncio.Future = asyncio.Future()
+        self.handlers: dict[int, Controller] = dict()
+        # Dict of (index, command name): lock, to run one instance
+        # of each command at a time for each index.
+        self._command_locks: collections.defaultdict[tuple[int, str], asyncio.Lock] = (
+            collections.defaultdict(asyncio.Lock)
+        )
+
+        self._owns_domain = domain is None
+        if domain is None:
+            domain = Domain(share_kafka_resources=True)
+        self.domain = domain
+        try:
+            self.salinfo = SalInfo(domain=domain, name=name, indices=indices)
+            self.log = self.salinfo.log
+            # mypy doesn't know that read_indices cannot be None here.
+            for index in sorted(self.salinfo.read_indices):  # type: ignore
+                handler = handler_factory(index=index, domain=domain)
+                if not isinstance(handler, Controller):
+                    raise ValueError(f"handler {handler!r} must be a Controller")
+                self.handlers[index] = handler
+                if handler.salinfo.name != name or handler.salinfo.index != index:
+                    raise ValueError(
+                        f"handler for {name}:{index} is for {handler.salinfo.name_index}"
+                    )
+                if not handler.salinfo.write_only:
+                    raise ValueError(f"handler for {name}:{index} must be write-only")
+
+            for cmd_name in self.salinfo.command_names:
+                cmd = ControllerCommand(self.salinfo, cmd_name)
+                # Commands for different indices may run at the same time;
+                # `_dispatch` runs them one at a time for each index.
+                cmd.allow_multiple_callbacks = True
+                setattr(self, cmd.attr_name, cmd)
+
+            self.start_task = asyncio.create_task(self.start())
+        except Exception:
+            for handler in self.handlers.values():
+                handler.start_task.cancel()
+            if self._owns_domain:
+                domain.basic_close()
+            else:
+                for handler in self.handlers.values():
+                    handler.salinfo.basic_close()
+                if hasattr(self, "salinfo"):
+                    self.salinfo.basic_close()
+            raise
+        self.isopen = True
+
+    async def start(self) -> None:
+        """Wait for the handlers to start, then start reading commands."""
+        await asyncio.gather(
+            *[handler.start_task for handler in self.handlers.values()]
+        )
+        await self.salinfo.start()
+        for cmd_name in self.salinfo.command_names:
+            cmd = getattr(self, f"cmd_{cmd_name}")
+            cmd.callback = functools.partial(self._dispatch, cmd_name)
+
+    async def close(self) -> None:
+        """Close the handlers, then the command reader.
+
+        Also close the domain, if it was created by this instance.
+        """
+        if not self.isopen:
+            await self.done_task
+            return
+        self.isopen = False
+        if not self.start_task.done():
+            self.start_task.cancel()
+        try:
+            await asyncio.gather(
+                *[handler.close() for handler in self.handlers.values()],
+                return_exceptions=True,
+            )
+            if self._owns_domain:
+                await self.domain.close()
+            else:
+                await self.salinfo.close()
+        finally:
+            if not self.done_task.done():
+                self.done_task.set_result(None)
+
+    async def _dispatch(
+        self, cmd_name: str, data: type_hints.BaseMsgType
+    ) -> type_hints.AckCmdDataType | None:
+        """Run the handler's ``do_{cmd_name}`` method for a command.
+
+        Parameters
+        ----------
+        cmd_name : `str`
+            Command name, e.g. "setScalars".
+        data : `DataType`
+            Command data.
+
+        Raises
+        ------
+        ExpectedError
+            If the handler for the command's index is not open,
+            or does not support the command.
+        """
+        index = data.salIndex  # type: ignore
+        handler = self.handlers.get(index)
+        if handler is None or not handler.isopen:
+            raise ExpectedError(f"{self.salinfo.name}:{index} is not running")
+        func = getattr(handler, f"do_{cmd_name}", None)
+        if func is None:
+            raise ExpectedError("This command is not supported")
+        async with self._command_locks[(index, cmd_name)]:
+            result = func(data)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
+    async def __aenter__(self) -> MultiIndexController:
+        await self.start_task
+        return self
+
+    async def __aexit__(
+        self,
+        type: typing.Type[BaseException] | None,
+        value: BaseException | None,
+        traceback: types.TracebackType | None,
+    ) -> None:
+        await self.close()
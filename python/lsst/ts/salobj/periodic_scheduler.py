@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["PeriodicCallback", "PeriodicScheduler"]
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
+
+# Minimum interval between warnings about timer drift (seconds).
+DRIFT_WARNING_INTERVAL = 10
+
+# Tolerance for treating a time as a multiple of an interval
+# (fraction of the interval).
+ALIGNMENT_TOLERANCE = 1e-6
+
+PeriodicCallbackType = Callable[[], None | Awaitable[None]]
+
+
+class PeriodicCallback:
+    """A callback registered with `PeriodicScheduler`.
+
+    Returned by `PeriodicScheduler.add`; do not construct directly.
+
+    Attributes
+    ----------
+    callback : ``callable``
+        The function or coroutine function to call.
+    interval : `float`
+        The interval between calls (seconds). May be changed,
+        in which case the next call is rescheduled to be ``interval``
+        after the previous call (or as soon as possible, if that is past).
+        Setting it to a value <= 0 raises `ValueError`.
+    num_calls : `int`
+        The number of times the callback has been called.
+    num_skipped : `int`
+        The number of calls skipped, either because the previous call
+        had not finished, or because the timer was late
+        by more than one interval.
+    """
+
+    def __init__(
+        self,
+        scheduler: PeriodicScheduler,
+        callback: PeriodicCallbackType,
+        interval: float,
+    ) -> None:
+        self.scheduler = scheduler
+        self.callback = callback
+        self._interval = interval
+        self.num_calls = 0
+        self.num_skipped = 0
+        self.cancelled = False
+        # Is a call to a coroutine function in progress?
+        self._running = False
+        # Counter of the current heap entry; other entries are stale.
+        self._entry_counter = -1
+        # Scheduled time of the previous call; None before the first call.
+        self._prev_when: float | None = None
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval: float) -> None:
+        self.scheduler._set_interval(self, interval)
+
+    def cancel(self) -> None:
+        """Stop calling the callback.
+
+        A call in progress is not cancelled.
+        """
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        return (
+            f"PeriodicCallback(callback={self.callback}, interval={self.interval}, "
+            f"cancelled={self.cancelled})"
+        )
+
+
+class PeriodicScheduler:
+    """Call periodic callbacks, such as heartbeat writers,
+    from a single event loop timer.
+
+    Each `Domain` has one, as attribute ``periodic_scheduler``,
+    so that all controllers in a process share one timer.
+
+    Attributes
+    ----------
+    log : `logging.Logger`
+        A logger.
+    num_ticks : `int`
+        The number of times the timer has fired.
+    last_drift : `float`
+        How late the timer fired the last time (seconds).
+    max_drift : `float`
+        The latest the timer has fired (seconds).
+
+    Notes
+    -----
+    After the first call, calls are made at multiples of the interval
+    after the first call, so the first two calls are a full interval apart.
+    Callbacks added with ``delay=None`` start at a multiple of the interval
+    (in event loop time), so those with the same interval are called
+    on the same tick.
+    All coroutine callbacks that are due on a tick run concurrently
+    in a single task, so their writes are handed to the Kafka producers
+    together, rather than from independent timers.
+
+    Drift is the difference between the time the timer fires and the time
+    at which the earliest due callback was scheduled. If the timer fires
+    more than one interval late, the missed calls are skipped and
+    a warning is logged (at most once every ``DRIFT_WARNING_INTERVAL``
+    seconds).
+    """
+
+    def __init__(self) -> None:
+        self.log = logging.getLogger("PeriodicScheduler")
+        self.num_ticks = 0
+        self.last_drift = 0.0
+        self.max_drift = 0.0
+        # Heap of (call time, counter, PeriodicCallback).
+        # Cancelled callbacks are removed when they come due.
+        self._heap: list[tuple[float, int, PeriodicCallback]] = []
+        self._counter = itertools.count()
+        self._handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Tasks running coroutine callbacks, one per tick.
+        self._tick_tasks: set[asyncio.Future] = set()
+        self._num_new_skipped = 0
+        self._drift_warning_monotonic = 0.0
+
+    @property
+    def num_callbacks(self) -> int:
+        """Get the number of registered callbacks."""
+        return sum(1 for item in self._heap if self._is_current(item))
+
+    def add(
+        self,
+        callback: PeriodicCallbackType,
+        interval: float,
+        *,
+        delay: float | None = 0,
+    ) -> PeriodicCallback:
+        """Call a function or coroutine function periodically.
+
+        Parameters
+        ----------
+        callback : ``callable``
+            Function or coroutine function to call, with no arguments.
+            Exceptions are logged.
+        interval : `float`
+            Interval between calls (seconds).
+        delay : `float` | `None`, optional
+            Delay before the first call (seconds).
+            If None then make the first call at the next multiple
+            of ``interval`` (in event loop time), so that it shares ticks
+            with other callbacks added that way with the same interval.
+            Later calls are made every ``interval`` after the first.
+
+        Returns
+        -------
+        periodic_callback : `PeriodicCallback`
+            The registered callback. Call its ``cancel`` method
+            to stop calling it.
+
+        Raises
+        ------
+        ValueError
+            If ``interval`` <= 0 or ``delay`` < 0.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be > 0")
+        if delay is not None and delay < 0:
+            raise ValueError(f"delay={delay} must be None or >= 0")
+        self._loop = asyncio.get_running_loop()
+        periodic_callback = PeriodicCallback(
+            scheduler=self, callback=callback, interval=interval
+        )
+        now = self._loop.time()
+        if delay is None:
+            when = self._next_aligned_time(now, interval)
+        else:
+            when = now + delay
+        self._push(when, periodic_callback)
+        return periodic_callback
+
+    def close(self) -> None:
+        """Cancel all callbacks and the timer."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for _, _, periodic_callback in self._heap:
+            periodic_callback.cancel()
+        self._heap = []
+        for task in self._tick_tasks:
+            task.cancel()
+
+    @staticmethod
+    def _is_current(item: tuple[float, int, PeriodicCallback]) -> bool:
+        """Is a heap item the current entry of a callback
+        that has not been cancelled?
+        """
+        _, counter, periodic_callback = item
+        return (
+            not periodic_callback.cancelled
+            and counter == periodic_callback._entry_counter
+        )
+
+    @staticmethod
+    def _next_aligned_time(now: float, interval: float) -> float:
+        """Get the first multiple of interval that is after now.
+
+        ``now`` is treated as a multiple of interval if it is within
+        ``ALIGNMENT_TOLERANCE`` intervals of one, to allow for roundoff.
+        """
+        return (math.floor(now / interval + ALIGNMENT_TOLERANCE) + 1) * interval
+
+    def _push(self, when: float, periodic_callback: PeriodicCallback) -> None:
+        """Schedule a call and re-arm the timer, if needed."""
+        assert self._loop is not None  # make mypy happy
+        periodic_callback._entry_counter = next(self._counter)
+        heapq.heappush(
+            self._heap, (when, periodic_callback._entry_counter, periodic_callback)
+        )
+        if self._handle is None or when < self._handle.when():
+            if self._handle is not None:
+                self._handle.cancel()
+            self._handle = self._loop.call_at(when, self._tick)
+
+    def _set_interval(
+        self, periodic_callback: PeriodicCallback, interval: float
+    ) -> None:
+        """Set the interval of a callback and reschedule its next call.
+
+        Raises
+        ------
+        ValueError
+            If ``interval`` <= 0.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval={interval} must be > 0")
+        if interval == periodic_callback._interval:
+            return
+        periodic_callback._interval = interval
+        if (
+            periodic_callback.cancelled
+            or periodic_callback._prev_when is None
+            or self._loop is None
+        ):
+            # The first call is still governed by ``delay``.
+            return
+        # Push a new entry; the old one becomes stale.
+        self._push(
+            max(periodic_callback._prev_when + interval, self._loop.time()),
+            periodic_callback,
+        )
+
+    def _tick(self) -> None:
+        """Call all callbacks that are due and re-arm the timer."""
+        assert self._loop is not None  # make mypy happy
+        self._handle = None
+        now = self._loop.time()
+        self.num_ticks += 1
+        if self._heap:
+            self.last_drift = max(now - self._heap[0][0], 0)
+            self.max_drift = max(self.max_drift, self.last_drift)
+
+        awaitables: list[tuple[PeriodicCallback, Awaitable[None]]] = []
+        due: list[tuple[float, PeriodicCallback]] = []
+        while self._heap and self._heap[0][0] <= now:
+            item = heapq.heappop(self._heap)
+            if self._is_current(item):
+                due.append((item[0], item[-1]))
+        for when, periodic_callback in due:
+            periodic_callback._prev_when = when
+            self._call(periodic_callback, awaitables)
+            if periodic_callback.cancelled:
+                continue
+            interval = periodic_callback.interval
+            next_when = when + interval
+            if next_when <= now:
+                # The timer is more than one interval late.
+                num_skipped = math.floor((now - when) / interval)
+                next_when = when + (num_skipped + 1) * interval
+                periodic_callback.num_skipped += num_skipped
+                self._num_new_skipped += num_skipped
+            self._push(next_when, periodic_callback)
+
+        if awaitables:
+            task = asyncio.ensure_future(self._await_callbacks(awaitables))
+            self._tick_tasks.add(task)
+            task.add_done_callback(self._tick_tasks.discard)
+        if self._num_new_skipped > 0:
+            self._report_drift()
+        if self._handle is not None:
+            # Scheduling the next calls (or a callback calling `add`)
+            # armed the timer; cancel that timer, to keep a single
+            # chain of timers.
+            self._handle.cancel()
+            self._handle = None
+        if self._heap:
+            self._handle = self._loop.call_at(self._heap[0][0], self._tick)
+
+    def _call(
+        self,
+        periodic_callback: PeriodicCallback,
+        awaitables: list[tuple[PeriodicCallback, Awaitable[None]]],
+    ) -> None:
+        """Call a callback; if the result is awaitable then append
+        (periodic_callback, result) to awaitables.
+        """
+        if periodic_callback._running:
+            periodic_callback.num_skipped += 1
+            self._num_new_skipped += 1
+            return
+        periodic_callback.num_calls += 1
+        try:
+            result = periodic_callback.callback()
+        except Exception:
+            self.log.exception(f"{periodic_callback} failed")
+            return
+        if inspect.isawaitable(result):
+            periodic_callback._running = True
+            awaitables.append((periodic_callback, result))
+
+    async def _await_callbacks(
+        self, awaitables: list[tuple[PeriodicCallback, Awaitable[None]]]
+    ) -> None:
+        """Wait for the coroutine callbacks called on one tick,
+        and log any exceptions.
+        """
+        await asyncio.gather(
+            *[
+                self._await_callback(periodic_callback, awaitable)
+                for periodic_callback, awaitable in awaitables
+            ]
+        )
+
+    async def _await_callback(
+        self, periodic_callback: PeriodicCallback, awaitable: Awaitable[None]
+    ) -> None:
+        """Wait for one coroutine callback and log any exception."""
+        try:
+            await awaitable
+        except Exception:
+            self.log.exception(f"{periodic_callback} failed")
+        finally:
+            periodic_callback._running = False
+
+    def _report_drift(self) -> None:
+        """Log a warning about skipped calls, if not done recently."""
+        monotonic = time.monotonic()
+        if monotonic - self._drift_warning_monotonic < DRIFT_WARNING_INTERVAL:
+            return
+        self.log.warning(
+            f"Skipped {self._num_new_skipped} periodic calls "
+            f"because the timer or callbacks were late; max_drift={self.max_drift:0.3f} s"
+        )
+        self._num_new_skipped = 0
+        self._drift_warning_monotonic = monotonic
@@ -30,7 +30,7 @@ from collections.abc import Iterable
 
 from .domain import Domain
 from .sal_info import SalInfo
-from .topics import RemoteCommand, RemoteEvent, RemoteTelemetry
+from .topics import DecimationMode, RemoteCommand, RemoteEvent, RemoteTelemetry
 
 
 class Remote:
@@ -67,6 +67,19 @@ class Remote:
     evt_max_history : `int`, optional
         Maximum number of historical items to read for events.
         Set to 0 if your remote is not interested in "late joiner" data.
+    tel_max_rate_hz : `float` | `None`, optional
+        Maximum rate at which to queue messages for each telemetry topic (Hz),
+        or `None` for no limit. Useful for monitoring tools that do not
+        need every sample of high-rate telemetry.
+        See `topics.ReadTopic.set_max_rate` for details.
+    tel_decimation_mode : `topics.DecimationMode`, optional
+        Which telemetry message to queue for each interval,
+        if ``tel_max_rate_hz`` is not `None`.
+    numpy_arrays : `bool`, optional
+        If True then array fields of events and telemetry are read
+        as `numpy.ndarray`; if False they are read as lists.
+        This converts every array of every message, so it is off
+        by default; see `topics.ReadTopic.numpy_arrays` for details.
     start : `bool`, optional
         Automatically start the read loop when constructed?
         Normally this should be `True`, but if you are adding topics
@@ -84,6 +97,18 @@ class Remote:
     discard_out_of_order_events : `bool`
         If True, discard event messages that arrive out of order. The default
         is True.
+    slots : `bool`, optional
+        If True then messages use ``__slots__``, to save memory.
+        See `SalInfo` for details.
+    frozen : `bool`, optional
+        If True and ``slots`` is true then messages of read topics
+        are immutable. See `SalInfo` for details.
+    producer_profiles : `dict` [`str`, `dict` [`str`, `typing.Any`]], optional
+        Kafka producer configuration overrides, by topic kind
+        or attribute name. See `SalInfo` for details.
+    priority_topics : `collections.abc.Iterable` [`str`] or `None`, optional
+        Read topics, by topic kind or attribute name, to read with
+        a separate high-priority consumer. See `SalInfo` for details.
 
     Raises
     ------
@@ -153,11 +178,18 @@ class Remote:
         include: Iterable[str] | None = None,
         exclude: Iterable[str] | None = None,
         evt_max_history: int = 1,
+        tel_max_rate_hz: float | None = None,
+        tel_decimation_mode: DecimationMode = DecimationMode.LATEST,
+        numpy_arrays: bool = False,
         start: bool = True,
         num_messages: int = 1,
         consume_messages_timeout: float = 0.1,
         discard_out_of_order_telemetry: bool = True,
         discard_out_of_order_events: bool = True,
+        slots: bool = False,
+        frozen: bool = False,
+        producer_profiles: dict[str, dict[str, typing.Any]] | None = None,
+        priority_topics: Iterable[str] | None = None,
     ) -> None:
         if include is not None and exclude is not None:
             raise ValueError("Cannot specify both include and exclude")
@@ -175,6 +207,10 @@ class Remote:
             consume_messages_timeout=consume_messages_timeout,
             discard_out_of_order_telemetry=discard_out_of_order_telemetry,
             discard_out_of_order_events=discard_out_of_order_events,
+            slots=slots,
+            frozen=frozen,
+            producer_profiles=producer_profiles,
+            priority_topics=priority_topics,
         )
         try:
             if not readonly:
@@ -188,6 +224,7 @@ class Remote:
                 elif exclude_set and evt_name in exclude_set:
                     continue
                 evt = RemoteEvent(self.salinfo, evt_name, max_history=evt_max_history)
+                evt.numpy_arrays = numpy_arrays
                 setattr(self, evt.attr_name, evt)
 
             for tel_name in self.salinfo.telemetry_names:
@@ -195,7 +232,13 @@ class Remote:
                     continue
                 elif exclude_set and tel_name in exclude_set:
                     continue
-                tel = RemoteTelemetry(self.salinfo, tel_name)
+                tel = RemoteTelemetry(
+                    self.salinfo,
+                    tel_name,
+                    max_rate_hz=tel_max_rate_hz,
+                    decimation_mode=tel_decimation_mode,
+                )
+                tel.numpy_arrays = numpy_arrays
                 setattr(self, tel.attr_name, tel)
 
             if start:
@@ -28,18 +28,22 @@ import atexit
 import base64
 import collections
 import enum
+import heapq
 import itertools
 import json
 import logging
 import os
 import pathlib
+import threading
 import time
 import traceback
 import types
 import typing
+from collections.abc import Iterable
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
+import numpy as np
 import yaml
 from confluent_kafka import (
     OFFSET_BEGINNING,
@@ -93,6 +97,40 @@ SCHEMA_RESOLUTION_LOG_ERROR_THRESHOLD = 10
 # Number of _deserializers_and_contexts to wait for when sending Kafka data.
 DEFAULT_LSST_KAFKA_PRODUCER_WAIT_ACKS = "1"
 
+# Minimum interval between summaries of message delivery errors (seconds).
+DELIVERY_ERROR_REPORT_INTERVAL = 10
+
+# Maximum number of unacknowledged writes that may be waiting to be
+# handed to the Kafka producer; more are dropped and counted as
+# delivery errors. See `SalInfo.write_data`.
+MAX_PENDING_UNACKNOWLEDGED_WRITES = 1000
+
+# Maximum time to wait for pending writes when closing (seconds).
+PENDING_WRITES_CLOSE_TIMEOUT = 1
+
+# Kafka message header keys for the origin and identity of ackcmd messages.
+# These allow a reader to ignore acks for other commanders
+# without decoding the message.
+ACKCMD_ORIGIN_HEADER = "origin"
+ACKCMD_IDENTITY_HEADER = "identity"
+
+# Kafka message header key for the salIndex of messages
+# of indexed components. This allows a reader to ignore messages
+# for other indices without decoding them.
+SAL_INDEX_HEADER = "salIndex"
+
+# Compact the heap of command acknowledgement deadlines when at least
+# this many entries, and at least half of all entries, are obsolete.
+MIN_ACK_DEADLINES_TO_COMPACT = 100
+
+# Default time (seconds) to keep a running command that nobody is
+# waiting on; see `SalInfo.running_cmd_retention`.
+DEFAULT_RUNNING_CMD_RETENTION = 60 * 60
+
+# Default maximum number of running commands;
+# see `SalInfo.max_running_cmds`.
+DEFAULT_MAX_RUNNING_CMDS = 10000
+
 
 def get_random_string() -> str:
     """Get a random string."""
@@ -122,6 +160,42 @@ class SalInfo:
     discard_out_of_order_events : `bool`
         If True, discard event messages that arrive out of order. The default
         is True.
+    slots : `bool`, optional
+        If True then messages use ``__slots__`` instead of a per-instance
+        ``__dict__``, which greatly reduces the memory used by each message.
+        Use `topics.get_data_dict` instead of ``vars`` to get a dict
+        of field name: value from such a message.
+    frozen : `bool`, optional
+        If True and ``slots`` is true then messages of read topics
+        are immutable, so they cannot be accidentally modified
+        and thus changed for all readers.
+    producer_profiles : `dict` [`str`, `dict`] or `None`, optional
+        Kafka producer settings for specific write topics, as a dict of
+        topic selector: dict of producer configuration settings.
+        A selector is a topic kind (one of "cmd_", "evt_", "tel_", "ack_")
+        or a topic attribute name (e.g. "tel_arrays"), which has priority.
+        Settings override the default producer configuration.
+        Topics with the same settings share a Kafka producer.
+        If None, read the profiles from the file specified by
+        environment variable ``LSST_KAFKA_PRODUCER_PROFILES``, if defined,
+        else use no profiles.
+        See Notes for an example.
+    priority_topics : `collections.abc.Iterable` [`str`] or `None`, optional
+        Read topics to read with a separate, high-priority Kafka consumer
+        and read loop, so that they are not delayed by a flood of
+        other messages, such as high-rate telemetry.
+        Each item is a topic kind (one of "cmd_", "evt_", "tel_", "ack_")
+        or a topic attribute name (e.g. "evt_summaryState").
+        For example a CSC might specify ``["cmd_"]`` and a remote
+        ``["ack_", "evt_summaryState"]``.
+        If None or empty then all topics are read by one consumer.
+    indices : `collections.abc.Iterable` [`int`] or `None`, optional
+        The indices whose messages to read, for an indexed component
+        read with ``index=0`` that serves several indices
+        (see `MultiIndexController`). Messages for other indices are
+        ignored, without being decoded if possible.
+        If None then read messages for all indices (if ``index=0``)
+        or only for ``index``.
 
     Raises
     ------
@@ -129,7 +203,9 @@ class SalInfo:
         If ``domain`` is not an instance of `Domain`
         or if ``index`` is not an `int`, `enum.IntEnum`, or `None`.
     ValueError
-        If ``index`` is nonzero and the component is not indexed.
+        If ``index`` is nonzero and the component is not indexed,
+        or if ``indices`` is specified and the component is not indexed,
+        ``index`` is nonzero, or ``indices`` is empty or contains 0.
 
     Attributes
     ----------
@@ -141,6 +217,14 @@ class SalInfo:
         Number of messages to consume in the read loop.
     consume_messages_timeout : `float`
         Timeout to wait for new messages to arrive in the read loop.
+    slots : `bool`
+        The ``slots`` constructor argument.
+    producer_profiles : `dict` [`str`, `dict`]
+        Producer profiles. See the ``producer_profiles`` constructor argument.
+    priority_topics : `frozenset` [`str`]
+        The ``priority_topics`` constructor argument, as a frozenset.
+    frozen : `bool`
+        The ``frozen`` constructor argument.
     identity : `str`
         Value used for the private_identity field of DDS messages.
         Defaults to username@host, but CSCs should use the CSC name:
@@ -169,6 +253,41 @@ class SalInfo:
         in alphabetical order. This is needed to determine command ID.
     component_info : `ComponentInfo`
         Information about the SAL component and its topics.
+    delivery_error_counts : `collections.Counter` [`str`]
+        Dict of topic attribute name (e.g. "tel_arrays"):
+        number of messages that could not be delivered.
+        See also `num_delivery_errors` and `num_pending_writes`.
+    num_ackcmd_filtered : `int`
+        The number of ackcmd messages for other commanders that were
+        ignored without being decoded. See Notes.
+    read_indices : `frozenset` [`int`] or `None`
+        The indices whose messages are read: ``indices``, if specified,
+        else ``{index}`` for an indexed component with nonzero index,
+        else None (read all messages).
+    num_index_filtered : `int`
+        The number of messages for indices not in ``read_indices``
+        that were ignored without being decoded. See Notes.
+    running_cmd_retention : `float`
+        Time (seconds) to keep track of a running command
+        while nobody is waiting for its acknowledgements,
+        e.g. a command started with ``wait_done=False`` whose caller
+        never called ``next_ackcmd``, or whose controller is not running.
+        After this the command is forgotten, and counted in
+        ``num_expired_cmds``. Defaults to ``DEFAULT_RUNNING_CMD_RETENTION``.
+    max_running_cmds : `int`
+        Maximum number of running commands to keep track of.
+        When a new command would exceed this, the oldest running command
+        is forgotten, and counted in ``num_evicted_cmds``; anything waiting
+        for its acknowledgement gets `AckTimeoutError`.
+        Defaults to ``DEFAULT_MAX_RUNNING_CMDS``.
+    num_expired_cmds : `int`
+        The number of running commands forgotten because nobody
+        waited for their acknowledgements in time.
+    num_evicted_cmds : `int`
+        The number of running commands forgotten to make room
+        for new commands.
+    max_num_running_cmds : `int`
+        The largest number of running commands tracked at once.
 
     Notes
     -----
@@ -200,6 +319,49 @@ class SalInfo:
     * ``LSST_KAFKA_PRODUCER_WAIT_ACKS`` (optional): The number of
       acknowledgments the producer requires the leader to have received before
       considering a request complete.
+    * ``LSST_KAFKA_PRODUCER_PROFILES`` (optional): path of a yaml file
+      containing producer profiles; used if ``producer_profiles`` is None.
+
+    **Producer Profiles**
+
+    By default all topics are written with the same low-latency producer.
+    High-rate telemetry with large arrays may be written more efficiently
+    with some batching and compression, at the cost of a bit of latency,
+    while commands and acknowledgements should stay low latency.
+    For example::
+
+        producer_profiles = {
+            "tel_": {
+                "linger.ms": 5,
+                "batch.size": 1000000,
+                "compression.type": "lz4",
+            },
+            "cmd_": {"acks": 1},
+        }
+
+    Note that all producers are flushed every 25 milliseconds,
+    which limits the effective value of ``linger.ms``.
+
+    **Ackcmd Filtering**
+
+    Every commander of a given SAL component reads the same ackcmd topic.
+    To avoid decoding acks meant for other commanders, ackcmd messages
+    are written with Kafka message headers containing the ``origin``
+    and ``identity`` fields of the ack, and the ackcmd reader ignores
+    messages whose headers do not match. Messages without these headers
+    are decoded and then filtered by `topics.AckCmdReader`.
+
+    **Index Filtering**
+
+    All messages of an indexed SAL component share one Kafka topic,
+    so a reader receives the messages of every index.
+    To avoid decoding messages for indices it does not read,
+    messages of indexed components are written with a Kafka message header
+    containing ``salIndex``, and the reader ignores messages whose header
+    does not match ``read_indices``. Messages without this header
+    (e.g. written by an older version of salobj) are decoded
+    and then filtered. Messages are not filtered before decoding
+    while historical data is being read.
 
     **Usage**
 
@@ -240,6 +402,11 @@ class SalInfo:
         consume_messages_timeout: float = 0.1,
         discard_out_of_order_telemetry: bool = True,
         discard_out_of_order_events: bool = True,
+        slots: bool = False,
+        frozen: bool = False,
+        producer_profiles: dict[str, dict[str, typing.Any]] | None = None,
+        priority_topics: Iterable[str] | None = None,
+        indices: Iterable[int] | None = None,
     ) -> None:
         if not isinstance(domain, Domain):
             raise TypeError(f"domain {domain!r} must be an lsst.ts.salobj.Domain")
@@ -253,7 +420,16 @@ class SalInfo:
         self.domain = domain
         self.index = 0 if index is None else index
         self.loop = asyncio.get_running_loop()
-        self.pool = ThreadPoolExecutor(max_workers=100)
+        if domain.share_kafka_resources:
+            self.pool = domain.get_shared_pool()
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=100)
+        # A single thread for unacknowledged writes, so that they are
+        # written in order; created when first needed.
+        # See `_get_unacknowledged_write_pool`.
+        self._unacknowledged_write_pool: ThreadPoolExecutor | None = None
+        # Number of unacknowledged writes not yet handed to the producer.
+        self._num_pending_unacknowledged_writes = 0
         self.write_only = write_only
         self.num_messages = num_messages
         self.consume_messages_timeout = consume_messages_timeout
@@ -261,15 +437,38 @@ class SalInfo:
         self.read_history_start_monotonic = 0.0
         self.discard_out_of_order_telemetry = discard_out_of_order_telemetry
         self.discard_out_of_order_events = discard_out_of_order_events
+        self.slots = slots
+        self.frozen = frozen
+        if producer_profiles is None:
+            producer_profiles = dict()
+            if "LSST_KAFKA_PRODUCER_PROFILES" in os.environ:
+                with open(os.environ["LSST_KAFKA_PRODUCER_PROFILES"]) as fp:
+                    producer_profiles = yaml.safe_load(fp)
+        self.producer_profiles = producer_profiles
+        self.priority_topics = frozenset(
+            priority_topics if priority_topics is not None else ()
+        )
 
         self.start_called = False
+        # True once the on_assign callback has been called for every consumer.
         self.on_assign_called = False
+        # Consumers for which the on_assign callback has been called.
+        self._assigned_consumers: list[Consumer] = []
+        # The number of consumers (0, 1 or 2).
+        self._num_consumers = 0
 
         # Dict of kafka_name: Kafka partition offset of first new data
         # for topics for which we want historical data
         # and historical data is available (offset > 0).
+        # Each consumer reads different topics, so the entries for
+        # one consumer can be cleared without affecting the other.
         self._history_offsets: dict[str, int] = dict()
+        # True once history offsets have been retrieved for every consumer.
         self._history_offsets_retrieved = False
+        # Lock for _history_offsets, _history_offsets_retrieved
+        # and _assigned_consumers, which are modified by the consumer
+        # callbacks, in the consumer threads.
+        self._history_lock = threading.Lock()
 
         # Dict of kafka topic name: dict of index: data
         # Only used for indexed components.
@@ -278,7 +477,14 @@ class SalInfo:
         )
 
         self._consumer: Consumer | None = None
-        self._producer: Producer | None = None
+        # Consumer for priority topics; see `is_priority_topic`.
+        self._priority_consumer: Consumer | None = None
+        # Dict of producer profile key: producer.
+        # There is one producer for each distinct producer profile
+        # used by a write topic; see `get_producer_profile`.
+        self._producers: dict[str, Producer] = dict()
+        # Dict of kafka topic name: producer, for write topics.
+        self._topic_producers: dict[str, Producer] = dict()
 
         # Dict of kafka topic name: (deserializer, serialization context)
         # for read topics.
@@ -315,7 +521,12 @@ class SalInfo:
             )
         )
 
-        self.component_info = ComponentInfo(topic_subname=topic_subname, name=name)
+        if domain.share_kafka_resources:
+            self.component_info = domain.get_shared_component_info(
+                topic_subname=topic_subname, name=name
+            )
+        else:
+            self.component_info = ComponentInfo(topic_subname=topic_subname, name=name)
         # We can only call self.name_index after component_info is setup,
         # so setting up group_id can only be done here instead of at the start
         # of the initialization.
@@ -326,6 +537,8 @@ class SalInfo:
             else f"{name_index}"
         )
         self.group_id = f"{group_id_identity}-{get_random_string()}"
+        # Each consumer acts independently, so needs its own group.
+        self.priority_group_id = f"{self.group_id}-priority"
         self.command_names = tuple(
             sorted(
                 attr_name[4:]
@@ -351,7 +564,12 @@ class SalInfo:
             topic_info.sal_name for topic_info in self.component_info.topics.values()
         )
 
-        self.log = logging.getLogger(name)
+        # When several CSCs share a domain, give each index its own logger,
+        # so that the messages of one CSC are not sent to every CSC's
+        # logMessage topic.
+        self.log = logging.getLogger(
+            self.name_index if domain.share_kafka_resources else name
+        )
         if self.log.getEffectiveLevel() > MAX_LOG_LEVEL:
             self.log.setLevel(MAX_LOG_LEVEL)
 
@@ -366,6 +584,15 @@ class SalInfo:
 
         # dict of private_seqNum: salobj.topics.CommandInfo
         self._running_cmds: dict[int, topics.CommandInfo] = dict()
+        # Heap of [deadline, counter, CommandInfo or None] entries:
+        # the loop time by which each running command must be acknowledged.
+        # Obsolete entries have CommandInfo set to None;
+        # see `_set_ack_deadline`.
+        self._ack_deadlines: list[list[typing.Any]] = []
+        self._ack_deadline_counter = itertools.count()
+        self._num_obsolete_ack_deadlines = 0
+        # Timer that calls `_expire_ack_deadlines` at the earliest deadline.
+        self._ack_deadline_handle: asyncio.TimerHandle | None = None
         # the first RemoteCommand created should set this to
         # an lsst.ts.salobj.topics.AckCmdReader
         # and set its callback to self._ackcmd_callback
@@ -376,6 +603,7 @@ class SalInfo:
         # wait_timeout is a failsafe for shutdown; normally all you have to do
         # is call `close` to trigger the guard condition and stop the wait
         self._read_loop_task = utils.make_done_future()
+        self._priority_read_loop_task = utils.make_done_future()
 
         # Task for the flush loop.
         self._flush_loop_task = utils.make_done_future()
@@ -390,10 +618,29 @@ class SalInfo:
             raise ValueError(
                 f"Index={index!r} must be 0 or None; {name} is not an indexed SAL component"
             )
+        self.read_indices: frozenset[int] | None = None
+        if indices is not None:
+            self.read_indices = frozenset(indices)
+            indices_str = sorted(self.read_indices)
+            if not self.indexed:
+                raise ValueError(
+                    f"indices={indices_str} must be None; "
+                    f"{name} is not an indexed SAL component"
+                )
+            if self.index != 0:
+                raise ValueError(f"indices={indices_str} must be None if index != 0")
+            if not self.read_indices or 0 in self.read_indices:
+                raise ValueError(
+                    f"indices={indices_str} must be non-empty and not contain 0"
+                )
+        elif self.index != 0:
+            self.read_indices = frozenset((self.index,))
         if len(self.command_names) > 0:
             self._ackcmd_type = self.component_info.topics[
                 "ack_ackcmd"
             ].make_dataclass()
+            if self.slots:
+                self._ackcmd_type = topics.make_slots_dataclass(self._ackcmd_type)
 
         domain.add_salinfo(self)
 
@@ -404,6 +651,24 @@ class SalInfo:
         # Keep track of the blocking write tasks.
         self._blocking_write_tasks: set[asyncio.Future[None]] = set()
 
+        # Dict of topic attr_name: number of messages that could not
+        # be delivered (or could not be written, for unacknowledged writes).
+        self.delivery_error_counts: collections.Counter[str] = collections.Counter()
+        # Number of delivery errors since the last summary was logged,
+        # the most recent error, and when the last summary was logged.
+        self._num_new_delivery_errors = 0
+        self._last_delivery_error: Exception | None = None
+        self._delivery_error_report_monotonic = time.monotonic()
+
+        self.num_ackcmd_filtered = 0
+        self.num_index_filtered = 0
+
+        self.running_cmd_retention = DEFAULT_RUNNING_CMD_RETENTION
+        self.max_running_cmds = DEFAULT_MAX_RUNNING_CMDS
+        self.num_expired_cmds = 0
+        self.num_evicted_cmds = 0
+        self.max_num_running_cmds = 0
+
     @property
     def name(self) -> str:
         """Get the SAL component name (the ``name`` constructor argument)."""
@@ -414,6 +679,28 @@ class SalInfo:
         """Is this SAL component indexed?."""
         return self.component_info.indexed
 
+    @property
+    def num_delivery_errors(self) -> int:
+        """Get the total number of messages that could not be delivered.
+
+        See ``delivery_error_counts`` for the number for each topic.
+        """
+        return sum(self.delivery_error_counts.values())
+
+    @property
+    def num_pending_writes(self) -> int:
+        """Get the number of messages that are being serialized
+        and handed to the Kafka producer.
+        """
+        return len(self._blocking_write_tasks)
+
+    @property
+    def num_running_cmds(self) -> int:
+        """Get the number of running commands being tracked:
+        commands that have been issued and are not known to be finished.
+        """
+        return len(self._running_cmds)
+
     async def _ackcmd_callback(self, data: type_hints.AckCmdDataType) -> None:
         if not self._running_cmds:
             return
@@ -424,7 +711,145 @@ class SalInfo:
             return
         isdone = cmd_info.add_ackcmd(data)
         if isdone:
-            del self._running_cmds[data.private_seqNum]
+            self._remove_running_cmd(data.private_seqNum)
+
+    def _add_running_cmd(self, cmd_info: topics.CommandInfo) -> None:
+        """Start tracking a command that is about to be issued.
+
+        If this would exceed ``max_running_cmds`` then first evict
+        the oldest running commands. Set a deadline of
+        ``running_cmd_retention``, which is replaced by the acknowledgement
+        deadline when something waits for an acknowledgement.
+
+        Parameters
+        ----------
+        cmd_info : `topics.CommandInfo`
+            Information about the command.
+
+        Raises
+        ------
+        RuntimeError
+            If a command with the same seq_num is already running.
+        """
+        seq_num = cmd_info.seq_num
+        if seq_num in self._running_cmds:
+            raise RuntimeError(
+                f"{cmd_info.remote_command.attr_name} a command with seq_num={seq_num} "
+                "is already running. "
+                "This may indicate a bug in ts_salobj SalInfo or RemoteCommand."
+            )
+        while len(self._running_cmds) >= max(self.max_running_cmds, 1):
+            oldest_seq_num = next(iter(self._running_cmds))
+            oldest_cmd_info = self._remove_running_cmd(oldest_seq_num)
+            self.num_evicted_cmds += 1
+            if oldest_cmd_info is not None:
+                oldest_cmd_info._expire()
+        self._running_cmds[seq_num] = cmd_info
+        self.max_num_running_cmds = max(
+            self.max_num_running_cmds, len(self._running_cmds)
+        )
+        self._set_ack_deadline(cmd_info, self.loop.time() + self.running_cmd_retention)
+
+    def _remove_running_cmd(self, seq_num: int) -> topics.CommandInfo | None:
+        """Stop tracking a running command and clear its deadline.
+
+        Parameters
+        ----------
+        seq_num : `int`
+            The command's private_seqNum.
+
+        Returns
+        -------
+        cmd_info : `topics.CommandInfo` | `None`
+            Information about the command, or None if not running.
+        """
+        cmd_info = self._running_cmds.pop(seq_num, None)
+        if cmd_info is not None:
+            self._set_ack_deadline(cmd_info, None)
+        return cmd_info
+
+    def _set_ack_deadline(
+        self, cmd_info: topics.CommandInfo, deadline: float | None
+    ) -> None:
+        """Set or clear the acknowledgement deadline of a running command.
+
+        When the deadline passes, call ``cmd_info._expire()``.
+
+        Parameters
+        ----------
+        cmd_info : `topics.CommandInfo`
+            Information about the command.
+        deadline : `float` | `None`
+            The deadline, as an event loop time (see `asyncio.loop.time`);
+            replaces any existing deadline for this command.
+            If None then clear the existing deadline, if any.
+
+        Notes
+        -----
+        All deadlines share one heap and one event loop timer,
+        which is only re-armed if the earliest deadline changes,
+        so setting a deadline is O(log n) in the number of deadlines.
+        Replaced and cleared deadlines are marked obsolete in place
+        and the heap is compacted when they make up more than half of it.
+        """
+        entry = cmd_info._ack_deadline_entry
+        if entry is not None:
+            entry[-1] = None
+            cmd_info._ack_deadline_entry = None
+            self._num_obsolete_ack_deadlines += 1
+            if (
+                self._num_obsolete_ack_deadlines >= MIN_ACK_DEADLINES_TO_COMPACT
+                and self._num_obsolete_ack_deadlines * 2 > len(self._ack_deadlines)
+            ):
+                self._ack_deadlines = [
+                    item for item in self._ack_deadlines if item[-1] is not None
+                ]
+                heapq.heapify(self._ack_deadlines)
+                self._num_obsolete_ack_deadlines = 0
+        if deadline is None:
+            return
+
+        entry = [deadline, next(self._ack_deadline_counter), cmd_info]
+        cmd_info._ack_deadline_entry = entry
+        heapq.heappush(self._ack_deadlines, entry)
+        if (
+            self._ack_deadline_handle is None
+            or deadline < self._ack_deadline_handle.when()
+        ):
+            if self._ack_deadline_handle is not None:
+                self._ack_deadline_handle.cancel()
+            self._ack_deadline_handle = self.loop.call_at(
+                deadline, self._expire_ack_deadlines
+            )
+
+    def _expire_ack_deadlines(self) -> None:
+        """Expire all commands whose acknowledgement deadline has passed,
+        and re-arm the timer for the next deadline.
+        """
+        self._ack_deadline_handle = None
+        now = self.loop.time()
+        while self._ack_deadlines and self._ack_deadlines[0][0] <= now:
+            _, _, cmd_info = heapq.heappop(self._ack_deadlines)
+            if cmd_info is None:
+                self._num_obsolete_ack_deadlines -= 1
+                continue
+            cmd_info._ack_deadline_entry = None
+            cmd_info._expire()
+        if self._ack_deadlines:
+            self._ack_deadline_handle = self.loop.call_at(
+                self._ack_deadlines[0][0], self._expire_ack_deadlines
+            )
+
+    def _clear_ack_deadlines(self) -> None:
+        """Clear all acknowledgement deadlines and cancel the timer."""
+        if self._ack_deadline_handle is not None:
+            self._ack_deadline_handle.cancel()
+            self._ack_deadline_handle = None
+        for entry in self._ack_deadlines:
+            if entry[-1] is not None:
+                entry[-1]._ack_deadline_entry = None
+        self._ack_deadlines = []
+        self._num_obsolete_ack_deadlines = 0
 
     @property
     def AckCmdType(self) -> typing.Type[type_hints.AckCmdDataType]:
@@ -544,8 +969,11 @@ class SalInfo:
             return
         self.isopen = False
         self._read_loop_task.cancel()
-        if self._consumer is not None:
-            self._consumer.close()
+        self._priority_read_loop_task.cancel()
+        self._clear_ack_deadlines()
+        for consumer in (self._consumer, self._priority_consumer):
+            if consumer is not None:
+                consumer.close()
         for reader in self._read_topics.values():
             reader.basic_close()
         for writer in self._write_topics.values():
@@ -568,14 +996,15 @@ class SalInfo:
         if not self._run_kafka_result.done():
             self._run_kafka_result.set_result(None)
 
-        try:
-            await asyncio.wait_for(
-                self._read_loop_task,
-                timeout=0.5,
-            )
-        except Exception as e:
-            print(f"Read loop failed: {e!r}")
-            self.log.exception("Exception waiting for read loop to finish.")
+        for read_loop_task in (self._read_loop_task, self._priority_read_loop_task):
+            try:
+                await asyncio.wait_for(
+                    read_loop_task,
+                    timeout=0.5,
+                )
+            except Exception as e:
+                print(f"Read loop failed: {e!r}")
+                self.log.exception("Exception waiting for read loop to finish.")
 
         try:
             await asyncio.wait_for(
@@ -586,6 +1015,13 @@ class SalInfo:
             print(f"Flush loop failed: {e!r}")
             self.log.exception("Exception waiting for read loop to finish.")
 
+        if self._blocking_write_tasks:
+            # Give unacknowledged writes a chance to finish.
+            await asyncio.wait(
+                self._blocking_write_tasks, timeout=PENDING_WRITES_CLOSE_TIMEOUT
+            )
+        self._report_delivery_errors()
+
         try:
             await asyncio.wait_for(
                 self._run_kafka_task,
@@ -598,14 +1034,18 @@ class SalInfo:
             self.log.exception("Exception waiting for kafka loop to finish.")
 
         try:
-            if not self._read_loop_task.done():
-                self._read_loop_task.cancel()
-                try:
-                    await self._read_loop_task
-                except asyncio.CancelledError:
-                    pass
-                except Exception as e:
-                    print(f"Error in read_loop_task: {e!r}")
+            for read_loop_task in (
+                self._read_loop_task,
+                self._priority_read_loop_task,
+            ):
+                if not read_loop_task.done():
+                    read_loop_task.cancel()
+                    try:
+                        await read_loop_task
+                    except asyncio.CancelledError:
+                        pass
+                    except Exception as e:
+                        print(f"Error in read_loop_task: {e!r}")
             if cancel_run_kafka_task and not self._run_kafka_task.done():
                 self._run_kafka_task.cancel()
                 try:
@@ -614,8 +1054,9 @@ class SalInfo:
                     pass
                 except Exception as e:
                     print(f"Error in run_kafka_task: {e!r}")
-            if self._consumer is not None:
-                self._consumer.close()
+            for consumer in (self._consumer, self._priority_consumer):
+                if consumer is not None:
+                    consumer.close()
             for reader in self._read_topics.values():
                 await reader.close()
             for writer in self._write_topics.values():
@@ -626,6 +1067,7 @@ class SalInfo:
                     cmd_info.close()
                 except Exception:
                     pass
+            self._clear_ack_deadlines()
             self.domain.remove_salinfo(self)
             self._close_kafka()
         except Exception as e:
@@ -693,21 +1135,25 @@ class SalInfo:
         self._run_kafka_task = asyncio.create_task(self._run_kafka())
         await self.start_task
 
-        self._flush_loop_task = asyncio.create_task(self.flush_loop())
+        if self.domain.share_kafka_resources:
+            # The domain flushes the shared producers.
+            self.domain.start_shared_flush_loop()
+        else:
+            self._flush_loop_task = asyncio.create_task(self.flush_loop())
 
     async def _run_kafka(self) -> None:
         """Initialize Kafka and run the read loop.
 
         Set the following attributes:
 
-        * self._consumer
-        * self._producer
+        * self._consumer and self._priority_consumer
+        * self._producers and self._topic_producers
         * self._deserializers_and_contexts
         * self._serializers_and_contexts
 
         Register schemas and create missing topics.
 
-        Wait for the read loop to finish.
+        Wait for the read loop(s) to finish.
         """
         try:
             # Create Kafka topics, serializers, and deserializers.
@@ -726,11 +1172,18 @@ class SalInfo:
                 await self._run_kafka_result
             else:
                 # There are read topics, so self.start_task will be
-                # set done in self._read_loop_task.
-                self._read_loop_task = asyncio.create_task(self._read_loop())
-                # Keep running until the self._read_loop_task and/or
+                # set done in a read loop task.
+                if self._consumer is not None:
+                    self._read_loop_task = asyncio.create_task(self._read_loop())
+                if self._priority_consumer is not None:
+                    self._priority_read_loop_task = asyncio.create_task(
+                        self._read_loop(priority=True)
+                    )
+                # Keep running until the read loop tasks and/or
                 # self._run_kafka_task are cancelled.
-                await self._read_loop_task
+                await asyncio.gather(
+                    self._read_loop_task, self._priority_read_loop_task
+                )
         except asyncio.CancelledError:
             pass
         except Exception as e:
@@ -749,20 +1202,25 @@ class SalInfo:
         Create topics in the Kafka broker.
         Register topic schemas with the Kafka schema registry.
         CCreate serializers and deserializers.
-        Create a consumer if there are any read topics.
-        Create a producer if there are any write topics.
+        Create consumers if there are any read topics.
+        Create producers if there are any write topics.
 
         Set the following attributes:
 
-        * _consumer, if there are any read topics
-        * _producer, if there are any write topics
+        * _consumer and _priority_consumer, if there are any read topics
+        * _producers and _topic_producers, if there are any write topics
         * _deserializers_and_contexts
         * _serializers_and_contexts
         """
         self._blocking_create_topics()
-        self._schema_registry_client = SchemaRegistryClient(
-            dict(url=self.schema_registry_url)
-        )
+        if self.domain.share_kafka_resources:
+            self._schema_registry_client = (
+                self.domain.get_shared_schema_registry_client(self.schema_registry_url)
+            )
+        else:
+            self._schema_registry_client = SchemaRegistryClient(
+                dict(url=self.schema_registry_url)
+            )
         self._blocking_register_schema(
             schema_registry_client=self._schema_registry_client
         )
@@ -890,7 +1348,12 @@ class SalInfo:
         return broker_client_configuration
 
     def _blocking_create_consumer(self) -> None:
-        """Create self._consumer and subscribe to topics.
+        """Create self._consumer and/or self._priority_consumer
+        and subscribe to topics.
+
+        Priority topics (see `is_priority_topic`) are read by
+        self._priority_consumer and all other topics by self._consumer.
+        Each consumer is only created if it has topics to read.
 
         Also schedule self._blocking_on_assign_callback to fire when partitions
         are assigned (since the task cannot be done earlier).
@@ -902,10 +1365,47 @@ class SalInfo:
             self._history_offsets_retrieved = True
             return
 
+        read_topic_names: list[str] = []
+        priority_read_topic_names: list[str] = []
+        for kafka_name, read_topic in self._read_topics.items():
+            if self.is_priority_topic(read_topic.attr_name):
+                priority_read_topic_names.append(kafka_name)
+            else:
+                read_topic_names.append(kafka_name)
+        self._num_consumers = int(bool(read_topic_names)) + int(
+            bool(priority_read_topic_names)
+        )
+
+        if read_topic_names:
+            self._consumer = self._blocking_make_consumer(
+                group_id=self.group_id, topic_names=read_topic_names
+            )
+        if priority_read_topic_names:
+            self._priority_consumer = self._blocking_make_consumer(
+                group_id=self.priority_group_id, topic_names=priority_read_topic_names
+            )
+
+    def _blocking_make_consumer(
+        self, group_id: str, topic_names: list[str]
+    ) -> Consumer:
+        """Make a consumer and subscribe it to the specified topics.
+
+        Parameters
+        ----------
+        group_id : `str`
+            Consumer group ID.
+        topic_names : `list` [`str`]
+            Kafka names of the topics to subscribe to.
+
+        Returns
+        -------
+        consumer : `Consumer`
+            The consumer.
+        """
         consumer_configuration = {
             # Make sure every consumer is in its own consumer group,
             # since each consumer acts independently.
-            "group.id": self.group_id,
+            "group.id": group_id,
             # Require explicit topic creation, so we can control
             # topic configuration, and to reduce startup latency.
             "allow.auto.create.topics": False,
@@ -924,13 +1424,11 @@ class SalInfo:
 
         consumer_configuration.update(self.get_broker_client_configuration())
 
-        self._consumer = Consumer(consumer_configuration)
-
-        read_topic_names = list(self._read_topics.keys())
+        consumer = Consumer(consumer_configuration)
 
         try:
-            self._consumer.subscribe(
-                read_topic_names,
+            consumer.subscribe(
+                topic_names,
                 on_assign=self._blocking_on_assign_callback,
                 on_revoke=self._blocking_on_revoke_callback,
                 on_lost=self._blocking_on_lost_callback,
@@ -938,16 +1436,64 @@ class SalInfo:
         except (KafkaException, RuntimeError):
             self.log.exception("Consumer subscription failed.")
             raise
+        return consumer
+
+    def is_priority_topic(self, attr_name: str) -> bool:
+        """Is the specified read topic a priority topic?
+
+        Priority topics are read by a separate consumer and read loop.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Topic attribute name, e.g. "cmd_start" or "evt_summaryState".
+
+        Returns
+        -------
+        is_priority : `bool`
+            True if ``attr_name`` or its topic kind (the first four
+            characters of ``attr_name``, e.g. "cmd_") is in
+            ``priority_topics``.
+        """
+        return (
+            attr_name in self.priority_topics or attr_name[0:4] in self.priority_topics
+        )
+
+    def get_producer_profile(self, attr_name: str) -> dict[str, typing.Any]:
+        """Get the producer profile for a write topic.
+
+        A producer profile is a dict of Kafka producer configuration
+        settings that override the default producer configuration.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Topic attribute name, e.g. "tel_arrays" or "evt_summaryState".
+
+        Returns
+        -------
+        profile : `dict` [`str`, ``any``]
+            The entry in ``producer_profiles`` for ``attr_name``, if present,
+            else the entry for the topic kind (the first four characters
+            of ``attr_name``, e.g. "tel_"), if present, else an empty dict.
+        """
+        profile = self.producer_profiles.get(attr_name)
+        if profile is None:
+            profile = self.producer_profiles.get(attr_name[0:4], dict())
+        return profile
 
     def _blocking_create_producer(self) -> None:
-        """Create self._producer.
+        """Create self._producers and self._topic_producers.
+
+        Write topics that have the same producer profile
+        (see `get_producer_profile`) share a producer.
 
         A no-op if there are not write topics.
         """
         if not self._write_topics:
             return
 
-        producer_configuration = {
+        default_producer_configuration = {
             "acks": os.environ.get(
                 "LSST_KAFKA_PRODUCER_WAIT_ACKS",
                 DEFAULT_LSST_KAFKA_PRODUCER_WAIT_ACKS,
@@ -958,18 +1504,32 @@ class SalInfo:
         if "LSST_KAFKA_PRODUCER_CONFIGURATION" in os.environ:
             with open(os.environ["LSST_KAFKA_PRODUCER_CONFIGURATION"]) as fp:
                 additional_producer_configuration = yaml.safe_load(fp)
-                producer_configuration.update(additional_producer_configuration)
+                default_producer_configuration.update(additional_producer_configuration)
 
-        producer_configuration.update(self.get_broker_client_configuration())
+        broker_client_configuration = self.get_broker_client_configuration()
+
+        for kafka_name, topic in self._write_topics.items():
+            profile = self.get_producer_profile(topic.attr_name)
+            profile_key = json.dumps(profile, sort_keys=True)
+            producer = self._producers.get(profile_key)
+            if producer is None:
+                producer_configuration = dict(default_producer_configuration)
+                producer_configuration.update(profile)
+                producer_configuration.update(broker_client_configuration)
+                if self.domain.share_kafka_resources:
+                    producer = self.domain.get_shared_producer(producer_configuration)
+                else:
+                    producer = Producer(producer_configuration)
+                self._producers[profile_key] = producer
+            self._topic_producers[kafka_name] = producer
 
-        self._producer = Producer(producer_configuration)
         # Work around https://github.com/confluentinc/
         # confluent-kafka-dotnet/issues/701
         # a 1 second delay in the first message for a topic.
         failed_list_topics = set()
-        for topic in self._write_topics.keys():
+        for topic, producer in self._topic_producers.items():
             try:
-                self._producer.list_topics(topic=topic, timeout=1)
+                producer.list_topics(topic=topic, timeout=1)
             except Exception:
                 failed_list_topics.add(topic)
 
@@ -983,10 +1543,26 @@ class SalInfo:
     async def flush_loop(self) -> None:
         """Constantly call flush to force data to be delivered."""
 
-        while self._producer is not None and self.isopen:
-            self._producer.flush()
+        while self._producers and self.isopen:
+            for producer in self._producers.values():
+                producer.flush()
+            self.report_delivery_errors_if_due()
             await asyncio.sleep(self._flush_period)
 
+    def report_delivery_errors_if_due(self) -> None:
+        """Log a summary of delivery errors, if there are new errors
+        and the last summary was long enough ago.
+
+        Called by `flush_loop`, or by the domain's flush loop
+        if ``Domain.share_kafka_resources``.
+        """
+        if (
+            self._num_new_delivery_errors > 0
+            and time.monotonic() - self._delivery_error_report_monotonic
+            >= DELIVERY_ERROR_REPORT_INTERVAL
+        ):
+            self._report_delivery_errors()
+
     def _blocking_register_schema(
         self, schema_registry_client: SchemaRegistryClient
     ) -> None:
@@ -1040,24 +1616,34 @@ class SalInfo:
                 SerializationContext(
                     topic=topic.topic_info.kafka_name, field=MessageField.VALUE
                 ),
-                (
-                    ""
-                    if topic.topic_info.attr_name.startswith("tel_")
-                    else (
-                        f'{{ "name": "{self.name}", "topic": "{topic.topic_info.sal_name}" }}'
-                        if not self.indexed
-                        else (
-                            f'{{ "name": "{self.name}", '
-                            f'"index": {self.index}, '
-                            f'"topic": "{topic.topic_info.sal_name}" }}'
-                        )
-                    )
-                ),
+                self._make_message_key(topic.topic_info, self.index),
             )
             for topic in self._write_topics.values()
         }
         self._serializers_and_contexts = serializers_and_contexts
 
+    def _make_message_key(self, topic_info: TopicInfo, index: int) -> str:
+        """Make the Kafka message key for a write topic.
+
+        Parameters
+        ----------
+        topic_info : `TopicInfo`
+            Topic information.
+        index : `int`
+            SAL index of the message; ignored if the component
+            is not indexed.
+        """
+        if topic_info.attr_name.startswith("tel_"):
+            return ""
+        elif not self.indexed:
+            return f'{{ "name": "{self.name}", "topic": "{topic_info.sal_name}" }}'
+        else:
+            return (
+                f'{{ "name": "{self.name}", '
+                f'"index": {index}, '
+                f'"topic": "{topic_info.sal_name}" }}'
+            )
+
     def get_max_history_for_indexed_component(self) -> int:
         """Get the max history size for an indexed component.
 
@@ -1089,6 +1675,135 @@ class SalInfo:
 
         return max_history
 
+    async def read_latest_data(
+        self, attr_name: str, num_messages: int = 1, timeout: float = 5
+    ) -> list[type_hints.BaseMsgType]:
+        """Read the most recent messages of a topic directly from the broker.
+
+        This is much cheaper than making a `Remote` to read the topic:
+        it uses a short-lived consumer that is assigned to the end of
+        the topic, without joining a consumer group, creating topics,
+        or registering schemas. It is intended for quick checks,
+        such as looking for a heartbeat from a duplicate CSC.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Topic attribute name, e.g. "evt_heartbeat".
+            The topic need not be read or written by this SalInfo.
+        num_messages : `int`, optional
+            Maximum number of messages to return.
+        timeout : `float`, optional
+            Time limit for reading (seconds).
+
+        Returns
+        -------
+        data_list : `list` [``DataType``]
+            Up to ``num_messages`` of the most recent messages,
+            oldest first. If `read_indices` is not None then only
+            messages for those indices are returned.
+
+        Raises
+        ------
+        RuntimeError
+            If not running.
+        ValueError
+            If ``num_messages`` < 1.
+        KeyError
+            If ``attr_name`` is not a topic of this component.
+        """
+        self.assert_running()
+        if num_messages < 1:
+            raise ValueError(f"{num_messages=} must be positive")
+        topic_info = self.component_info.topics[attr_name]
+        return await self.loop.run_in_executor(
+            self.pool,
+            self._blocking_read_latest_data,
+            topic_info,
+            num_messages,
+            timeout,
+        )
+
+    def _blocking_read_latest_data(
+        self, topic_info: TopicInfo, num_messages: int, timeout: float
+    ) -> list[type_hints.BaseMsgType]:
+        """Read the most recent messages of a topic.
+
+        See `read_latest_data` for details.
+        """
+        deadline = time.monotonic() + timeout
+        # Messages for other indices of an indexed component
+        # share the topic, so read enough to find messages for this index.
+        num_to_read = (
+            max(num_messages, self.get_max_history_for_indexed_component())
+            if self.read_indices is not None
+            else num_messages
+        )
+        consumer = Consumer(
+            dict(
+                self.get_broker_client_configuration(),
+                **{
+                    "group.id": f"{self.group_id}-latest",
+                    "enable.auto.commit": False,
+                    "allow.auto.create.topics": False,
+                },
+            )
+        )
+        try:
+            partitions: list[TopicPartition] = []
+            num_expected = 0
+            for partition_id in range(topic_info.partitions):
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    break
+                partition = TopicPartition(topic_info.kafka_name, partition_id)
+                min_offset, max_offset = consumer.get_watermark_offsets(
+                    partition, timeout=remaining_time, cached=False
+                )
+                start_offset = max(min_offset, max_offset - num_to_read)
+                if max_offset > start_offset:
+                    partition.offset = start_offset
+                    partitions.append(partition)
+                    num_expected += max_offset - start_offset
+            if not partitions:
+                return []
+            consumer.assign(partitions)
+
+            deserializer = AvroDeserializer(
+                schema_registry_client=self._schema_registry_client,
+                schema_str=json.dumps(topic_info.make_avro_schema()),
+            )
+            context = SerializationContext(
+                topic=topic_info.kafka_name, field=MessageField.VALUE
+            )
+            DataType = topic_info.make_dataclass()
+            data_list: list[type_hints.BaseMsgType] = []
+            num_read = 0
+            while num_read < num_expected:
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    break
+                messages = consumer.consume(
+                    num_messages=num_expected - num_read, timeout=remaining_time
+                )
+                for message in messages:
+                    num_read += 1
+                    if message.error() is not None:
+                        continue
+                    if self.read_indices is not None:
+                        if self._is_foreign_index(message):
+                            continue
+                        data_dict = deserializer(message.value(), context)
+                        if data_dict["salIndex"] not in self.read_indices:
+                            continue
+                    else:
+                        data_dict = deserializer(message.value(), context)
+                    data_list.append(DataType(**data_dict))
+        finally:
+            consumer.close()
+        data_list.sort(key=lambda data: data.private_sndStamp)
+        return data_list[-num_messages:]
+
     def _blocking_on_assign_callback(
         self, consumer: Consumer, partitions: list[TopicPartition]
     ) -> None:
@@ -1099,9 +1814,9 @@ class SalInfo:
         Parameters
         ----------
         consumer
-            Kafka consumer (ignored).
+            Kafka consumer: self._consumer or self._priority_consumer.
         partitions
-            List of TopicPartitions assigned to self._consumer.
+            List of TopicPartitions assigned to ``consumer``.
 
         Notes
         -----
@@ -1111,23 +1826,28 @@ class SalInfo:
         Adjust the offset of the partitions to get the desired
         amount of historical data.
 
-        Note: the on_assign callback must call self._consumer.assign
+        Note: the on_assign callback must call consumer.assign
         with all partitions passed in, and it also must set the ``offset``
         attribute of each of these partitions, regardless if whether want
         historical data for that topic.
-        """
-        assert self._consumer is not None
 
+        If there are two consumers, historical offsets are not reported
+        as retrieved until this callback has been called for both.
+        """
         self.log.debug(f"Assigning partitions: {partitions}")
-        self.log.debug(f"Currently assigned: {self._consumer.assignment()}")
-        if self.on_assign_called:
+        self.log.debug(f"Currently assigned: {consumer.assignment()}")
+        with self._history_lock:
+            reassigned = any(
+                assigned is consumer for assigned in self._assigned_consumers
+            )
+        if reassigned:
             self.log.info("on_assign called again; partitions[0]=%s", partitions[0])
-            # We must call self._consumer.assign in order to continue reading,
-            # but do not want any more historical data.
+            # We must call consumer.assign in order to continue reading,
+            # but do not want any more historical data for this consumer.
+            # Leave the history of the other consumer (if any) alone.
             read_history_topics = set()
-            self._history_offsets_retrieved = True
+            self._clear_history_offsets(partitions)
         else:
-            self.on_assign_called = True
             # Kafka topic names for topics for which we want history
             read_history_topics = {
                 read_topic.topic_info.kafka_name
@@ -1140,7 +1860,7 @@ class SalInfo:
         history_offsets: dict[str, int] = dict()
 
         for partition in partitions:
-            min_offset, max_offset = self._consumer.get_watermark_offsets(
+            min_offset, max_offset = consumer.get_watermark_offsets(
                 partition, cached=False
             )
 
@@ -1166,11 +1886,34 @@ class SalInfo:
                 partition.offset = desired_offset
             history_offsets[partition.topic] = max_offset - 1
 
-        self._consumer.assign(partitions)
-        self.log.debug(f"Now assigned: {self._consumer.assignment()}")
+        consumer.assign(partitions)
+        self.log.debug(f"Now assigned: {consumer.assignment()}")
+
+        with self._history_lock:
+            self._history_offsets.update(history_offsets)
+            if not reassigned:
+                self._assigned_consumers.append(consumer)
+            if len(self._assigned_consumers) >= self._num_consumers:
+                self.on_assign_called = True
+                self._history_offsets_retrieved = True
+
+    def _is_history_read(self) -> bool:
+        """Has all wanted historical data been read, for every consumer?"""
+        with self._history_lock:
+            return self._history_offsets_retrieved and not self._history_offsets
+
+    def _clear_history_offsets(self, partitions: list[TopicPartition]) -> None:
+        """Stop waiting for historical data for the topics of the
+        specified partitions, which all belong to one consumer.
 
-        self._history_offsets = history_offsets
-        self._history_offsets_retrieved = True
+        Parameters
+        ----------
+        partitions
+            List of TopicPartitions.
+        """
+        with self._history_lock:
+            for partition in partitions:
+                self._history_offsets.pop(partition.topic, None)
 
     def _blocking_on_revoke_callback(
         self, consumer: Consumer, partitions: list[TopicPartition]
@@ -1182,7 +1925,7 @@ class SalInfo:
         consumer
             Kafka consumer (ignored).
         partitions
-            List of TopicPartitions assigned to self._consumer.
+            List of TopicPartitions assigned to ``consumer``.
         """
         self.log.debug(f"Partitions revoked: {partitions}")
 
@@ -1196,21 +1939,20 @@ class SalInfo:
         consumer
             Kafka consumer (ignored).
         partitions
-            List of TopicPartitions assigned to self._consumer.
+            List of TopicPartitions assigned to ``consumer``.
 
         Notes
         -----
         This callback is intended to shed light on hanging components.
         """
         self.log.debug(f"Partitions lost: {partitions}")
-        self._history_offsets = {}
-        self._history_offsets_retrieved = True
+        self._clear_history_offsets(partitions)
 
     def _blocking_write(
         self,
         topic_info: TopicInfo,
         data_dict: dict[str, typing.Any],
-        future: asyncio.Future,
+        future: asyncio.Future | None,
     ) -> None:
         """Write a Kafka message and wait for acknowledgement.
 
@@ -1218,55 +1960,143 @@ class SalInfo:
             Kafka topic name.
         raw_data : `bytes`
             Raw data to write.
-        future : `asyncio.Future`
-            Future to set done when the data has been acknowledged.
+        future : `asyncio.Future` | `None`
+            Future to set done when the data has been acknowledged,
+            or None if the write is unacknowledged.
         """
-        assert self._producer is not None
-
         kafka_name = topic_info.kafka_name
+        producer = self._topic_producers[kafka_name]
         (
             serializer,
             serialization_context,
             key,
         ) = self._serializers_and_contexts[kafka_name]
         raw_data = serializer(data_dict, serialization_context)
+        headers: list[tuple[str, bytes]] | None = None
+        if self.indexed:
+            sal_index = data_dict["salIndex"]
+            headers = [(SAL_INDEX_HEADER, str(sal_index).encode())]
+            if key and sal_index != self.index:
+                # Written for another index, e.g. by a MultiIndexController.
+                key = self._make_message_key(topic_info, sal_index)
+        if topic_info.attr_name == "ack_ackcmd":
+            headers = (headers or []) + [
+                (ACKCMD_ORIGIN_HEADER, str(data_dict["origin"]).encode()),
+                (ACKCMD_IDENTITY_HEADER, data_dict["identity"].encode()),
+            ]
 
         t0 = time.monotonic()
 
         def callback(err: KafkaError, _: Message) -> None:
             if err:
                 self.loop.call_soon_threadsafe(
-                    future.set_exception, KafkaException(err)
+                    self._handle_delivery_error,
+                    topic_info.attr_name,
+                    KafkaException(err),
+                    future,
                 )
             else:
                 dt = time.monotonic() - t0
-                self.loop.call_soon_threadsafe(future.set_result, None)
+                if future is not None:
+                    self.loop.call_soon_threadsafe(future.set_result, None)
                 if dt > 0.1:
                     print(
                         f"warning: {self.name}:{self.index} write "
                         f"{topic_info.sal_name} took {dt:0.2f} seconds."
                     )
 
-        self._producer.produce(
+        producer.produce(
             kafka_name,
             key=key,
             value=raw_data,
+            headers=headers,
             on_delivery=callback,
         )
 
+    def _handle_delivery_error(
+        self, attr_name: str, error: Exception, future: asyncio.Future | None
+    ) -> None:
+        """Record a message that could not be delivered.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Attribute name of the topic, e.g. "tel_arrays".
+        error : `Exception`
+            The error.
+        future : `asyncio.Future` | `None`
+            Future to set to the exception, if any.
+        """
+        self.delivery_error_counts[attr_name] += 1
+        self._num_new_delivery_errors += 1
+        self._last_delivery_error = error
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    def _report_delivery_errors(self) -> None:
+        """Log a summary of delivery errors since the last summary, if any."""
+        if self._num_new_delivery_errors > 0:
+            duration = time.monotonic() - self._delivery_error_report_monotonic
+            self.log.warning(
+                f"Failed to deliver {self._num_new_delivery_errors} messages "
+                f"in the last {duration:0.1f} seconds; "
+                f"most recent error: {self._last_delivery_error!r}; "
+                f"total failures by topic: {dict(self.delivery_error_counts)}"
+            )
+        self._num_new_delivery_errors = 0
+        self._delivery_error_report_monotonic = time.monotonic()
+
+    def _get_unacknowledged_write_pool(self) -> ThreadPoolExecutor:
+        """Get the single-thread pool for unacknowledged writes,
+        creating it if necessary.
+
+        If ``domain.share_kafka_resources`` then the pool is shared
+        by all SalInfo in the domain.
+        """
+        if self.domain.share_kafka_resources:
+            return self.domain.get_shared_unacknowledged_write_pool()
+        if self._unacknowledged_write_pool is None:
+            self._unacknowledged_write_pool = ThreadPoolExecutor(max_workers=1)
+        return self._unacknowledged_write_pool
+
+    def _unacknowledged_write_done(self, task: asyncio.Future, attr_name: str) -> None:
+        """Record the failure of an unacknowledged write, if it failed."""
+        self._blocking_write_tasks.discard(task)
+        self._num_pending_unacknowledged_writes -= 1
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._handle_delivery_error(
+                attr_name=attr_name, error=error, future=None  # type: ignore
+            )
+
     def _close_kafka(self) -> None:
         """Close the Kafka objects and shut down self.pool.
 
         Destroying the Kafka objects prevents pytest from accumulating
         threads as it runs.
-        """
-        self.pool.shutdown(wait=True, cancel_futures=True)
 
-        if self._producer is not None:
-            self._producer.flush()
-            self._producer.purge()
-        self._producer = None
+        Resources shared via the domain (see
+        ``Domain.share_kafka_resources``) are neither flushed
+        nor destroyed; the domain flushes the shared producers
+        in the background, and releases them when it is closed.
+        """
+        shared = self.domain.share_kafka_resources
+        if not shared:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        if self._unacknowledged_write_pool is not None:
+            self._unacknowledged_write_pool.shutdown(wait=True, cancel_futures=True)
+            self._unacknowledged_write_pool = None
+
+        if not shared:
+            for producer in self._producers.values():
+                producer.flush()
+                producer.purge()
+        self._producers = dict()
+        self._topic_producers = dict()
         self._consumer = None
+        self._priority_consumer = None
         self._serializers_and_contexts = dict()
         self._deserializers_and_contexts = dict()
         self._schema_registry_client = None
@@ -1276,7 +2106,10 @@ class SalInfo:
 
         broker_client = AdminClient(broker_client_configuration)
 
-        deleted_groups = broker_client.delete_consumer_groups([self.group_id])
+        group_ids = [self.group_id]
+        if self.priority_topics:
+            group_ids.append(self.priority_group_id)
+        deleted_groups = broker_client.delete_consumer_groups(group_ids)
 
         for future in deleted_groups.values():
             try:
@@ -1291,20 +2124,29 @@ class SalInfo:
                     self.log.info(f"Ignoring {kafka_error=}.")
             except Exception:
                 self.log.exception(
-                    f"Error while waiting for consumer group {self.group_id} to be deleted."
+                    f"Error while waiting for consumer groups {group_ids} to be deleted."
                 )
 
-    async def _read_loop(self) -> None:
-        """Read and process messages."""
+    async def _read_loop(self, priority: bool = False) -> None:
+        """Read and process messages.
+
+        Parameters
+        ----------
+        priority : `bool`, optional
+            If True, read priority topics using self._priority_consumer,
+            else read all other topics using self._consumer.
+        """
         self.domain.num_read_loops += 1
-        if self._consumer is None:
+        consumer = self._priority_consumer if priority else self._consumer
+        group_id = self.priority_group_id if priority else self.group_id
+        if consumer is None:
             self.log.error("No consumer; quitting")
             return
         last_sample_timestamps: dict[str, dict[int, float]] = dict(
             [(kafka_name, dict()) for kafka_name in self._read_topics]
         )
         consume = partial(
-            self._consumer.consume,
+            consumer.consume,
             num_messages=self.num_messages,
             timeout=self.consume_messages_timeout,
         )
@@ -1318,7 +2160,7 @@ class SalInfo:
 
             self.log.info(
                 "Starting read loop, "
-                f"{self.group_id=} {self.num_messages=} {self.consume_messages_timeout=}s."
+                f"{group_id=} {self.num_messages=} {self.consume_messages_timeout=}s."
             )
 
             while self.isopen:
@@ -1329,10 +2171,7 @@ class SalInfo:
                             f"History offsets retrieved? {self._history_offsets_retrieved}."
                         )
                         self.log.info(f"History offets: {self._history_offsets}.")
-                        if (
-                            self._history_offsets_retrieved
-                            and not self._history_offsets
-                        ):
+                        if self._is_history_read():
                             started_duration = (
                                 time.monotonic() - self.read_history_start_monotonic
                             )
@@ -1418,6 +2257,18 @@ class SalInfo:
 
         read_topic = self._read_topics[kafka_name]
 
+        if read_topic is self._ackcmd_reader and self._is_foreign_ackcmd(message):
+            self.num_ackcmd_filtered += 1
+            return sequential_read_errors
+
+        if (
+            self.read_indices is not None
+            and kafka_name not in self._history_offsets
+            and self._is_foreign_index(message)
+        ):
+            self.num_index_filtered += 1
+            return sequential_read_errors
+
         deserializer, context = self._deserializers_and_contexts[kafka_name]
         try:
             data_dict = deserializer(message.value(), context)
@@ -1479,14 +2330,25 @@ class SalInfo:
             return sequential_read_errors
         last_sample_timestamps[kafka_name][index] = data_dict["private_sndStamp"]
         data_dict["private_rcvStamp"] = utils.current_tai()
+        history_offset = self._history_offsets.get(kafka_name)
+        if (
+            history_offset is None
+            and self.read_indices is not None
+            and index not in self.read_indices
+        ):
+            # Ignore data with mismatched index,
+            # before spending time converting it.
+            return sequential_read_errors
+
+        if read_topic._array_dtypes:
+            # The deserializer returns arrays as lists, so this costs
+            # one array allocation per array field; see
+            # ReadTopic.numpy_arrays.
+            for name, dtype in read_topic._array_dtypes.items():
+                data_dict[name] = np.array(data_dict[name], dtype=dtype)
         data = read_topic.DataType(**data_dict)
 
-        history_offset = self._history_offsets.get(kafka_name)
         if history_offset is None:
-            if self.index != 0 and self.index != data.salIndex:
-                # Ignore data with mismatched index
-                return sequential_read_errors
-
             # This is the normal case once we've read all history
             # print(f"{self.index} queue new {kafka_name} data")
             read_topic._queue_data([data])
@@ -1496,7 +2358,9 @@ class SalInfo:
         if offset is None:
             raise RuntimeError(f"Cannot get offset of message for topic {kafka_name}")
 
-        if self.indexed and (self.index == 0 or self.index == data.salIndex):
+        if self.indexed and (
+            self.read_indices is None or data.salIndex in self.read_indices
+        ):
             self._history_index_data[kafka_name][data.salIndex] = data
 
         if offset >= history_offset:
@@ -1505,7 +2369,8 @@ class SalInfo:
                 f"{self.group_id=}::Finished handling historical data for {kafka_name=}."
             )
             # We're done with history for this topic
-            del self._history_offsets[kafka_name]
+            with self._history_lock:
+                self._history_offsets.pop(kafka_name, None)
 
             if self.indexed:
                 # Publish the most recent historical message seen
@@ -1518,7 +2383,7 @@ class SalInfo:
             else:
                 read_topic._queue_data([data])
 
-            if not self._history_offsets:
+            if self._is_history_read():
                 read_history_duration = (
                     time.monotonic() - self.read_history_start_monotonic
                 )
@@ -1530,8 +2395,73 @@ class SalInfo:
 
         return sequential_read_errors
 
+    def _is_foreign_index(self, message: Message) -> bool:
+        """Return True if the headers of a message show that it
+        is for an index not in `read_indices`.
+
+        Parameters
+        ----------
+        message : `Message`
+            Kafka message.
+
+        Returns
+        -------
+        is_foreign : `bool`
+            True if the message has a salIndex header whose value
+            is not in `read_indices`. False if the value is in
+            `read_indices`, or the message has no such header
+            (e.g. if written by an older version of salobj).
+        """
+        headers = message.headers()
+        if not headers:
+            return False
+        index_bytes = dict(headers).get(SAL_INDEX_HEADER)
+        if index_bytes is None:
+            return False
+        try:
+            index = int(index_bytes)
+        except ValueError:
+            return False
+        # mypy thinks read_indices can be None, but the caller checks.
+        return index not in self.read_indices  # type: ignore
+
+    def _is_foreign_ackcmd(self, message: Message) -> bool:
+        """Return True if the headers of an ackcmd message show that it
+        is for a different commander.
+
+        Parameters
+        ----------
+        message : `Message`
+            Kafka ackcmd message.
+
+        Returns
+        -------
+        is_foreign : `bool`
+            True if the message has origin and identity headers,
+            and either does not match this SalInfo.
+            False if they match or the message has no such headers
+            (e.g. if written by an older version of salobj).
+        """
+        headers = message.headers()
+        if not headers:
+            return False
+        header_dict = dict(headers)
+        origin = header_dict.get(ACKCMD_ORIGIN_HEADER)
+        identity = header_dict.get(ACKCMD_IDENTITY_HEADER)
+        if origin is None or identity is None:
+            return False
+        return (
+            origin != str(self.domain.origin).encode()
+            or identity != self.identity.encode()
+        )
+
     async def write_data(
-        self, topic_info: TopicInfo, data_dict: dict[str, typing.Any]
+        self,
+        topic_info: TopicInfo,
+        data_dict: dict[str, typing.Any],
+        acknowledged: bool = True,
+        wait_for_delivery: bool = False,
+        log_errors: bool = True,
     ) -> None:
         """Write a message.
 
@@ -1541,9 +2471,66 @@ class SalInfo:
             Info for the topic.
         data_dict : dict[str, Any]
             Message to write, as a dict that matches the Avro topic schema.
+            If ``acknowledged`` false, do not modify this dict after calling
+            this method, because it may not have been serialized yet.
+            Array fields are copied in that case, so the caller may
+            modify the arrays.
+        acknowledged : `bool`, optional
+            If True, wait until the message has been serialized and
+            handed to the Kafka producer, and raise an exception
+            if that fails.
+            If False, schedule the write and return immediately;
+            failures are counted in ``delivery_error_counts``
+            and periodically logged as a summary, rather than raised.
+            If ``MAX_PENDING_UNACKNOWLEDGED_WRITES`` writes are already
+            waiting, the message is dropped and counted as a failure.
+        wait_for_delivery : `bool`, optional
+            If True (and ``acknowledged`` true), also wait until the broker
+            has acknowledged the message, and raise `KafkaException`
+            if delivery fails.
+        log_errors : `bool`, optional
+            If True (and ``acknowledged`` true), log a traceback
+            if the write fails, before raising the exception.
+            Set False if the caller handles failures, e.g. by counting
+            them with ``_handle_delivery_error``. Delivery failures
+            are always counted in ``delivery_error_counts``.
         """
         self.assert_running()
 
+        if not acknowledged:
+            if (
+                self._num_pending_unacknowledged_writes
+                >= MAX_PENDING_UNACKNOWLEDGED_WRITES
+            ):
+                self._handle_delivery_error(
+                    attr_name=topic_info.attr_name,
+                    error=RuntimeError(
+                        "Dropped message: too many pending unacknowledged writes"
+                    ),
+                    future=None,
+                )
+                return
+            # The message is serialized in another thread, after this
+            # method returns, so copy the arrays, which the caller
+            # may modify in place.
+            data_dict = {
+                name: (value.copy() if isinstance(value, (list, np.ndarray)) else value)
+                for name, value in data_dict.items()
+            }
+            task = self.loop.run_in_executor(
+                self._get_unacknowledged_write_pool(),
+                self._blocking_write,
+                topic_info,
+                data_dict,
+                None,
+            )
+            self._num_pending_unacknowledged_writes += 1
+            self._blocking_write_tasks.add(task)
+            task.add_done_callback(
+                partial(self._unacknowledged_write_done, attr_name=topic_info.attr_name)
+            )
+            return
+
         try:
             future = self.loop.create_future()
 
@@ -1557,11 +2544,69 @@ class SalInfo:
             self._blocking_write_tasks.add(task)
             task.add_done_callback(self._blocking_write_tasks.discard)
             await task
+            if wait_for_delivery:
+                await future
 
         except Exception:
-            self.log.exception(f"write_data for {topic_info.kafka_name} failed.")
+            if log_errors:
+                self.log.exception(f"write_data for {topic_info.kafka_name} failed.")
             raise
 
+    async def write_data_batch(
+        self,
+        topic_info: TopicInfo,
+        data_dicts: list[dict[str, typing.Any]],
+    ) -> None:
+        """Write several messages for one topic, in order,
+        in a single hand-off to the Kafka producer.
+
+        Parameters
+        ----------
+        topic_info : TopicInfo
+            Info for the topic.
+        data_dicts : list[dict[str, Any]]
+            Messages to write, each as a dict that matches
+            the Avro topic schema.
+
+        Notes
+        -----
+        Wait until all messages have been serialized and handed
+        to the Kafka producer, and raise an exception if that fails.
+        Delivery failures are counted in ``delivery_error_counts``
+        and periodically logged as a summary, as for unacknowledged writes.
+        """
+        self.assert_running()
+
+        try:
+            task = asyncio.shield(
+                self.loop.run_in_executor(
+                    self.pool, self._blocking_write_batch, topic_info, data_dicts
+                )
+            )
+            self._blocking_write_tasks.add(task)
+            task.add_done_callback(self._blocking_write_tasks.discard)
+            await task
+        except Exception:
+            self.log.exception(f"write_data_batch for {topic_info.kafka_name} failed.")
+            raise
+
+    def _blocking_write_batch(
+        self,
+        topic_info: TopicInfo,
+        data_dicts: list[dict[str, typing.Any]],
+    ) -> None:
+        """Write several Kafka messages for one topic, in order.
+
+        Parameters
+        ----------
+        topic_info : TopicInfo
+            Info for the topic.
+        data_dicts : list[dict[str, Any]]
+            Messages to write.
+        """
+        for data_dict in data_dicts:
+            self._blocking_write(topic_info, data_dict, None)
+
     async def __aenter__(self) -> SalInfo:
         if self.start_called:
             await self.start_task
@@ -25,19 +25,53 @@ __all__ = ["SalLogHandler"]
 
 import asyncio
 import collections
-import concurrent.futures
+import dataclasses
 import logging
+import os
 import sys
 import threading
+import time
 import typing
 
 if typing.TYPE_CHECKING:
     from .controller import Controller
 
-MixedFutureType = asyncio.Future | concurrent.futures.Future
-
+# Maximum number of log messages to save before the controller starts.
 MAX_LEN = 10
 
+# Default maximum number of log messages waiting to be written.
+DEFAULT_MAX_QUEUE_LEN = 1000
+
+# Maximum number of log messages to write in one batch.
+MAX_BATCH_LEN = 100
+
+# Default sustained rate (messages/second) of log messages
+# for each logger name and level; None for no limit.
+DEFAULT_RATE_LIMIT: float | None = None
+
+# Default burst size (messages) of log messages
+# for each logger name and level, if rate limited.
+DEFAULT_RATE_BURST = 100
+
+# Log messages at this level and above are never rate limited.
+RATE_LIMIT_EXEMPT_LEVEL = logging.WARNING
+
+
+@dataclasses.dataclass
+class _LogEntry:
+    """A log message waiting to be written.
+
+    Attributes
+    ----------
+    fields : `dict` [`str`, `typing.Any`]
+        logMessage field name: value.
+    count : `int`
+        The number of identical log messages this represents.
+    """
+
+    fields: dict[str, typing.Any]
+    count: int = 1
+
 
 class SalLogHandler(logging.Handler):
     """Log handler that outputs an event topic.
@@ -48,22 +82,93 @@ class SalLogHandler(logging.Handler):
         Controller with
         :ref:`Required Logger Attribute<required_logging_attributes>`
         ``evt_logEvent``.
+
+    Attributes
+    ----------
+    max_queue_len : `int`
+        Maximum number of log messages waiting to be written;
+        additional messages are dropped and counted in ``num_queue_full``.
+    rate_limit : `float` | `None`
+        Sustained rate (messages/second) of log messages
+        for each logger name and level below WARNING;
+        None (the default) for no limit.
+        Messages over the limit are dropped and counted in
+        ``num_rate_limited``. Warning, error and critical messages
+        are never rate limited.
+    rate_burst : `float`
+        The number of log messages for each logger name and level
+        that may be written in a burst, despite ``rate_limit``.
+    num_coalesced : `int`
+        The number of log messages that were not written because they
+        repeated the previous message, which was still waiting to be written.
+    num_rate_limited : `int`
+        The number of log messages dropped by ``rate_limit``.
+    num_queue_full : `int`
+        The number of log messages dropped because ``max_queue_len``
+        messages were already waiting to be written.
+    num_write_failures : `int`
+        The number of log messages that could not be written.
+
+    Notes
+    -----
+    `emit` queues log messages, and a single background task writes
+    them in batches, so a burst of log messages costs one write
+    per batch rather than one task and one write per message.
+
+    A log message that is identical to the previous message
+    (same logger name, level, message, traceback and source location)
+    is not written if the previous message has not yet been written;
+    instead the previous message is written with the suffix
+    "(message repeated N times)".
+    When messages are dropped, a warning log message reports
+    how many, once there is room to write it.
     """
 
     def __init__(self, controller: Controller) -> None:
         self.controller = controller
         self.loop = asyncio.get_running_loop()
         self.main_thread_id = threading.get_ident()
-        self.futures: list[MixedFutureType] = list()
-        self._pre_start_records: collections.deque[logging.LogRecord] = (
-            collections.deque(maxlen=MAX_LEN)
+        self.max_queue_len = DEFAULT_MAX_QUEUE_LEN
+        self.rate_limit: float | None = DEFAULT_RATE_LIMIT
+        self.rate_burst: float = DEFAULT_RATE_BURST
+        self.num_coalesced = 0
+        self.num_rate_limited = 0
+        self.num_queue_full = 0
+        self.num_write_failures = 0
+        # Number of dropped messages already reported in a log message.
+        self._num_dropped_reported = 0
+        self._pre_start_entries: collections.deque[_LogEntry] = collections.deque(
+            maxlen=MAX_LEN
         )
+        # Log messages waiting to be written.
+        # `emit` appends and `_write_loop` pops, both while holding self.lock.
+        self._queue: collections.deque[_LogEntry] = collections.deque()
+        # The most recently queued entry, if it is still waiting
+        # to be written; `emit` coalesces repeats into it.
+        self._last_entry: _LogEntry | None = None
+        # Dict of (logger name, level): (tokens, monotonic time)
+        # for rate limiting.
+        self._rate_buckets: dict[tuple[str, int], tuple[float, float]] = dict()
+        self._queue_event = asyncio.Event()
         super().__init__()
+        self._write_task = asyncio.create_task(self._write_loop())
+
+    @property
+    def num_dropped(self) -> int:
+        """Get the total number of log messages dropped,
+        whether by rate limiting or because the queue was full.
+        """
+        return self.num_rate_limited + self.num_queue_full
+
+    @property
+    def num_queued(self) -> int:
+        """Get the number of log messages waiting to be written."""
+        return len(self._queue)
 
     def close(self) -> None:
-        while self.futures:
-            f = self.futures.pop(-1)
-            f.cancel()
+        self._write_task.cancel()
+        self._queue.clear()
+        self._last_entry = None
         super().close()
 
     def emit(self, record: logging.LogRecord) -> None:
@@ -71,43 +176,38 @@ class SalLogHandler(logging.Handler):
         try:
             self.format(record)
             message = record.message
+            entry = _LogEntry(
+                fields=dict(
+                    name=record.name,
+                    level=record.levelno,
+                    message=message,
+                    traceback=record.exc_text or "",
+                    filePath=record.pathname,
+                    functionName=record.funcName,
+                    lineNumber=record.lineno,
+                    process=record.process or 0,
+                )
+            )
             if not self.controller.salinfo.running:
-                self._pre_start_records.append(record)
+                self._pre_start_entries.append(entry)
                 return
-            elif self._pre_start_records:
-                pre_start_records = [record for record in self._pre_start_records]
-                self._pre_start_records.clear()
-                for pre_start_record in pre_start_records:
-                    self.emit(record)
-
-            if threading.get_ident() == self.main_thread_id:
-                new_future: MixedFutureType = asyncio.create_task(
-                    self._async_emit(
-                        name=record.name,
-                        level=record.levelno,
-                        message=message,
-                        traceback=record.exc_text or "",
-                        filePath=record.pathname,
-                        functionName=record.funcName,
-                        lineNumber=record.lineno,
-                        process=record.process or 0,
-                    )
-                )
-            else:
-                new_future = asyncio.run_coroutine_threadsafe(
-                    coro=self._async_emit(
-                        name=record.name,
-                        level=record.levelno,
-                        message=message,
-                        traceback=record.exc_text or "",
-                        filePath=record.pathname,
-                        functionName=record.funcName,
-                        lineNumber=record.lineno,
-                        process=record.process or 0,
-                    ),
-                    loop=self.loop,
-                )
-            self.futures = [f for f in self.futures if not f.done()] + [new_future]
+            if self._pre_start_entries:
+                while self._pre_start_entries:
+                    self._queue_entry(self._pre_start_entries.popleft())
+                self._wake_writer()
+
+            if self._last_entry is not None and self._last_entry.fields == entry.fields:
+                self._last_entry.count += 1
+                self.num_coalesced += 1
+                return
+            if not self._check_rate(record):
+                self.num_rate_limited += 1
+                return
+            if len(self._queue) >= self.max_queue_len:
+                self.num_queue_full += 1
+                return
+            self._queue_entry(entry)
+            self._wake_writer()
         except Exception as e:
             print(
                 f"SalLogHandler.emit of level={record.levelno}, "
@@ -120,31 +220,90 @@ class SalLogHandler(logging.Handler):
             # multiple formatters that have different exception formats.
             record.exc_text = ""
 
-    async def _async_emit(
-        self,
-        name: str,
-        level: int,
-        message: str,
-        traceback: str,
-        filePath: str,
-        functionName: str,
-        lineNumber: int,
-        process: int,
-    ) -> None:
+    def _check_rate(self, record: logging.LogRecord) -> bool:
+        """Return True if the rate limit allows writing this record,
+        and if so use up one message of the allowance.
+        """
+        if self.rate_limit is None or record.levelno >= RATE_LIMIT_EXEMPT_LEVEL:
+            return True
+        key = (record.name, record.levelno)
+        now = time.monotonic()
+        tokens, prev_time = self._rate_buckets.get(key, (self.rate_burst, now))
+        tokens = min(self.rate_burst, tokens + (now - prev_time) * self.rate_limit)
+        if tokens < 1:
+            self._rate_buckets[key] = (tokens, now)
+            return False
+        self._rate_buckets[key] = (tokens - 1, now)
+        return True
+
+    def _queue_entry(self, entry: _LogEntry) -> None:
+        """Add an entry to the queue. The caller must hold self.lock."""
+        self._queue.append(entry)
+        self._last_entry = entry
+
+    def _wake_writer(self) -> None:
+        """Tell `_write_loop` that there are log messages to write."""
+        if threading.get_ident() == self.main_thread_id:
+            self._queue_event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._queue_event.set)
+
+    async def _write_loop(self) -> None:
+        """Write queued log messages, in batches."""
+        while True:
+            await self._queue_event.wait()
+            self._queue_event.clear()
+            while self._queue:
+                assert self.lock is not None  # make mypy happy
+                with self.lock:
+                    batch = [
+                        self._queue.popleft()
+                        for _ in range(min(len(self._queue), MAX_BATCH_LEN))
+                    ]
+                    if not self._queue:
+                        self._last_entry = None
+                num_dropped = self.num_dropped
+                if num_dropped > self._num_dropped_reported:
+                    batch.append(
+                        _LogEntry(
+                            fields=dict(
+                                name=self.controller.log.name,
+                                level=logging.WARNING,
+                                message=f"Dropped "
+                                f"{num_dropped - self._num_dropped_reported} "
+                                "log messages; the log rate is too high",
+                                traceback="",
+                                filePath=__file__,
+                                functionName="_write_loop",
+                                lineNumber=0,
+                                process=os.getpid(),
+                            )
+                        )
+                    )
+                    self._num_dropped_reported = num_dropped
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: list[_LogEntry]) -> None:
+        """Write a batch of log messages to the logMessage event."""
+        topic = self.controller.evt_logMessage  # type: ignore
         try:
-            await self.controller.evt_logMessage.set_write(  # type: ignore
-                name=name,
-                level=level,
-                message=message,
-                traceback=traceback,
-                filePath=filePath,
-                functionName=functionName,
-                lineNumber=lineNumber,
-                process=process,
+            data_dicts = []
+            for entry in batch:
+                fields = entry.fields
+                if entry.count > 1:
+                    fields = dict(
+                        fields,
+                        message=f"{fields['message']} "
+                        f"(message repeated {entry.count} times)",
+                    )
+                topic.set(**fields)
+                data_dicts.append(topic._prepare_data_to_write())
+            await self.controller.salinfo.write_data_batch(
+                topic_info=topic.topic_info, data_dicts=data_dicts
             )
         except Exception as e:
+            self.num_write_failures += len(batch)
             print(
-                f"SalLogHandler._async_emit of level={level}, "
-                f"message={message!r} failed: {e!r}",
+                f"SalLogHandler failed to write {len(batch)} log messages: {e!r}",
                 file=sys.stderr,
             )
@@ -34,6 +34,7 @@ from . import __version__
 from .base_csc import State
 from .config_schema import CONFIG_SCHEMA
 from .configurable_csc import ConfigurableCsc
+from .domain import Domain
 
 
 class TestCsc(ConfigurableCsc):
@@ -76,7 +77,9 @@ class TestCsc(ConfigurableCsc):
         `State.DISABLED` or `State.ENABLED`.
     simulation_mode : `int`, optional
         Simulation mode. The only allowed value is 0.
-
+    domain : `Domain` or `None`, optional
+        Domain to share with other CSCs; see `CscHost`.
+        If None (the usual case) then the CSC makes its own domain.
 
     Raises
     ------
@@ -118,6 +121,7 @@ class TestCsc(ConfigurableCsc):
         initial_state: State = State.STANDBY,
         override: str = "",
         simulation_mode: int = 0,
+        domain: Domain | None = None,
     ):
         super().__init__(
             name="Test",
@@ -129,6 +133,7 @@ class TestCsc(ConfigurableCsc):
             override=override,
             simulation_mode=simulation_mode,
             extra_commands={"newCommand"},
+            domain=domain,
         )
         self.cmd_wait.allow_multiple_callbacks = True  # type: ignore
         self.config: types.SimpleNamespace | None = None
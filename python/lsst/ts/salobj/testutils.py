@@ -20,9 +20,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 __all__ = [
+    "MessageTypesMixin",
     "assertRaisesAckError",
     "assertRaisesAckTimeoutError",
     "delete_kafka_topics",
+    "make_message_type",
     "set_test_topic_subname",
     "set_random_lsst_dds_partition_prefix",
 ]
@@ -30,15 +32,19 @@ __all__ = [
 import asyncio
 import base64
 import contextlib
+import functools
 import os
+import typing
 import warnings
 from collections.abc import Generator
 
 import astropy.coordinates
-from lsst.ts.xml import subsystems
+from lsst.ts.xml import subsystems, type_hints
+from lsst.ts.xml.component_info import ComponentInfo
 
 from .base import AckError, AckTimeoutError
 from .delete_topics import DeleteTopics, DeleteTopicsArgs
+from .topics import make_slots_dataclass
 
 AngleOrDegType = astropy.coordinates.Angle | float
 
@@ -128,6 +134,94 @@ async def delete_kafka_topics() -> None:
     await asyncio.sleep(5.0)
 
 
+@functools.cache
+def make_message_type(
+    name: str, attr_name: str, *, slots: bool = False, frozen: bool = False
+) -> typing.Type[type_hints.BaseMsgType]:
+    """Make the message type (``DataType``) of a topic,
+    for unit testing code that handles messages.
+
+    The type is the same as that of a topic of a `SalInfo`
+    with the same ``slots`` and ``frozen`` arguments,
+    but no `Domain` or `SalInfo` is needed.
+
+    Parameters
+    ----------
+    name : `str`
+        SAL component name.
+    attr_name : `str`
+        Topic attribute name, e.g. "tel_scalars".
+    slots : `bool`, optional
+        If True then messages use ``__slots__``.
+    frozen : `bool`, optional
+        If True and ``slots`` is true then messages are immutable,
+        as for the topics a `Remote` reads.
+
+    Raises
+    ------
+    KeyError
+        If ``attr_name`` is not a topic of the component.
+    """
+    component_info = _get_component_info(
+        name=name, topic_subname=os.environ.get("LSST_TOPIC_SUBNAME", "test")
+    )
+    data_type = component_info.topics[attr_name].make_dataclass()
+    if slots:
+        data_type = make_slots_dataclass(data_type, frozen=frozen)
+    return data_type
+
+
+@functools.cache
+def _get_component_info(name: str, topic_subname: str) -> ComponentInfo:
+    """Get component information, parsing the XML only once."""
+    return ComponentInfo(topic_subname=topic_subname, name=name)
+
+
+class MessageTypesMixin:
+    """Mixin for unit tests of code that handles messages
+    of the Test SAL component, without a `Domain` or `SalInfo`.
+
+    The message types are made once per test case class, in ``setUpClass``.
+    To test other kinds of messages, subclass a test case
+    and override the ``slots`` and ``frozen`` class attributes,
+    which are the arguments for `make_message_type`.
+    """
+
+    slots = False
+    frozen = False
+
+    ScalarsType: typing.Type[type_hints.BaseMsgType]
+    ArraysType: typing.Type[type_hints.BaseMsgType]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()  # type: ignore[misc]
+        cls.ScalarsType = make_message_type(
+            "Test", "tel_scalars", slots=cls.slots, frozen=cls.frozen
+        )
+        cls.ArraysType = make_message_type(
+            "Test", "tel_arrays", slots=cls.slots, frozen=cls.frozen
+        )
+
+    def make_scalars(self, **kwargs: typing.Any) -> typing.Any:
+        """Make a Test tel_scalars message."""
+        return self.ScalarsType(**kwargs)
+
+    def make_arrays(self, **kwargs: typing.Any) -> typing.Any:
+        """Make a Test tel_arrays message.
+
+        Array fields in ``kwargs`` may be shorter than the field;
+        they are padded with default values. Full-length values,
+        including `numpy.ndarray`, are used as is.
+        """
+        default_data = self.ArraysType()
+        for name, value in kwargs.items():
+            default_value = getattr(default_data, name, None)
+            if isinstance(default_value, list) and len(value) < len(default_value):
+                kwargs[name] = list(value) + default_value[len(value) :]
+        return self.ArraysType(**kwargs)
+
+
 def set_test_topic_subname(randomize: bool = False) -> None:
     """Set a test value for environment variable LSST_TOPIC_SUBNAME
 
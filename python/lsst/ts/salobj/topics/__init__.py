@@ -1,7 +1,10 @@
 from .base_topic import *
+from .command_scheduler import *
 from .controller_command import *
 from .controller_event import *
 from .controller_telemetry import *
+from .decimator import *
+from .message_filter import *
 from .mock_write_topic import *
 from .read_topic import *
 from .remote_command import *
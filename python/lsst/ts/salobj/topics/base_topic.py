@@ -21,16 +21,96 @@ from __future__ import annotations
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-__all__ = ["BaseTopic"]
+__all__ = ["BaseTopic", "get_data_dict", "make_slots_dataclass"]
 
 import abc
+import dataclasses
 import typing
 
+import numpy as np
 from lsst.ts.xml import type_hints
 
 if typing.TYPE_CHECKING:
     from ..sal_info import SalInfo
 
+# Dict of SAL field type: numpy dtype.
+# Only includes types that are allowed in arrays.
+_SAL_TYPE_DTYPES = {
+    "boolean": np.dtype(bool),
+    "byte": np.dtype(np.uint8),
+    "octet": np.dtype(np.uint8),
+    "short": np.dtype(np.int16),
+    "int": np.dtype(np.int32),
+    "long": np.dtype(np.int32),
+    "long long": np.dtype(np.int64),
+    "unsigned short": np.dtype(np.uint16),
+    "unsigned int": np.dtype(np.uint32),
+    "unsigned long": np.dtype(np.uint32),
+    "unsigned long long": np.dtype(np.uint64),
+    "float": np.dtype(np.float32),
+    "double": np.dtype(np.float64),
+}
+
+
+def get_data_dict(data: typing.Any) -> dict[str, typing.Any]:
+    """Get a dict of field name: value for a message.
+
+    Works for messages with or without ``__slots__``.
+
+    Parameters
+    ----------
+    data : `type_hints.BaseMsgType`
+        The message.
+
+    Returns
+    -------
+    data_dict : `dict` [`str`, ``any``]
+        Dict of field name: value. If ``data`` has a ``__dict__``
+        then this is ``vars(data)``, so modifying it modifies ``data``.
+        Otherwise it is a new dict.
+    """
+    try:
+        return vars(data)
+    except TypeError:
+        return {name: getattr(data, name) for name in data.__slots__}
+
+
+def make_slots_dataclass(
+    dataclass_type: typing.Type[type_hints.BaseMsgType], frozen: bool = False
+) -> typing.Type[type_hints.BaseMsgType]:
+    """Make a version of a dataclass that uses ``__slots__``.
+
+    Messages of the new class have no per-instance ``__dict__``,
+    which greatly reduces the memory used by each message.
+
+    Parameters
+    ----------
+    dataclass_type : `type`
+        The dataclass to copy, e.g. as made by
+        ``topic_info.make_dataclass()``.
+    frozen : `bool`, optional
+        If True then make messages immutable: setting a field raises
+        `dataclasses.FrozenInstanceError`.
+
+    Returns
+    -------
+    slots_type : `type`
+        The new dataclass, with the same name, fields and defaults.
+    """
+    fields = []
+    for field in dataclasses.fields(dataclass_type):  # type: ignore
+        field_kwargs: dict[str, typing.Any] = dict()
+        if field.default is not dataclasses.MISSING:
+            field_kwargs["default"] = field.default
+        if field.default_factory is not dataclasses.MISSING:
+            field_kwargs["default_factory"] = field.default_factory
+        fields.append((field.name, field.type, dataclasses.field(**field_kwargs)))
+    slots_type = dataclasses.make_dataclass(
+        dataclass_type.__name__, fields, slots=True, frozen=frozen
+    )
+    slots_type.__module__ = dataclass_type.__module__
+    return slots_type
+
 
 class BaseTopic(abc.ABC):
     r"""Base class for topics.
@@ -56,8 +136,19 @@ class BaseTopic(abc.ABC):
         Metadata about the topic.
     log : `logging.Logger`
         A logger.
+
+    Notes
+    -----
+    If ``salinfo.slots`` is true then messages use ``__slots__``
+    (see `make_slots_dataclass`). If ``salinfo.frozen`` is true
+    and `frozen_allowed` is true then messages are also frozen.
     """
 
+    # Can messages for this kind of topic be frozen?
+    # True for topics that are only read, because salobj
+    # does not modify messages that it has read.
+    frozen_allowed = False
+
     def __init__(self, *, salinfo: SalInfo, attr_name: str) -> None:
         try:
             self.salinfo = salinfo
@@ -65,6 +156,10 @@ class BaseTopic(abc.ABC):
             self.rev_code = self.topic_info.get_revcode()
             self.log = salinfo.log.getChild(self.sal_name)
             self._type = self.topic_info.make_dataclass()
+            if salinfo.slots:
+                self._type = make_slots_dataclass(
+                    self._type, frozen=salinfo.frozen and self.frozen_allowed
+                )
 
         except Exception as e:
             raise RuntimeError(
@@ -98,5 +193,23 @@ class BaseTopic(abc.ABC):
         """
         return self._type
 
+    def get_array_dtypes(self) -> dict[str, np.dtype]:
+        """Get a dict of field name: numpy dtype for each array field.
+
+        The dtype is determined by the SAL type of the field
+        in ``topic_info``.
+        """
+        array_dtypes: dict[str, np.dtype] = dict()
+        for name, value in get_data_dict(self.DataType()).items():
+            if not isinstance(value, list):
+                continue
+            sal_type = getattr(self.topic_info.fields[name], "sal_type", None)
+            dtype = _SAL_TYPE_DTYPES.get(sal_type)  # type: ignore
+            if dtype is None:
+                # Unknown type; use the type of the default value.
+                dtype = np.asarray(value).dtype
+            array_dtypes[name] = dtype
+        return array_dtypes
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self.salinfo.name}, {self.salinfo.index}, {self.attr_name})"
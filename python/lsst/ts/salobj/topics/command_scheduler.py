@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["CommandPolicy", "CommandScheduler"]
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import heapq
+import itertools
+import typing
+from collections.abc import AsyncGenerator
+
+if typing.TYPE_CHECKING:
+    from .controller_command import ControllerCommand
+
+
+@dataclasses.dataclass(frozen=True)
+class CommandPolicy:
+    """How `CommandScheduler` schedules one command.
+
+    Attributes
+    ----------
+    priority : `int`
+        Queued commands with higher priority run first;
+        commands with equal priority run in the order received.
+    max_concurrent : `int` | `None`
+        Maximum number of instances of this command that may run at once;
+        None for no limit (other than the scheduler's ``max_concurrent``).
+    urgent : `bool`
+        If True then the command runs as soon as it is received,
+        ignoring all limits, and it does not count toward the
+        scheduler's ``max_concurrent``.
+    """
+
+    priority: int = 0
+    max_concurrent: int | None = 1
+    urgent: bool = False
+
+
+class CommandScheduler:
+    """Schedule the callbacks of controller commands by priority,
+    with concurrency limits.
+
+    Each `Controller` has one, as attribute ``command_scheduler``.
+    Only commands added with `add_command` are scheduled;
+    other commands run as usual.
+
+    Parameters
+    ----------
+    max_concurrent : `int` | `None`, optional
+        Maximum number of scheduled commands that may run at once,
+        not counting urgent commands; None for no limit.
+
+    Raises
+    ------
+    ValueError
+        If ``max_concurrent`` < 1.
+
+    Attributes
+    ----------
+    max_queue_depth : `int`
+        The largest number of commands that have been queued at once.
+    num_scheduled : `int`
+        The number of commands that have started running.
+
+    Notes
+    -----
+    A typical CSC might allow one move command at a time,
+    run status queries ahead of queued moves,
+    and run stop as soon as it arrives::
+
+        self.command_scheduler.add_command(self.cmd_move, max_concurrent=1)
+        self.command_scheduler.add_command(self.cmd_getStatus, priority=1)
+        self.command_scheduler.add_command(self.cmd_stop, urgent=True)
+
+    Scheduled commands are queued by the scheduler, rather than in the
+    command's read queue, so `add_command` sets the command's
+    ``allow_multiple_callbacks`` true.
+    """
+
+    def __init__(self, max_concurrent: int | None = None) -> None:
+        self.max_queue_depth = 0
+        self.num_scheduled = 0
+        # Dict of command attr_name: CommandPolicy.
+        self._policies: dict[str, CommandPolicy] = dict()
+        # Heap of (-priority, counter, attr_name, future) for queued commands.
+        self._queue: list[tuple[int, int, str, asyncio.Future]] = []
+        self._counter = itertools.count()
+        # Dict of command attr_name: number queued or running.
+        self._queue_depths: collections.Counter[str] = collections.Counter()
+        self._running_counts: collections.Counter[str] = collections.Counter()
+        # Number of running non-urgent commands.
+        self._num_running_limited = 0
+        # Set this last, because the setter starts queued commands.
+        self.max_concurrent = max_concurrent
+
+    @property
+    def max_concurrent(self) -> int | None:
+        """Get or set the maximum number of non-urgent scheduled commands
+        that may run at once; None for no limit.
+
+        Raising the limit immediately starts queued commands
+        that the new limit allows.
+
+        Raises
+        ------
+        ValueError
+            If set to a value < 1.
+        """
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, max_concurrent: int | None) -> None:
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"max_concurrent={max_concurrent} must be None or >= 1")
+        self._max_concurrent = max_concurrent
+        self._start_queued()
+
+    @property
+    def num_queued(self) -> int:
+        """Get the number of commands waiting to run."""
+        return sum(self._queue_depths.values())
+
+    @property
+    def num_running(self) -> int:
+        """Get the number of scheduled commands running,
+        including urgent commands.
+        """
+        return sum(self._running_counts.values())
+
+    @property
+    def queue_depths(self) -> dict[str, int]:
+        """Get a dict of command attr_name: number of commands waiting to run,
+        for each command that has commands waiting.
+        """
+        return {name: depth for name, depth in self._queue_depths.items() if depth > 0}
+
+    def add_command(
+        self,
+        command: ControllerCommand,
+        *,
+        priority: int = 0,
+        max_concurrent: int | None = 1,
+        urgent: bool = False,
+    ) -> None:
+        """Schedule a command, or change how it is scheduled.
+
+        Parameters
+        ----------
+        command : `ControllerCommand`
+            The command.
+        priority : `int`, optional
+            Queued commands with higher priority run first.
+        max_concurrent : `int` | `None`, optional
+            Maximum number of instances of this command that may run at once;
+            None for no limit (other than the scheduler's ``max_concurrent``).
+            Ignored if ``urgent`` true.
+        urgent : `bool`, optional
+            If True then run this command as soon as it is received,
+            ignoring all limits.
+
+        Raises
+        ------
+        ValueError
+            If ``max_concurrent`` < 1.
+        """
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"max_concurrent={max_concurrent} must be None or >= 1")
+        self._policies[command.attr_name] = CommandPolicy(
+            priority=int(priority),
+            max_concurrent=max_concurrent,
+            urgent=bool(urgent),
+        )
+        command.allow_multiple_callbacks = True
+        command.scheduler = self
+        self._start_queued()
+
+    def get_policy(self, attr_name: str) -> CommandPolicy | None:
+        """Get the policy for a command, or None if it is not scheduled.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Command attribute name, e.g. "cmd_move".
+        """
+        return self._policies.get(attr_name)
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, attr_name: str) -> AsyncGenerator[None, None]:
+        """Wait until a command may run, then hold its place until done.
+
+        A no-op if the command is not scheduled.
+
+        Parameters
+        ----------
+        attr_name : `str`
+            Command attribute name, e.g. "cmd_move".
+        """
+        policy = self._policies.get(attr_name)
+        if policy is None:
+            yield
+            return
+
+        if policy.urgent:
+            self._running_counts[attr_name] += 1
+        else:
+            # Queue the command, then start queued commands in priority
+            # order; this command may start immediately.
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._queue, (-policy.priority, next(self._counter), attr_name, future)
+            )
+            self._queue_depths[attr_name] += 1
+            self._start_queued()
+            self.max_queue_depth = max(self.max_queue_depth, self.num_queued)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The command was started before it was cancelled.
+                    self._finish(attr_name, policy)
+                else:
+                    self._queue_depths[attr_name] -= 1
+                raise
+
+        self.num_scheduled += 1
+        try:
+            yield
+        finally:
+            self._finish(attr_name, policy)
+
+    def _can_start(self, attr_name: str, policy: CommandPolicy) -> bool:
+        """Can a non-urgent command start now?"""
+        if (
+            self.max_concurrent is not None
+            and self._num_running_limited >= self.max_concurrent
+        ):
+            return False
+        return (
+            policy.max_concurrent is None
+            or self._running_counts[attr_name] < policy.max_concurrent
+        )
+
+    def _finish(self, attr_name: str, policy: CommandPolicy) -> None:
+        """Record that a command is done and start queued commands."""
+        self._running_counts[attr_name] -= 1
+        if not policy.urgent:
+            self._num_running_limited -= 1
+        self._start_queued()
+
+    def _start_queued(self) -> None:
+        """Start as many queued commands as the limits allow,
+        in priority order.
+
+        A queued command that is blocked by its own limit
+        does not block queued commands of other types.
+        """
+        blocked: list[tuple[int, int, str, asyncio.Future]] = []
+        while self._queue:
+            if (
+                self.max_concurrent is not None
+                and self._num_running_limited >= self.max_concurrent
+            ):
+                break
+            item = heapq.heappop(self._queue)
+            _, _, attr_name, future = item
+            if future.done():
+                # Cancelled while queued.
+                continue
+            policy = self._policies[attr_name]
+            if not self._can_start(attr_name, policy):
+                blocked.append(item)
+                continue
+            self._queue_depths[attr_name] -= 1
+            self._running_counts[attr_name] += 1
+            self._num_running_limited += 1
+            future.set_result(None)
+        for item in blocked:
+            heapq.heappush(self._queue, item)
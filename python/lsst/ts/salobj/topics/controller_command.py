@@ -24,13 +24,17 @@ from __future__ import annotations
 __all__ = ["AckCmdWriter", "ControllerCommand"]
 
 import asyncio
+import contextlib
+import functools
 import inspect
 import typing
 
+from lsst.ts import utils
 from lsst.ts.xml import sal_enums, type_hints
 
 from .. import base
 from . import read_topic, write_topic
+from .command_scheduler import CommandScheduler
 
 if typing.TYPE_CHECKING:
     from ..sal_info import SalInfo
@@ -83,6 +87,20 @@ class ControllerCommand(read_topic.ReadTopic):
       ``result=f"Failed: {exception}"``.
     * If the callback function raises any other `Exception`
       then do the same as `ExpectedError` and also log a traceback.
+
+    If ``scheduler`` is set (see `CommandScheduler.add_command`)
+    then the callback function waits until the scheduler allows it to run.
+
+    To reduce ack traffic for commands that usually finish quickly,
+    set `ack_coalesce_window`. See that property for details.
+
+    Attributes
+    ----------
+    scheduler : `CommandScheduler` | `None`
+        The command scheduler, if this command is scheduled.
+    num_coalesced_acks : `int`
+        The number of ``CMD_INPROGRESS`` acknowledgements that were
+        not written because they were superseded; see `ack_coalesce_window`.
     """
 
     def __init__(
@@ -95,14 +113,51 @@ class ControllerCommand(read_topic.ReadTopic):
             queue_len=queue_len,
         )
         self.cmdtype = salinfo.sal_topic_names.index(self.sal_name)
+        self.scheduler: CommandScheduler | None = None
+        self._ack_coalesce_window = 0.0
+        self.num_coalesced_acks = 0
+        # Dict of private_seqNum: timer for a deferred CMD_INPROGRESS ack,
+        # or the task writing it once the timer has fired.
+        self._deferred_acks: dict[int, asyncio.TimerHandle | asyncio.Task] = dict()
         if salinfo._ackcmd_writer is None:
             self.salinfo._ackcmd_writer = AckCmdWriter(salinfo=salinfo)
 
+    @property
+    def ack_coalesce_window(self) -> float:
+        """Get or set the ack coalescing window (seconds); 0 to disable.
+
+        If positive then a ``CMD_INPROGRESS`` acknowledgement that is
+        issued less than this long after the command was received
+        is held until the window ends, and is not written at all
+        if a newer acknowledgement of that command is issued first.
+        Thus a command that finishes within the window is acknowledged
+        only once, with its final acknowledgement.
+
+        Keep this short compared to command timeouts,
+        since the ``CMD_INPROGRESS`` acknowledgement is what extends
+        the timeout of a long-running command.
+
+        Raises
+        ------
+        ValueError
+            If set to a negative value.
+        """
+        return self._ack_coalesce_window
+
+    @ack_coalesce_window.setter
+    def ack_coalesce_window(self, window: float) -> None:
+        if window < 0:
+            raise ValueError(f"ack_coalesce_window={window} must be >= 0")
+        self._ack_coalesce_window = float(window)
+
     async def ack(
         self, data: type_hints.BaseMsgType, ackcmd: type_hints.AckCmdDataType
     ) -> None:
         """Acknowledge a command by writing a new state.
 
+        If `ack_coalesce_window` is positive then a ``CMD_INPROGRESS``
+        acknowledgement may be deferred or dropped; see that property.
+
         Parameters
         ----------
         data : `DataType`
@@ -117,9 +172,65 @@ class ControllerCommand(read_topic.ReadTopic):
             (It is much less likely if the SalInfo as not started,
             because the SalInfo will not have received any commands.)
         """
+        seq_num = data.private_seqNum
+        deferred = self._deferred_acks.pop(seq_num, None)
+        if isinstance(deferred, asyncio.TimerHandle):
+            deferred.cancel()
+            self.num_coalesced_acks += 1
+        elif deferred is not None:
+            # The deferred ack is being written; wait for it,
+            # so acks are written in order.
+            await asyncio.wait([deferred])
+
+        if (
+            self._ack_coalesce_window > 0
+            and ackcmd.ack == sal_enums.SalRetCode.CMD_INPROGRESS
+        ):
+            delay = (
+                data.private_rcvStamp + self._ack_coalesce_window - utils.current_tai()
+            )
+            if delay > 0:
+                self._deferred_acks[seq_num] = asyncio.get_running_loop().call_later(
+                    delay, self._write_deferred_ack, data, ackcmd
+                )
+                return
+
+        await self._write_ack(data=data, ackcmd=ackcmd)
+
+    def _write_deferred_ack(
+        self, data: type_hints.BaseMsgType, ackcmd: type_hints.AckCmdDataType
+    ) -> None:
+        """Start writing a deferred ack, at the end of the coalesce window."""
+        task = asyncio.create_task(self._ack_if_running(data, ackcmd, defer=False))
+        self._deferred_acks[data.private_seqNum] = task
+        task.add_done_callback(
+            functools.partial(self._deferred_ack_done, seq_num=data.private_seqNum)
+        )
+
+    def _deferred_ack_done(self, task: asyncio.Task, seq_num: int) -> None:
+        """Forget a deferred ack that has been written."""
+        if self._deferred_acks.get(seq_num) is task:
+            del self._deferred_acks[seq_num]
+
+    async def _write_ack(
+        self, data: type_hints.BaseMsgType, ackcmd: type_hints.AckCmdDataType
+    ) -> None:
+        """Write an acknowledgement, without deferring it.
+
+        Parameters
+        ----------
+        data : `DataType`
+            Data for the command being acknowledged.
+        ackcmd : `salobj.AckCmdType`
+            Command acknowledgement data.
+        """
+        # Acknowledge with the index of the command, which matters
+        # if this SalInfo serves several indices (index=0).
+        index_kwargs = dict(salIndex=data.salIndex) if self.salinfo.indexed else {}
         # mypy thinks salinfo._ackcmd_writer can be None, but it can't.
         # Testing is expensive, so hide the warnings.
         await self.salinfo._ackcmd_writer.set_write(  # type: ignore
+            **index_kwargs,
             private_seqNum=data.private_seqNum,
             origin=data.private_origin,
             identity=data.private_identity,
@@ -193,7 +304,10 @@ class ControllerCommand(read_topic.ReadTopic):
         return await super().next(flush=False, timeout=timeout)
 
     async def _ack_if_running(
-        self, data: type_hints.BaseMsgType, ackcmd: type_hints.AckCmdDataType
+        self,
+        data: type_hints.BaseMsgType,
+        ackcmd: type_hints.AckCmdDataType,
+        defer: bool = True,
     ) -> None:
         """Wrapper around self.ack that logs a warning if not salinfo.running.
 
@@ -209,11 +323,23 @@ class ControllerCommand(read_topic.ReadTopic):
             Data for the command being acknowledged.
         ackcmd : `salobj.AckCmdType`
             Command acknowledgement data.
+        defer : `bool`, optional
+            If True then call `ack`, which may defer a ``CMD_INPROGRESS``
+            acknowledgement. If False then write the ack immediately.
         """
         if not self.salinfo.running:
             self.log.warning(f"Cannot issue {ackcmd=}; SalInfo is not running")
             return
-        await self.ack(data=data, ackcmd=ackcmd)
+        if defer:
+            await self.ack(data=data, ackcmd=ackcmd)
+        else:
+            await self._write_ack(data=data, ackcmd=ackcmd)
+
+    def basic_close(self) -> None:
+        for deferred in self._deferred_acks.values():
+            deferred.cancel()
+        self._deferred_acks.clear()
+        super().basic_close()
 
     def _queue_one_item(self, data: type_hints.BaseMsgType) -> None:
         """Queue the message if it has a valid sequence number.
@@ -235,11 +361,16 @@ class ControllerCommand(read_topic.ReadTopic):
             Command data.
         """
         try:
-            result = self._callback(data)  # type: ignore
-            if inspect.isawaitable(result):
-                ack = await result  # type: ignore
-            else:
-                ack = result  # type: ignore
+            async with (
+                self.scheduler.reserve(self.attr_name)
+                if self.scheduler is not None
+                else contextlib.nullcontext()
+            ):
+                result = self._call_callback(data)
+                if inspect.isawaitable(result):
+                    ack = await result  # type: ignore
+                else:
+                    ack = result  # type: ignore
             if ack is None:
                 ack = self.salinfo.make_ackcmd(
                     private_seqNum=data.private_seqNum,
@@ -23,8 +23,13 @@ from __future__ import annotations
 
 __all__ = ["ControllerTelemetry"]
 
+import asyncio
 import typing
 
+from confluent_kafka import KafkaException
+from lsst.ts import utils
+from lsst.ts.xml import type_hints
+
 from . import write_topic
 
 if typing.TYPE_CHECKING:
@@ -40,7 +45,131 @@ class ControllerTelemetry(write_topic.WriteTopic):
         SAL component information.
     name : `str`
         Telemetry topic name, with no prefix.
+    unacknowledged : `bool`, optional
+        Initial value for the `unacknowledged` property.
+    coalesce : `bool`, optional
+        Initial value for the `coalesce` property.
     """
 
-    def __init__(self, salinfo: SalInfo, name: str) -> None:
+    def __init__(
+        self,
+        salinfo: SalInfo,
+        name: str,
+        unacknowledged: bool = False,
+        coalesce: bool = False,
+    ) -> None:
         super().__init__(salinfo=salinfo, attr_name="tel_" + name)
+        self.unacknowledged = unacknowledged
+        self.coalesce = coalesce
+        self._num_coalesced = 0
+        # Message waiting to be written, if coalescing.
+        self._pending_data_dict: dict[str, typing.Any] | None = None
+        # Task that writes pending messages, if coalescing.
+        self._coalesce_task = utils.make_done_future()
+
+    @property
+    def unacknowledged(self) -> bool:
+        """Does `write` return without waiting for the message to be written?
+
+        If False (the default), `write` waits until the message has been
+        serialized and handed to the Kafka producer, and raises
+        an exception if that fails.
+
+        If True, `write` schedules the write and returns immediately,
+        so a telemetry loop is not slowed down by writing.
+        Failures are not raised; instead they are counted in
+        ``salinfo.delivery_error_counts`` and periodically logged
+        as a summary. Messages are still written in order.
+        """
+        return self._unacknowledged
+
+    @unacknowledged.setter
+    def unacknowledged(self, unacknowledged: bool) -> None:
+        self._unacknowledged = bool(unacknowledged)
+
+    @property
+    def coalesce(self) -> bool:
+        """Replace unsent messages with newer ones?
+
+        If False (the default), every message is written.
+
+        If True, `write` returns immediately (as for `unacknowledged`)
+        and messages are written one at a time, each after
+        the broker has acknowledged the previous one.
+        There is at most one message waiting to be written;
+        if `write` is called while a message is waiting,
+        the new message replaces it. This keeps memory bounded
+        and sends the most recent data if the broker or network
+        cannot keep up. Replaced messages are counted by `num_coalesced`
+        and failures are handled as for `unacknowledged`.
+
+        If true, this overrides `unacknowledged`.
+        """
+        return self._coalesce
+
+    @coalesce.setter
+    def coalesce(self, coalesce: bool) -> None:
+        self._coalesce = bool(coalesce)
+
+    @property
+    def num_coalesced(self) -> int:
+        """Get the number of messages replaced by newer messages
+        before being sent, because `coalesce` is true.
+        """
+        return self._num_coalesced
+
+    def basic_close(self) -> None:
+        self._pending_data_dict = None
+        try:
+            # This raises RuntimeError if the asyncio loop is closed.
+            self._coalesce_task.cancel()
+        except RuntimeError:
+            pass
+        super().basic_close()
+
+    @typing.overload
+    async def write(
+        self, *, snapshot: typing.Literal[True] = ...
+    ) -> type_hints.BaseMsgType: ...
+
+    @typing.overload
+    async def write(self, *, snapshot: typing.Literal[False]) -> None: ...
+
+    async def write(self, *, snapshot: bool = True) -> type_hints.BaseMsgType | None:
+        """Write the current data and return a copy of the data written.
+
+        See `WriteTopic.write` for details. If `coalesce` is true
+        then the data is queued to be written, possibly replacing
+        a message that has not yet been written.
+        """
+        if not self._coalesce:
+            return await super().write(snapshot=snapshot)
+
+        self.salinfo.assert_running()
+        data_dict = self._prepare_data_to_write()
+        if self._pending_data_dict is not None:
+            self._num_coalesced += 1
+        self._pending_data_dict = data_dict
+        if self._coalesce_task.done():
+            self._coalesce_task = asyncio.create_task(self._coalesce_loop())
+        return self.DataType(**data_dict) if snapshot else None
+
+    async def _coalesce_loop(self) -> None:
+        """Write pending messages until there are none."""
+        while self._pending_data_dict is not None:
+            data_dict = self._pending_data_dict
+            self._pending_data_dict = None
+            try:
+                await self.salinfo.write_data(
+                    topic_info=self.topic_info,
+                    data_dict=data_dict,
+                    wait_for_delivery=True,
+                    log_errors=False,
+                )
+            except KafkaException:
+                # Delivery errors are already counted by SalInfo.
+                pass
+            except Exception as e:
+                self.salinfo._handle_delivery_error(
+                    attr_name=self.attr_name, error=e, future=None
+                )
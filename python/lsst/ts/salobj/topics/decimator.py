@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["DecimationMode", "Decimator"]
+
+import asyncio
+import dataclasses
+import enum
+import math
+import time
+import typing
+from collections.abc import Callable, Collection
+
+import numpy as np
+from lsst.ts.xml import type_hints
+
+from .base_topic import get_data_dict
+
+
+class DecimationMode(enum.Enum):
+    """Which message a `Decimator` outputs for each interval.
+
+    Values
+    ------
+    FIRST
+        Output the first message of each interval, as soon as it arrives,
+        and discard the others.
+    LATEST
+        Output the first message immediately, if no message has been
+        output for a full interval; otherwise hold the latest message
+        and output it at the end of the interval.
+    MEAN
+        Output the latest message at the end of each interval,
+        with each public float field (including float arrays) replaced by
+        the mean of that field over all messages received in the interval.
+    """
+
+    FIRST = "first"
+    LATEST = "latest"
+    MEAN = "mean"
+
+
+@dataclasses.dataclass
+class _IndexState:
+    """Decimation state for one SAL index."""
+
+    # time.monotonic() time at which the most recent message was output.
+    last_output_time: float = -math.inf
+    # The message to output at the end of the interval, if any.
+    pending_data: type_hints.BaseMsgType | None = None
+    # Number of messages received since the last output (MEAN mode).
+    count: int = 0
+    # Dict of field name: sum of values since the last output (MEAN mode).
+    sums: dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    timer: asyncio.TimerHandle | None = None
+
+
+class Decimator:
+    """Limit the rate at which messages are output.
+
+    Used by `ReadTopic.set_max_rate`.
+
+    Parameters
+    ----------
+    max_rate_hz : `float`
+        Maximum rate at which to output messages (Hz).
+        Messages for each SAL index are decimated separately.
+    mode : `DecimationMode`
+        Which message to output for each interval.
+    output : ``callable``
+        Function to call to output held messages at the end of an interval.
+        It receives one argument: a list of messages.
+
+    Raises
+    ------
+    ValueError
+        If ``max_rate_hz`` is not positive.
+
+    Attributes
+    ----------
+    num_dropped : `int`
+        The number of messages dropped (or, for `DecimationMode.MEAN`,
+        merged into another message).
+    """
+
+    def __init__(
+        self,
+        max_rate_hz: float,
+        mode: DecimationMode,
+        output: Callable[[list[type_hints.BaseMsgType]], None],
+    ) -> None:
+        if not max_rate_hz > 0:
+            raise ValueError(f"max_rate_hz={max_rate_hz} must be positive")
+        self.max_rate_hz = float(max_rate_hz)
+        self.interval = 1 / self.max_rate_hz
+        self.mode = DecimationMode(mode)
+        self.output = output
+        self.num_dropped = 0
+        # Names of public float fields, for MEAN mode.
+        # Computed from the first message.
+        self._float_field_names: list[str] | None = None
+        # Dict of salIndex: _IndexState
+        self._index_states: dict[int, _IndexState] = dict()
+
+    def close(self) -> None:
+        """Cancel pending output. Held messages are discarded."""
+        for state in self._index_states.values():
+            if state.timer is not None:
+                state.timer.cancel()
+        self._index_states.clear()
+
+    def decimate(
+        self, data_list: Collection[type_hints.BaseMsgType]
+    ) -> list[type_hints.BaseMsgType]:
+        """Decimate messages.
+
+        Parameters
+        ----------
+        data_list : `Collection` [`type_hints.BaseMsgType`]
+            Newly received messages.
+
+        Returns
+        -------
+        output_list : `list` [`type_hints.BaseMsgType`]
+            Messages to output now. Other messages are either dropped
+            or held and output (by calling ``output``) at the end
+            of the current interval.
+        """
+        output_list: list[type_hints.BaseMsgType] = []
+        curr_time = time.monotonic()
+        for data in data_list:
+            state = self._index_states.get(data.salIndex)
+            if state is None:
+                state = _IndexState()
+                self._index_states[data.salIndex] = state
+
+            if self.mode is DecimationMode.MEAN:
+                self._accumulate(state=state, data=data)
+            elif (
+                state.pending_data is None
+                and curr_time - state.last_output_time >= self.interval
+            ):
+                state.last_output_time = curr_time
+                output_list.append(data)
+                continue
+            elif self.mode is DecimationMode.FIRST:
+                self.num_dropped += 1
+                continue
+            else:
+                if state.pending_data is not None:
+                    self.num_dropped += 1
+                state.pending_data = data
+
+            if state.timer is None:
+                delay = max(
+                    state.last_output_time + self.interval - curr_time,
+                    # MEAN mode always waits one full interval.
+                    self.interval if self.mode is DecimationMode.MEAN else 0,
+                )
+                state.timer = asyncio.get_running_loop().call_later(
+                    delay, self._output_pending, data.salIndex
+                )
+        return output_list
+
+    def _accumulate(self, state: _IndexState, data: type_hints.BaseMsgType) -> None:
+        """Add a message to the running sums for MEAN mode."""
+        if self._float_field_names is None:
+            self._float_field_names = [
+                name
+                for name, value in get_data_dict(data).items()
+                if not name.startswith("private_")
+                and isinstance(
+                    value[0] if isinstance(value, (list, np.ndarray)) else value,
+                    (float, np.floating),
+                )
+            ]
+        if state.count > 0:
+            self.num_dropped += 1
+            for name in self._float_field_names:
+                state.sums[name] += np.asarray(getattr(data, name), dtype=float)
+        else:
+            for name in self._float_field_names:
+                state.sums[name] = np.array(getattr(data, name), dtype=float)
+        state.count += 1
+        state.pending_data = data
+
+    def _output_pending(self, index: int) -> None:
+        """Output the held message for one SAL index, if any."""
+        state = self._index_states[index]
+        state.timer = None
+        data = state.pending_data
+        if data is None:
+            return
+        state.pending_data = None
+        state.last_output_time = time.monotonic()
+        if self.mode is DecimationMode.MEAN:
+            # Make a new message, to avoid modifying the caller's data
+            # (and because messages may be frozen).
+            data_dict = get_data_dict(data).copy()
+            for name in self._float_field_names:  # type: ignore
+                mean = state.sums[name] / state.count
+                value = data_dict[name]
+                if isinstance(value, np.ndarray):
+                    mean = mean.astype(value.dtype)
+                elif isinstance(value, list):
+                    mean = mean.tolist()
+                else:
+                    mean = float(mean)
+                data_dict[name] = mean
+            data = type(data)(**data_dict)
+            state.count = 0
+            state.sums.clear()
+        self.output([data])
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = ["DeadbandFilter", "MessageFilterType"]
+
+import typing
+from collections.abc import Callable, Collection
+
+import numpy as np
+from lsst.ts.xml import type_hints
+
+from .base_topic import get_data_dict
+
+# A message filter: a function that receives a message
+# and returns True if the message should be kept.
+MessageFilterType = Callable[[type_hints.BaseMsgType], bool]
+
+
+class DeadbandFilter:
+    """A message filter that only keeps messages that differ significantly
+    from the previous message kept.
+
+    Intended to be used as `ReadTopic.message_filter`.
+
+    Parameters
+    ----------
+    abs_tolerance : `dict` [`str`, `float`], optional
+        Dict of field name: absolute tolerance, for numeric fields.
+    rel_tolerance : `dict` [`str`, `float`], optional
+        Dict of field name: relative tolerance, for numeric fields.
+    default_abs_tolerance : `float`, optional
+        Absolute tolerance for numeric fields not in ``abs_tolerance``.
+    default_rel_tolerance : `float`, optional
+        Relative tolerance for numeric fields not in ``rel_tolerance``.
+    fields : `Collection` [`str`], optional
+        Names of fields to compare. If `None` then compare all public fields
+        (fields whose names do not start with ``private_``, and are not
+        ``salIndex``) except those in ``ignore_fields``.
+    ignore_fields : `Collection` [`str`], optional
+        Names of fields to not compare. Ignored if ``fields`` is specified.
+
+    Notes
+    -----
+    A numeric field has changed significantly if, for any element,
+    ``abs(new - old) > abs_tol + rel_tol * abs(old)``, where ``old``
+    is the value in the previous message kept (the same criterion as
+    `numpy.isclose`). NaN values compare equal to each other.
+    Array fields are compared using vectorized numpy operations.
+    Boolean and string fields have changed if they are not equal.
+    To mimic rounding to ``digits`` digits, as done by
+    ``CscCommander.telemetry_fields_compare_digits``,
+    use an absolute tolerance of ``0.5 * 10**-digits``.
+
+    The first message for each SAL index is always kept.
+    Messages for different SAL indices are compared separately,
+    which matters when reading an indexed component with index=0.
+    """
+
+    def __init__(
+        self,
+        abs_tolerance: dict[str, float] | None = None,
+        rel_tolerance: dict[str, float] | None = None,
+        *,
+        default_abs_tolerance: float = 0,
+        default_rel_tolerance: float = 0,
+        fields: Collection[str] | None = None,
+        ignore_fields: Collection[str] = (),
+    ) -> None:
+        self.abs_tolerance = dict() if abs_tolerance is None else dict(abs_tolerance)
+        self.rel_tolerance = dict() if rel_tolerance is None else dict(rel_tolerance)
+        self.default_abs_tolerance = float(default_abs_tolerance)
+        self.default_rel_tolerance = float(default_rel_tolerance)
+        self.fields = None if fields is None else tuple(fields)
+        self.ignore_fields = frozenset(ignore_fields)
+        # List of (field name, comparator, atol, rtol),
+        # computed from the first message.
+        self._comparators: (
+            list[tuple[str, Callable[..., bool], float, float]] | None
+        ) = None
+        # Dict of salIndex: previous message kept.
+        self._previous_data: dict[int, type_hints.BaseMsgType] = dict()
+
+    def reset(self) -> None:
+        """Forget the previous messages, so the next message is kept."""
+        self._previous_data.clear()
+
+    def __call__(self, data: type_hints.BaseMsgType) -> bool:
+        """Return True if the message should be kept."""
+        if self._comparators is None:
+            self._comparators = self._make_comparators(data)
+        index = data.salIndex
+        previous_data = self._previous_data.get(index)
+        if previous_data is None or self._changed(previous_data, data):
+            self._previous_data[index] = data
+            return True
+        return False
+
+    def _changed(
+        self, old_data: type_hints.BaseMsgType, new_data: type_hints.BaseMsgType
+    ) -> bool:
+        """Return True if any compared field has changed significantly."""
+        for name, comparator, atol, rtol in self._comparators:  # type: ignore
+            if comparator(getattr(old_data, name), getattr(new_data, name), atol, rtol):
+                return True
+        return False
+
+    def _make_comparators(
+        self, data: type_hints.BaseMsgType
+    ) -> list[tuple[str, Callable[..., bool], float, float]]:
+        """Make the list of comparators for the fields to compare.
+
+        Parameters
+        ----------
+        data : `type_hints.BaseMsgType`
+            A message, used to determine the type of each field.
+
+        Raises
+        ------
+        AttributeError
+            If ``fields``, ``abs_tolerance`` or ``rel_tolerance``
+            contains a field name that is not in the topic.
+        """
+        data_dict = get_data_dict(data)
+        if self.fields is None:
+            names = [
+                name
+                for name in data_dict
+                if not name.startswith("private_")
+                and name != "salIndex"
+                and name not in self.ignore_fields
+            ]
+        else:
+            names = list(self.fields)
+        unknown_names = (
+            set(names) | self.abs_tolerance.keys() | self.rel_tolerance.keys()
+        ) - data_dict.keys()
+        if unknown_names:
+            raise AttributeError(f"Unknown fields {sorted(unknown_names)}")
+
+        comparators = []
+        for name in names:
+            value = data_dict[name]
+            is_array = isinstance(value, (list, np.ndarray))
+            # In our SAL schemas arrays are fixed length
+            # and must contain at least one element.
+            elt = value[0] if is_array else value
+            is_numeric = isinstance(elt, (int, float, np.number)) and not isinstance(
+                elt, (bool, np.bool_)
+            )
+            if is_numeric:
+                comparator = (
+                    _numeric_array_changed if is_array else _numeric_scalar_changed
+                )
+            else:
+                comparator = _array_changed if is_array else _scalar_changed
+            comparators.append(
+                (
+                    name,
+                    comparator,
+                    self.abs_tolerance.get(name, self.default_abs_tolerance),
+                    self.rel_tolerance.get(name, self.default_rel_tolerance),
+                )
+            )
+        return comparators
+
+
+def _scalar_changed(old: typing.Any, new: typing.Any, atol: float, rtol: float) -> bool:
+    return old != new
+
+
+def _array_changed(old: typing.Any, new: typing.Any, atol: float, rtol: float) -> bool:
+    return not np.array_equal(old, new)
+
+
+def _numeric_scalar_changed(old: float, new: float, atol: float, rtol: float) -> bool:
+    diff = abs(new - old)
+    if diff <= atol + rtol * abs(old):
+        return False
+    if diff != diff:
+        # diff is nan: one or both values are nan,
+        # or both are infinite with the same sign.
+        return not (old == new or (old != old and new != new))
+    return True
+
+
+def _numeric_array_changed(
+    old: typing.Any, new: typing.Any, atol: float, rtol: float
+) -> bool:
+    return not np.allclose(new, old, rtol=rtol, atol=atol, equal_nan=True)
@@ -86,13 +86,26 @@ class MockWriteTopic(WriteTopic):
         )
         self.data_list: list[type_hints.BaseMsgType] = []
 
-    async def write(self) -> type_hints.BaseMsgType:
+    @typing.overload
+    async def write(
+        self, *, snapshot: typing.Literal[True] = ...
+    ) -> type_hints.BaseMsgType: ...
+
+    @typing.overload
+    async def write(self, *, snapshot: typing.Literal[False]) -> None: ...
+
+    async def write(self, *, snapshot: bool = True) -> type_hints.BaseMsgType | None:
         """Write the current data and return a copy of the data written.
 
+        Parameters
+        ----------
+        snapshot : `bool`, optional
+            Return a copy of the data written?
+
         Returns
         -------
-        data : `type_hints.BaseMsgType`
-            The data that was written.
+        data : `type_hints.BaseMsgType` | `None`
+            The data that was written, if ``snapshot`` true, else `None`.
             This can be useful to avoid race conditions
             (as found in RemoteCommand).
 
@@ -101,6 +114,6 @@ class MockWriteTopic(WriteTopic):
         RuntimeError
             If not running.
         """
-        data = self._prepare_data_to_write()
+        data = self.DataType(**self._prepare_data_to_write())
         self.data_list.append(data)
-        return data
+        return data if snapshot else None
@@ -26,17 +26,21 @@ __all__ = ["QueueCapacityChecker", "ReadTopic", "DEFAULT_QUEUE_LEN", "MIN_QUEUE_
 import asyncio
 import bisect
 import collections
+import concurrent.futures
 import inspect
 import logging
 import typing
 import warnings
 from collections.abc import Awaitable, Callable, Collection
 
+import numpy as np
 from lsst.ts import utils
 from lsst.ts.xml import type_hints
 
 from .. import base
-from .base_topic import BaseTopic
+from .base_topic import BaseTopic, get_data_dict
+from .decimator import DecimationMode, Decimator
+from .message_filter import MessageFilterType
 
 if typing.TYPE_CHECKING:
     from ..sal_info import SalInfo
@@ -56,6 +60,16 @@ CallbackType = Callable[
     [type_hints.BaseMsgType],
     _BasicReturnType | Awaitable[_BasicReturnType],
 ]
+WaitPredicateType = Callable[[type_hints.BaseMsgType], bool]
+
+
+def is_async_callable(func: typing.Any) -> bool:
+    """Return True if ``func`` is a coroutine function or has an
+    asynchronous ``__call__`` method.
+    """
+    return inspect.iscoroutinefunction(func) or asyncio.iscoroutinefunction(
+        func.__call__
+    )
 
 
 class QueueCapacityChecker:
@@ -255,8 +269,12 @@ class ReadTopic(BaseTopic):
     cache. This presents a risk: if any reader modifies a message, then it
     will be modified for all readers of that message. To safely modify a
     returned message, make your own copy with ``copy.copy(data)``.
+    To prevent such modification, construct the `SalInfo`
+    with ``slots=True, frozen=True``.
     """
 
+    frozen_allowed = True
+
     def __init__(
         self,
         *,
@@ -297,8 +315,28 @@ class ReadTopic(BaseTopic):
         # Event that is set when new data arrives. Used by aget.
         self._new_data_event = asyncio.Event()
         self._callback: CallbackType | None = None
-        self._callback_tasks: set[asyncio.Task] = set()
+        self._max_concurrent_callbacks: int | None = None
+        self._callback_executor: concurrent.futures.Executor | None = None
+        self._executor_queue_depth = 0
+        self._message_filter: MessageFilterType | None = None
+        self._num_filtered = 0
+        # Dict of array field name: dtype, if numpy_arrays true, else None.
+        self._array_dtypes: dict[str, np.dtype] | None = None
+        self._decimator: Decimator | None = None
+        self._num_decimated = 0
+        # Dict of future: predicate for each call to `wait_for`.
+        self._waiters: dict[asyncio.Future, WaitPredicateType] = dict()
+        # Callback tasks, if allow_multiple_callbacks is true
+        # and max_concurrent_callbacks is None, else callback worker tasks,
+        # plus old callback loops that are stopping after a restart.
+        self._callback_tasks: set[asyncio.Future] = set()
+        self._num_running_callbacks = 0
+        # Event that is set when new data arrives. Used by callback workers.
+        self._callback_data_event = asyncio.Event()
         self._callback_loop_task = utils.make_done_future()
+        # Incremented to tell callback workers to stop,
+        # once they finish running the callback on their current message.
+        self._callback_generation = 0
         self.python_queue_length_checker = QueueCapacityChecker(
             descr=f"{attr_name} python read queue", log=self.log, queue_len=queue_len
         )
@@ -322,13 +360,243 @@ class ReadTopic(BaseTopic):
     def allow_multiple_callbacks(self, allow: bool) -> None:
         self._allow_multiple_callbacks = bool(allow)
 
+    @property
+    def max_concurrent_callbacks(self) -> int | None:
+        """Maximum number of callbacks that may run simultaneously,
+        or `None` for no limit.
+
+        Only relevant if `allow_multiple_callbacks` is true.
+
+        Raises
+        ------
+        ValueError
+            When setting a new value, if the value is not `None`
+            and is less than 1.
+
+        Notes
+        -----
+        If not `None` then the callback is run by this many long-lived
+        worker tasks, each of which pulls the oldest message from the queue.
+        This bounds the number of tasks (and so memory) during a burst
+        of messages; messages that arrive while all workers are busy
+        wait in the queue, and are counted by `nqueued`.
+
+        If `None` (the default) then a new task is created
+        for each message, and there is no limit to how many may run.
+
+        Changes take effect immediately, without flushing the queue.
+        Callbacks that are already running are not cancelled,
+        so the new limit may be exceeded until they finish.
+        """
+        return self._max_concurrent_callbacks
+
+    @max_concurrent_callbacks.setter
+    def max_concurrent_callbacks(self, max_concurrent: int | None) -> None:
+        if max_concurrent is not None:
+            max_concurrent = int(max_concurrent)
+            if max_concurrent < 1:
+                raise ValueError(
+                    f"max_concurrent_callbacks={max_concurrent} must be None or >= 1"
+                )
+        if max_concurrent == self._max_concurrent_callbacks:
+            return
+        self._max_concurrent_callbacks = max_concurrent
+        if self.has_callback and self.allow_multiple_callbacks:
+            self._restart_callback_loop()
+
+    @property
+    def callback_executor(self) -> concurrent.futures.Executor | None:
+        """Executor in which to run the callback function,
+        or `None` to run it in the event loop (the default).
+
+        Use this for CPU-heavy callback functions, which would otherwise
+        block reading and processing of all other topics.
+
+        Raises
+        ------
+        TypeError
+            When setting a new value, if the value is not `None`
+            and is not a `concurrent.futures.Executor`,
+            or if the current callback function is asynchronous.
+
+        Notes
+        -----
+        The callback function must be synchronous. It receives:
+
+        * The message, for a `concurrent.futures.ThreadPoolExecutor`
+          or any other executor that is not a process pool.
+        * A `dict` of field name: value, for a
+          `concurrent.futures.ProcessPoolExecutor`, because messages
+          cannot be pickled. The callback function must also be picklable,
+          e.g. a function defined at module scope.
+
+        If `allow_multiple_callbacks` is false then the callback is run
+        on one message at a time, preserving the order in which messages
+        were received. Otherwise messages are submitted to the executor
+        as they arrive (subject to `max_concurrent_callbacks`) and may
+        finish in any order.
+
+        The executor is not shut down when this topic is closed,
+        so one executor may be shared by several topics.
+        """
+        return self._callback_executor
+
+    @callback_executor.setter
+    def callback_executor(self, executor: concurrent.futures.Executor | None) -> None:
+        if executor is not None:
+            if not isinstance(executor, concurrent.futures.Executor):
+                raise TypeError(f"executor={executor!r} must be an Executor or None")
+            if self._callback is not None and is_async_callable(self._callback):
+                raise TypeError(
+                    f"callback {self._callback} must be synchronous to run in an executor"
+                )
+        self._callback_executor = executor
+
+    @property
+    def executor_queue_depth(self) -> int:
+        """Return the number of callbacks submitted to `callback_executor`
+        by this topic that have not yet finished.
+        """
+        return self._executor_queue_depth
+
+    @property
+    def message_filter(self) -> MessageFilterType | None:
+        """Message filter, or `None` to keep all messages (the default).
+
+        A message filter is a function that receives a message
+        and returns True if the message should be kept,
+        or False if it should be discarded.
+        See `DeadbandFilter` for a filter that only keeps messages
+        that have changed significantly.
+
+        Raises
+        ------
+        TypeError
+            When setting a new value, if the value is not None
+            and is not callable.
+
+        Notes
+        -----
+        The filter is applied as each message is received,
+        before it is queued. A discarded message is never seen by
+        `aget`, `get`, `get_oldest`, `next` or the callback function.
+        It is only counted by `num_filtered`.
+
+        The filter is called in the read loop,
+        so it should be fast and must not block.
+        """
+        return self._message_filter
+
+    @message_filter.setter
+    def message_filter(self, message_filter: MessageFilterType | None) -> None:
+        if message_filter is not None and not callable(message_filter):
+            raise TypeError(f"message_filter={message_filter!r} not callable")
+        self._message_filter = message_filter
+
+    @property
+    def num_filtered(self) -> int:
+        """Return the number of messages discarded by `message_filter`."""
+        return self._num_filtered
+
+    @property
+    def numpy_arrays(self) -> bool:
+        """Are array fields of messages read as `numpy.ndarray`?
+
+        If False (the default) array fields are lists.
+        If True they are numpy arrays with the dtype specified
+        by the topic schema.
+
+        Notes
+        -----
+        The Avro deserializer always decodes array fields as lists,
+        so each array field of each message is converted, which costs
+        one extra allocation per array. This is only worthwhile
+        if the arrays would otherwise be converted anyway,
+        e.g. by each callback calling `numpy.asarray`,
+        or if the arrays are used in many numpy operations.
+        Messages for other SAL indices are discarded before conversion.
+
+        Messages already queued when this is changed are not affected.
+        """
+        return self._array_dtypes is not None
+
+    @numpy_arrays.setter
+    def numpy_arrays(self, numpy_arrays: bool) -> None:
+        self._array_dtypes = self.get_array_dtypes() if numpy_arrays else None
+
+    @property
+    def max_rate_hz(self) -> float | None:
+        """Maximum rate at which messages are queued (Hz),
+        or `None` if unlimited (the default).
+
+        Use `set_max_rate` to change this.
+        """
+        return None if self._decimator is None else self._decimator.max_rate_hz
+
+    @property
+    def num_decimated(self) -> int:
+        """Return the number of messages dropped by decimation.
+
+        For `DecimationMode.MEAN` this is the number of messages
+        that were averaged into another message.
+        """
+        if self._decimator is None:
+            return self._num_decimated
+        return self._num_decimated + self._decimator.num_dropped
+
+    def set_max_rate(
+        self,
+        max_rate_hz: float | None,
+        mode: DecimationMode = DecimationMode.LATEST,
+    ) -> None:
+        """Set or clear a limit on the rate at which messages are queued.
+
+        Parameters
+        ----------
+        max_rate_hz : `float` | `None`
+            Maximum rate at which to queue messages (Hz),
+            or `None` for no limit.
+            Messages for each SAL index are decimated separately.
+        mode : `DecimationMode`, optional
+            Which message to queue for each interval;
+            see `DecimationMode` for details.
+
+        Raises
+        ------
+        ValueError
+            If ``max_rate_hz`` is not None and not positive,
+            or ``mode`` is not a valid `DecimationMode`.
+
+        Notes
+        -----
+        Decimation is applied after `message_filter`, so only messages
+        accepted by the filter are candidates for queuing.
+        Messages that are dropped are never seen by `aget`, `get`,
+        `get_oldest`, `next` or the callback function.
+        They are only counted by `num_decimated`.
+
+        Changing the limit discards any message that is being held
+        for output at the end of the current interval.
+        """
+        decimator = (
+            None
+            if max_rate_hz is None
+            else Decimator(
+                max_rate_hz=max_rate_hz, mode=mode, output=self._queue_kept_data
+            )
+        )
+        self._close_decimator()
+        self._decimator = decimator
+
     @property
     def callback(
         self,
     ) -> CallbackType | None:
         """Asynchronous callback function, or None if there is not one.
 
-        Synchronous callback functions are deprecated.
+        Synchronous callback functions are deprecated,
+        unless `callback_executor` is set, in which case
+        the callback function must be synchronous.
 
         The callback function is called when a new message is received;
         it receives one argument: the message (an object of type
@@ -338,12 +606,16 @@ class ReadTopic(BaseTopic):
         ------
         TypeError
             When setting a new callback if the callback is not None
-            and is not callable.
+            and is not callable, or if `callback_executor` is set
+            and the callback is asynchronous.
 
         Notes
         -----
-        Setting a callback flushes the queue, and it will remain empty
-        as long as there is a callback.
+        Setting a callback flushes the queue. After that, messages
+        only wait in the queue while the callback cannot accept them:
+        while the previous callback is running, if `allow_multiple_callbacks`
+        is false, or while all workers are busy, if `max_concurrent_callbacks`
+        is not `None`. See `nqueued`.
 
         `get_oldest` and `next` are prohibited if there is a callback function.
         Technically they could both work, but `get_oldest` would always return
@@ -357,11 +629,12 @@ class ReadTopic(BaseTopic):
         if func is not None:
             if not callable(func):
                 raise TypeError(f"callback {func} not callable")
-            if not inspect.iscoroutinefunction(
-                func
-            ) and not asyncio.iscoroutinefunction(
-                func.__call__  # type: ignore
-            ):
+            if self._callback_executor is not None:
+                if is_async_callable(func):
+                    raise TypeError(
+                        f"callback {func} must be synchronous to run in an executor"
+                    )
+            elif not is_async_callable(func):
                 # TODO DM-37502: modify this to raise (and update doc string)
                 # once we drop support for synchronous callback functions.
                 warnings.warn(
@@ -405,6 +678,11 @@ class ReadTopic(BaseTopic):
         """Return the number of messages in the Python queue."""
         return len(self._data_queue)
 
+    @property
+    def num_running_callbacks(self) -> int:
+        """Return the number of callbacks that are currently running."""
+        return self._num_running_callbacks
+
     @property
     def max_history(self) -> int:
         return self._max_history
@@ -418,10 +696,13 @@ class ReadTopic(BaseTopic):
             return
         self.isopen = False
         self._callback = None
+        self._close_decimator()
         try:
             # These raise RuntimeError if the asyncio loop is not running.
             self._cancel_callbacks()
             self._next_task.cancel()
+            for waiter in self._waiters:
+                waiter.cancel()
         except RuntimeError:
             pass
         self._data_queue.clear()
@@ -587,6 +868,77 @@ class ReadTopic(BaseTopic):
             self.flush()
         return await self._next(timeout=timeout)
 
+    async def wait_for(
+        self,
+        predicate: WaitPredicateType,
+        timeout: float | None = None,
+        include_current: bool = True,
+    ) -> type_hints.BaseMsgType:
+        """Wait for a message that matches a predicate.
+
+        This method does not change which message will be returned by
+        any other method, and it may be used with a callback function.
+
+        Parameters
+        ----------
+        predicate : ``callable``
+            Function that receives a message and returns True if it is
+            the desired message. It is called in the read loop,
+            so it should be fast and must not block.
+        timeout : `float`, optional
+            Time limit, in seconds. If None then no time limit.
+        include_current : `bool`, optional
+            If True and the current message (as returned by `get`)
+            matches, return it without waiting.
+            If False then only check new messages.
+
+        Returns
+        -------
+        data : `DataType`
+            The first message that matches.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If no matching message arrives within the specified time limit.
+        RuntimeError
+            If the ``salinfo`` has not started reading.
+        Exception
+            Any exception raised by ``predicate``.
+
+        Notes
+        -----
+        This is more efficient than calling `next` in a loop, because
+        each new message is checked against all waiters directly,
+        without scheduling any tasks or queuing data.
+
+        Only messages that pass `message_filter` and decimation
+        (see `set_max_rate`) are checked.
+
+        For example, to wait for a CSC to be enabled::
+
+            await remote.evt_summaryState.wait_for(
+                lambda data: data.summaryState == salobj.State.ENABLED,
+                timeout=STD_TIMEOUT,
+            )
+
+        Do not modify the returned data. To make a copy that you can
+        safely modify, use ``copy.copy(data)``.
+        """
+        self.salinfo.assert_started()
+        if (
+            include_current
+            and self._current_data is not None
+            and predicate(self._current_data)
+        ):
+            return self._current_data
+        waiter: asyncio.Future = asyncio.Future()
+        self._waiters[waiter] = predicate
+        try:
+            return await asyncio.wait_for(waiter, timeout=timeout)
+        finally:
+            self._waiters.pop(waiter, None)
+
     async def _next(self, *, timeout: float | None = None) -> type_hints.BaseMsgType:
         """Implement next.
 
@@ -600,19 +952,87 @@ class ReadTopic(BaseTopic):
         return await asyncio.wait_for(self._next_task, timeout=timeout)
 
     async def _callback_loop(self) -> None:
-        while True:
-            if not self.has_callback:
-                return
-            data = await self._next()
+        generation = self._callback_generation
+        if self.allow_multiple_callbacks and self.max_concurrent_callbacks is not None:
+            for _ in range(self.max_concurrent_callbacks):
+                task = asyncio.create_task(self._callback_worker(generation=generation))
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
+            return
+
+        # Take messages directly from the queue, as the workers do,
+        # rather than via `_next`, so that a restart cannot lose
+        # a message that has been taken from the queue.
+        while self.has_callback and generation == self._callback_generation:
+            if not self._data_queue:
+                self._callback_data_event.clear()
+                await self._callback_data_event.wait()
+                continue
+            self.python_queue_length_checker.check_nitems(len(self._data_queue))
+            data = self._data_queue.popleft()
             result = self._run_callback(data)
+            self._num_running_callbacks += 1
             if self.allow_multiple_callbacks:
-                # Purge done callback tasks and add a new one.
-                self._callback_tasks = {
-                    task for task in self._callback_tasks if not task.done()
-                }
-                self._callback_tasks.add(asyncio.create_task(result))
+                # Keep a strong reference to the task until it is done.
+                task = asyncio.create_task(result)
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_task_done)
             else:
-                await result
+                try:
+                    await result
+                finally:
+                    self._num_running_callbacks -= 1
+
+    async def _callback_worker(self, generation: int) -> None:
+        """Run the callback on queued messages, one at a time.
+
+        Used instead of `_callback_loop` if `allow_multiple_callbacks`
+        is true and `max_concurrent_callbacks` is not None.
+        Unlike `_next`, each message is seen by only one worker.
+
+        Parameters
+        ----------
+        generation : `int`
+            The value of ``self._callback_generation`` when this worker
+            was started. The worker stops when that value changes.
+        """
+        while self.has_callback and generation == self._callback_generation:
+            if not self._data_queue:
+                self._callback_data_event.clear()
+                await self._callback_data_event.wait()
+                continue
+            self.python_queue_length_checker.check_nitems(len(self._data_queue))
+            data = self._data_queue.popleft()
+            self._num_running_callbacks += 1
+            try:
+                await self._run_callback(data)
+            finally:
+                self._num_running_callbacks -= 1
+
+    def _callback_task_done(self, task: asyncio.Task) -> None:
+        """Forget a callback task that is done."""
+        self._callback_tasks.discard(task)
+        self._num_running_callbacks -= 1
+
+    def _restart_callback_loop(self) -> None:
+        """Restart the callback loop, to apply a new value of
+        `max_concurrent_callbacks`.
+
+        Unlike setting `callback`, this does not flush the queue
+        or cancel running callbacks: the existing loop and workers stop
+        (without taking another message from the queue)
+        once they finish their current message.
+        """
+        self._callback_generation += 1
+        # Wake the idle loop or workers, so they stop.
+        self._callback_data_event.set()
+        # Track the old loop until it stops, so `_cancel_callbacks`
+        # can cancel it.
+        old_loop_task = self._callback_loop_task
+        if not old_loop_task.done():
+            self._callback_tasks.add(old_loop_task)
+            old_loop_task.add_done_callback(self._callback_tasks.discard)
+        self._callback_loop_task = asyncio.create_task(self._callback_loop())
 
     def _cancel_callbacks(self) -> None:
         """Cancel the callback loop and all existing callback tasks."""
@@ -621,11 +1041,48 @@ class ReadTopic(BaseTopic):
             task = self._callback_tasks.pop()
             task.cancel()
 
+    def _close_decimator(self) -> None:
+        """Close the decimator, if any, and accumulate its drop count."""
+        if self._decimator is None:
+            return
+        self._decimator.close()
+        self._num_decimated += self._decimator.num_dropped
+        self._decimator = None
+
+    def _call_callback(
+        self, data: type_hints.BaseMsgType
+    ) -> _BasicReturnType | Awaitable[_BasicReturnType]:
+        """Call the callback function, or schedule it to run
+        in `callback_executor`, and return the result.
+        """
+        if self._callback_executor is not None:
+            return self._call_callback_in_executor(data)
+        # mypy gets upset because self._callback may be None
+        # but it's too expensive to check that
+        return self._callback(data)  # type: ignore
+
+    async def _call_callback_in_executor(
+        self, data: type_hints.BaseMsgType
+    ) -> _BasicReturnType:
+        """Run the callback function in `callback_executor`."""
+        executor = self._callback_executor
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            # Messages cannot be pickled, because their class
+            # is created at runtime; send a dict instead.
+            payload: typing.Any = get_data_dict(data).copy()
+        else:
+            payload = data
+        self._executor_queue_depth += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, self._callback, payload  # type: ignore
+            )
+        finally:
+            self._executor_queue_depth -= 1
+
     async def _run_callback(self, data: type_hints.BaseMsgType) -> None:
         try:
-            # mypy gets upset because self._callback may be None
-            # but it's too expensive to check that
-            result = self._callback(data)  # type: ignore
+            result = self._call_callback(data)
             if inspect.isawaitable(result):
                 await result  # type: ignore
         except asyncio.CancelledError:
@@ -644,6 +1101,26 @@ class ReadTopic(BaseTopic):
 
         Also update ``self._current_data`` and fire `self._next_task`
         (if pending).
+
+        Messages rejected by `message_filter` are discarded,
+        then the remaining messages are decimated, if `set_max_rate`
+        has set a maximum rate.
+        """
+        if not data_list:
+            return
+        if self._message_filter is not None:
+            num_messages = len(data_list)
+            data_list = [data for data in data_list if self._message_filter(data)]
+            self._num_filtered += num_messages - len(data_list)
+        if self._decimator is not None:
+            data_list = self._decimator.decimate(data_list)
+        self._queue_kept_data(data_list)
+
+    def _queue_kept_data(self, data_list: Collection[type_hints.BaseMsgType]) -> None:
+        """Queue messages that have passed filtering and decimation.
+
+        Also update ``self._current_data``, fire `self._next_task`
+        (if pending), and check the predicates of `wait_for` callers.
         """
         if not data_list:
             return
@@ -651,6 +1128,29 @@ class ReadTopic(BaseTopic):
             self._queue_one_item(data)
         self._current_data = data
         self._report_next()
+        if self._waiters:
+            self._check_waiters(data_list)
+
+    def _check_waiters(self, data_list: Collection[type_hints.BaseMsgType]) -> None:
+        """Check new messages against the predicates of `wait_for` callers.
+
+        Waiters that match (or whose predicate raises) are removed.
+        """
+        for waiter, predicate in list(self._waiters.items()):
+            if waiter.done():
+                del self._waiters[waiter]
+                continue
+            for data in data_list:
+                try:
+                    is_match = predicate(data)
+                except Exception as e:
+                    waiter.set_exception(e)
+                    del self._waiters[waiter]
+                    break
+                if is_match:
+                    waiter.set_result(data)
+                    del self._waiters[waiter]
+                    break
 
     def _queue_one_item(self, data: type_hints.BaseMsgType) -> None:
         """Add a single message to the Python queue.
@@ -669,3 +1169,4 @@ class ReadTopic(BaseTopic):
             oldest_message = self._data_queue.popleft()
             self._next_task.set_result(oldest_message)
         self._new_data_event.set()
+        self._callback_data_event.set()
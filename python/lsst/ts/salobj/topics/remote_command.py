@@ -25,10 +25,11 @@ __all__ = ["AckCmdReader", "CommandInfo", "RemoteCommand"]
 
 import asyncio
 import collections
+import contextlib
 import logging
 import random
-import time
 import typing
+from collections.abc import AsyncGenerator, Iterable
 
 from lsst.ts.xml import sal_enums, type_hints
 
@@ -55,6 +56,10 @@ class AckCmdReader(read_topic.ReadTopic):
     -----
     The same ``ackcmd`` topic is used for all command topics from a given
     SAL component.
+
+    Most ackcmd messages for other commanders are ignored by `SalInfo`
+    before they are decoded, based on Kafka message headers;
+    `_queue_one_item` ignores the rest.
     """
 
     def __init__(
@@ -104,8 +109,16 @@ class CommandInfo:
         self.seq_num = int(seq_num)
         self.wait_done = bool(wait_done)
 
-        self._wait_task: asyncio.Future = asyncio.Future()
         self._next_ack_event = asyncio.Event()
+        # Entry in the salinfo's heap of acknowledgement deadlines, if any;
+        # managed by `SalInfo._set_ack_deadline`.
+        self._ack_deadline_entry: list[typing.Any] | None = None
+        # Set by `_expire` when the deadline passes.
+        self._timed_out = False
+        # Set by `close`.
+        self._closed = False
+        # Number of calls waiting for acknowledgements.
+        self._num_waiters = 0
 
         self.done_ack_codes = frozenset(
             (
@@ -162,8 +175,57 @@ class CommandInfo:
         return isdone
 
     def close(self) -> None:
-        """Stop pending tasks."""
-        self._wait_task.cancel()
+        """Stop waiting for acknowledgements.
+
+        `next_ackcmd` raises `asyncio.CancelledError`.
+        """
+        self._closed = True
+        self.remote_command.salinfo._set_ack_deadline(self, None)
+        self._next_ack_event.set()
+
+    def _expire(self) -> None:
+        """Report that the deadline has passed, or that the command
+        was evicted from the running commands.
+
+        Called by `SalInfo`. `next_ackcmd` raises `AckTimeoutError`.
+        If nothing is waiting for an acknowledgement then stop
+        tracking the command.
+        """
+        self._timed_out = True
+        salinfo = self.remote_command.salinfo
+        if (
+            self._num_waiters == 0
+            and salinfo._remove_running_cmd(self.seq_num) is not None
+        ):
+            salinfo.num_expired_cmds += 1
+        self._next_ack_event.set()
+
+    def _start_waiting(self, deadline: float) -> None:
+        """Start waiting for acknowledgements, with the specified deadline
+        (an event loop time).
+        """
+        salinfo = self.remote_command.salinfo
+        self._num_waiters += 1
+        if self.seq_num in salinfo._running_cmds:
+            # Otherwise the command is done, or was expired or evicted,
+            # and the flag is left alone.
+            self._timed_out = False
+        salinfo._set_ack_deadline(self, deadline)
+
+    def _stop_waiting(self) -> None:
+        """Stop waiting for acknowledgements.
+
+        If the command is still running then restore the retention deadline,
+        so the command is forgotten if nothing waits for it again.
+        """
+        salinfo = self.remote_command.salinfo
+        self._num_waiters -= 1
+        if self._num_waiters == 0 and self.seq_num in salinfo._running_cmds:
+            salinfo._set_ack_deadline(
+                self, salinfo.loop.time() + salinfo.running_cmd_retention
+            )
+        else:
+            salinfo._set_ack_deadline(self, None)
 
     async def next_ackcmd(
         self, timeout: float = DEFAULT_TIMEOUT
@@ -198,44 +260,116 @@ class CommandInfo:
             If the command fails.
         AckTimeoutError
             If the command acknowledgement does not arrive in time.
+        asyncio.CancelledError
+            If cancelled, in which case the command is no longer tracked.
         """
         try:
-            self._wait_task = asyncio.create_task(
-                self._basic_next_ackcmd(timeout=timeout)
-            )
-            ackcmd = await self._wait_task
+            ackcmd = await self._basic_next_ackcmd(timeout=timeout)
             if ackcmd.ack in self.failed_ack_codes:
                 raise base.AckError(msg="Command failed", ackcmd=ackcmd)
             return ackcmd
         except asyncio.TimeoutError:
-            if self._last_ackcmd is None:
-                last_ackcmd = self.remote_command.salinfo.make_ackcmd(
-                    private_seqNum=self.seq_num,
-                    ack=sal_enums.SalRetCode.CMD_NOACK,
-                    result="No command acknowledgement seen",
-                )
-            else:
-                last_ackcmd = self._last_ackcmd
+            raise self._make_timeout_error()
+        except asyncio.CancelledError:
+            self.remote_command.salinfo._remove_running_cmd(self.seq_num)
+            raise
+
+    async def ackcmds(
+        self, timeout: float = DEFAULT_TIMEOUT
+    ) -> AsyncGenerator[type_hints.AckCmdDataType, None]:
+        """Iterate over all remaining command acknowledgements,
+        ending with the final acknowledgement.
+
+        Unlike `next_ackcmd` this ignores ``wait_done``,
+        and it does not create a task for each acknowledgement.
 
-            if self.seq_num in self.remote_command.salinfo._running_cmds:
-                self.remote_command.salinfo._running_cmds.pop(self.seq_num)
-            raise base.AckTimeoutError(
-                msg="Timed out waiting for command acknowledgement", ackcmd=last_ackcmd
+        Parameters
+        ----------
+        timeout : `float`, optional
+            Time limit for the command to finish, in seconds.
+            Extended by ``CMD_INPROGRESS`` acknowledgements,
+            as for `next_ackcmd`.
+
+        Yields
+        ------
+        ackcmd : `SalInfo.AckCmdType`
+            Command acknowledgement.
+
+        Raises
+        ------
+        AckError
+            If the command fails (instead of yielding the final ack).
+        AckTimeoutError
+            If the command does not finish in time.
+
+        Notes
+        -----
+        The command stops being tracked when the generator finishes.
+        If you may stop iterating early, close the generator explicitly,
+        e.g. with `contextlib.aclosing`; otherwise the command remains
+        tracked until the generator is garbage collected::
+
+            async with contextlib.aclosing(cmd_info.ackcmds()) as ackcmds:
+                async for ackcmd in ackcmds:
+                    if ackcmd.ack == SalRetCode.CMD_INPROGRESS:
+                        break
+        """
+        salinfo = self.remote_command.salinfo
+        deadline = salinfo.loop.time() + timeout
+        self._start_waiting(deadline)
+        try:
+            while True:
+                try:
+                    ackcmd = await self._get_next_ackcmd()
+                except asyncio.TimeoutError:
+                    raise self._make_timeout_error()
+                if ackcmd.ack in self.failed_ack_codes:
+                    raise base.AckError(msg="Command failed", ackcmd=ackcmd)
+                if ackcmd.ack == sal_enums.SalRetCode.CMD_INPROGRESS:
+                    deadline += ackcmd.timeout
+                    salinfo._set_ack_deadline(self, deadline)
+                yield ackcmd
+                if ackcmd.ack in self.done_ack_codes:
+                    return
+        finally:
+            self._stop_waiting()
+            salinfo._remove_running_cmd(self.seq_num)
+
+    def _make_timeout_error(self) -> base.AckTimeoutError:
+        """Stop tracking this command and make an `AckTimeoutError`."""
+        if self._last_ackcmd is None:
+            last_ackcmd = self.remote_command.salinfo.make_ackcmd(
+                private_seqNum=self.seq_num,
+                ack=sal_enums.SalRetCode.CMD_NOACK,
+                result="No command acknowledgement seen",
             )
+        else:
+            last_ackcmd = self._last_ackcmd
+
+        self.remote_command.salinfo._remove_running_cmd(self.seq_num)
+        return base.AckTimeoutError(
+            msg="Timed out waiting for command acknowledgement", ackcmd=last_ackcmd
+        )
 
     async def _basic_next_ackcmd(self, timeout: float) -> type_hints.AckCmdDataType:
-        """Basic implementation of next_ackcmd."""
-        t0 = time.monotonic()
-        elapsed_time: float = 0
-        while True:
-            ackcmd = await asyncio.wait_for(
-                self._get_next_ackcmd(), timeout=timeout - elapsed_time
-            )
-            if not self.wait_done or ackcmd.ack in self.done_ack_codes:
-                return ackcmd
-            if ackcmd.ack == sal_enums.SalRetCode.CMD_INPROGRESS:
-                timeout += ackcmd.timeout
-            elapsed_time = time.monotonic() - t0
+        """Basic implementation of next_ackcmd.
+
+        The deadline is tracked by the salinfo, which calls `_expire`
+        if it passes.
+        """
+        salinfo = self.remote_command.salinfo
+        deadline = salinfo.loop.time() + timeout
+        self._start_waiting(deadline)
+        try:
+            while True:
+                ackcmd = await self._get_next_ackcmd()
+                if not self.wait_done or ackcmd.ack in self.done_ack_codes:
+                    return ackcmd
+                if ackcmd.ack == sal_enums.SalRetCode.CMD_INPROGRESS:
+                    deadline += ackcmd.timeout
+                    salinfo._set_ack_deadline(self, deadline)
+        finally:
+            self._stop_waiting()
 
     async def _get_next_ackcmd(self) -> type_hints.AckCmdDataType:
         """Get the next ackcmd sample.
@@ -244,6 +378,13 @@ class CommandInfo:
         -------
         ackcmd : `SalInfo.AckCmdType`
             Next ackcmd sample.
+
+        Raises
+        ------
+        asyncio.CancelledError
+            If `close` was called.
+        asyncio.TimeoutError
+            If the deadline passed before an ackcmd sample arrived.
         """
         # note: set self._last_ackcmd here instead of in add_ackcmd
         # because it reduces or eliminates a race condition where a new
@@ -253,6 +394,10 @@ class CommandInfo:
                 ackcmd = self._ack_queue.popleft()
                 self._last_ackcmd = ackcmd
                 return ackcmd
+            if self._closed:
+                raise asyncio.CancelledError()
+            if self._timed_out:
+                raise asyncio.TimeoutError()
             await self._next_ack_event.wait()
             self._next_ack_event.clear()
 
@@ -475,6 +620,89 @@ class RemoteCommand(write_topic.WriteTopic):
         TypeError
             If ``data`` is not None and not an instance of `DataType`.
         """
+        cmd_info = await self._send(data=data, wait_done=wait_done)
+        return await cmd_info.next_ackcmd(timeout=timeout)
+
+    async def start_stream(
+        self,
+        data: type_hints.BaseMsgType | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> AsyncGenerator[type_hints.AckCmdDataType, None]:
+        """Start a command and iterate over its acknowledgements.
+
+        The command is sent when iteration begins. Iteration ends after
+        the final acknowledgement. If you stop iterating early,
+        close the generator (see the example below); later
+        acknowledgements of the command are then ignored.
+
+        Parameters
+        ----------
+        data : ``self.DataType``, optional
+            Command message. If `None` then send the current ``self.data``.
+        timeout : `float`, optional
+            Time limit for the command to finish, in seconds.
+            See `start` for details.
+
+        Yields
+        ------
+        ackcmd : `SalInfo.AckCmdType`
+            Command acknowledgement.
+
+        Raises
+        ------
+        lsst.ts.salobj.AckError
+            If the command fails (instead of yielding the final ack).
+        lsst.ts.salobj.AckTimeoutError
+            If the command times out.
+        RuntimeError
+            If ``self.salinfo`` is not running.
+        TypeError
+            If ``data`` is not None and not an instance of `DataType`.
+
+        Notes
+        -----
+        For example, to display the progress of a command::
+
+            async for ackcmd in remote.cmd_move.start_stream(data):
+                print(ackcmd.ack, ackcmd.result)
+
+        Breaking out of ``async for`` does not close the generator,
+        so the command remains tracked (and its deadline armed)
+        until the generator is garbage collected. If you may stop early,
+        use `contextlib.aclosing` to stop tracking the command at once::
+
+            async with contextlib.aclosing(
+                remote.cmd_move.start_stream(data)
+            ) as ackcmds:
+                async for ackcmd in ackcmds:
+                    if ackcmd.ack == SalRetCode.CMD_INPROGRESS:
+                        break
+        """
+        cmd_info = await self._send(data=data, wait_done=True)
+        # Close the inner generator when this one is closed,
+        # so the command stops being tracked at once.
+        async with contextlib.aclosing(cmd_info.ackcmds(timeout=timeout)) as ackcmds:
+            async for ackcmd in ackcmds:
+                yield ackcmd
+
+    async def _send(
+        self, data: type_hints.BaseMsgType | None, wait_done: bool
+    ) -> CommandInfo:
+        """Send a command without waiting for acknowledgement.
+
+        Parameters
+        ----------
+        data : ``self.DataType``, optional
+            Command message. If `None` then send the current ``self.data``.
+        wait_done : `bool`
+            Wait for the final acknowledgement?
+
+        Returns
+        -------
+        cmd_info : `CommandInfo`
+            Information for the command, which has been added
+            to the running commands.
+        """
         self.salinfo.assert_running()
 
         try:
@@ -484,25 +712,167 @@ class RemoteCommand(write_topic.WriteTopic):
             # else use the existing data, since it may have been set
             # via a call to "set"
 
-            data = self._prepare_data_to_write()
+            data_dict = self._prepare_data_to_write()
 
-            seq_num = data.private_seqNum
-            if seq_num in self.salinfo._running_cmds:
-                raise RuntimeError(
-                    f"{self.attr_name} a command with seq_num={seq_num} is already running. "
-                    "This may indicate a bug in ts_salobj SalInfo or RemoteCommand."
-                )
             cmd_info = CommandInfo(
-                remote_command=self, seq_num=seq_num, wait_done=wait_done
-            )
-            self.salinfo._running_cmds[seq_num] = cmd_info
-            await self.salinfo.write_data(
-                topic_info=self.topic_info, data_dict=vars(data)
+                remote_command=self,
+                seq_num=data_dict["private_seqNum"],
+                wait_done=wait_done,
             )
+            self.salinfo._add_running_cmd(cmd_info)
+            try:
+                await self.salinfo.write_data(
+                    topic_info=self.topic_info, data_dict=data_dict
+                )
+            except BaseException:
+                self.salinfo._remove_running_cmd(cmd_info.seq_num)
+                raise
         finally:
             self._in_start = False
+        return cmd_info
 
-        return await cmd_info.next_ackcmd(timeout=timeout)
+    async def start_many(
+        self,
+        data_list: Iterable[type_hints.BaseMsgType],
+        timeout: float = DEFAULT_TIMEOUT,
+        wait_done: bool = True,
+        max_in_flight: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[type_hints.AckCmdDataType | BaseException]:
+        """Start many commands, pipelining them, and wait for them all.
+
+        Commands are written in order, in batches: each batch is handed
+        to the Kafka producer at once, without waiting for acknowledgements
+        of earlier commands. Sequence numbers are assigned as for `start`.
+
+        Parameters
+        ----------
+        data_list : `collections.abc.Iterable` [``self.DataType``]
+            Command messages.
+        timeout : `float`, optional
+            Time limit for each command, in seconds, measured from the time
+            the command is sent. See `start` for details.
+        wait_done : `bool`, optional
+            If True then wait for the final acknowledgement of each command.
+            If False then wait only for the first acknowledgement.
+        max_in_flight : `int` | `None`, optional
+            The maximum number of commands that may be running at once.
+            If None then send all commands in one batch.
+        return_exceptions : `bool`, optional
+            If False then raise the first exception, after stopping
+            the other commands (commands already sent cannot be cancelled;
+            their acknowledgements are ignored).
+            If True then return exceptions as results, as does
+            `asyncio.gather`.
+
+        Returns
+        -------
+        ackcmds : `list` [`SalInfo.AckCmdType` | `BaseException`]
+            The command acknowledgement (or exception, if
+            ``return_exceptions`` is true) for each command,
+            in the same order as ``data_list``.
+
+        Raises
+        ------
+        lsst.ts.salobj.AckError
+            If a command fails and ``return_exceptions`` is false.
+        lsst.ts.salobj.AckTimeoutError
+            If a command times out and ``return_exceptions`` is false.
+        RuntimeError
+            If ``self.salinfo`` is not running.
+        TypeError
+            If an item in ``data_list`` is not an instance of `DataType`.
+        ValueError
+            If ``max_in_flight`` < 1.
+        """
+        self.salinfo.assert_running()
+        data_list = list(data_list)
+        if max_in_flight is None:
+            max_in_flight = max(len(data_list), 1)
+        elif max_in_flight < 1:
+            raise ValueError(f"max_in_flight={max_in_flight} must be None or >= 1")
+
+        results: list[typing.Any] = [None] * len(data_list)
+        # Dict of task: (index in data_list, seq_num)
+        pending: dict[asyncio.Future, tuple[int, int]] = dict()
+        next_index = 0
+        try:
+            while next_index < len(data_list) or pending:
+                num_to_start = min(
+                    max_in_flight - len(pending), len(data_list) - next_index
+                )
+                if num_to_start > 0:
+                    cmd_infos = await self._start_batch(
+                        data_list[next_index : next_index + num_to_start],
+                        wait_done=wait_done,
+                    )
+                    for i, cmd_info in enumerate(cmd_infos, start=next_index):
+                        task = asyncio.create_task(
+                            cmd_info.next_ackcmd(timeout=timeout)
+                        )
+                        pending[task] = (i, cmd_info.seq_num)
+                    next_index += num_to_start
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    i, _ = pending.pop(task)
+                    exception = task.exception()
+                    if exception is None:
+                        results[i] = task.result()
+                    elif return_exceptions:
+                        results[i] = exception
+                    else:
+                        raise exception
+        finally:
+            for task, (_, seq_num) in pending.items():
+                task.cancel()
+                self.salinfo._remove_running_cmd(seq_num)
+        return results
+
+    async def _start_batch(
+        self, data_list: list[type_hints.BaseMsgType], wait_done: bool
+    ) -> list[CommandInfo]:
+        """Send a batch of commands without waiting for acknowledgement.
+
+        Parameters
+        ----------
+        data_list : `list` [``self.DataType``]
+            Command messages.
+        wait_done : `bool`
+            Wait for the final acknowledgement of each command?
+
+        Returns
+        -------
+        cmd_infos : `list` [`CommandInfo`]
+            Information for each command, which has been added
+            to the running commands.
+        """
+        cmd_infos: list[CommandInfo] = []
+        data_dicts: list[dict[str, typing.Any]] = []
+        try:
+            self._in_start = True
+            for data in data_list:
+                self.data = data
+                data_dict = self._prepare_data_to_write()
+                cmd_info = CommandInfo(
+                    remote_command=self,
+                    seq_num=data_dict["private_seqNum"],
+                    wait_done=wait_done,
+                )
+                self.salinfo._add_running_cmd(cmd_info)
+                cmd_infos.append(cmd_info)
+                data_dicts.append(data_dict)
+            await self.salinfo.write_data_batch(
+                topic_info=self.topic_info, data_dicts=data_dicts
+            )
+        except BaseException:
+            for cmd_info in cmd_infos:
+                self.salinfo._remove_running_cmd(cmd_info.seq_num)
+            raise
+        finally:
+            self._in_start = False
+        return cmd_infos
 
     async def set_write(
         self, *, force_output: bool | None = None, **kwargs: typing.Any
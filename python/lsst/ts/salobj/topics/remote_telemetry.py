@@ -26,6 +26,7 @@ __all__ = ["RemoteTelemetry"]
 import typing
 
 from . import read_topic
+from .decimator import DecimationMode
 
 if typing.TYPE_CHECKING:
     from ..sal_info import SalInfo
@@ -42,6 +43,12 @@ class RemoteTelemetry(read_topic.ReadTopic):
         Telemetry topic name, with no prefix.
     queue_len : `int`, optional
         Number of elements that can be queued for `get_oldest`.
+    max_rate_hz : `float` | `None`, optional
+        Maximum rate at which to queue messages (Hz),
+        or `None` for no limit. See `ReadTopic.set_max_rate`.
+    decimation_mode : `DecimationMode`, optional
+        Which message to queue for each interval, if ``max_rate_hz``
+        is not `None`.
     """
 
     def __init__(
@@ -49,6 +56,8 @@ class RemoteTelemetry(read_topic.ReadTopic):
         salinfo: SalInfo,
         name: str,
         queue_len: int = read_topic.DEFAULT_QUEUE_LEN,
+        max_rate_hz: float | None = None,
+        decimation_mode: DecimationMode = DecimationMode.LATEST,
     ) -> None:
         super().__init__(
             salinfo=salinfo,
@@ -56,3 +65,5 @@ class RemoteTelemetry(read_topic.ReadTopic):
             max_history=0,
             queue_len=queue_len,
         )
+        if max_rate_hz is not None:
+            self.set_max_rate(max_rate_hz=max_rate_hz, mode=decimation_mode)
@@ -26,13 +26,13 @@ __all__ = ["MAX_SEQ_NUM", "SetWriteResult", "WriteTopic"]
 import copy
 import dataclasses
 import typing
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 
 import numpy as np
 from lsst.ts import utils
 from lsst.ts.xml import type_hints
 
-from .base_topic import BaseTopic
+from .base_topic import BaseTopic, get_data_dict
 
 if typing.TYPE_CHECKING:
     from ..sal_info import SalInfo
@@ -46,6 +46,38 @@ if typing.TYPE_CHECKING:
 # increment it (with wraparound) for each data point.
 MAX_SEQ_NUM = (1 << 31) - 1
 
+# A function that receives the old value and new value of a field
+# and returns True if the value changed.
+_ComparatorType = Callable[[typing.Any, typing.Any], bool]
+
+
+def _scalar_changed(old_value: typing.Any, new_value: typing.Any) -> bool:
+    """Did a non-float scalar change?"""
+    return bool(old_value != new_value)
+
+
+def _float_changed(old_value: typing.Any, new_value: typing.Any) -> bool:
+    """Did a float scalar change? NaN is considered equal to NaN."""
+    return bool(old_value != new_value) and not (
+        old_value != old_value and new_value != new_value
+    )
+
+
+def _array_changed(old_value: typing.Any, new_value: typing.Any) -> bool:
+    """Did a non-float array change?"""
+    if type(old_value) is list and type(new_value) is list:
+        return old_value != new_value
+    return not np.array_equal(old_value, new_value)
+
+
+def _float_array_changed(old_value: typing.Any, new_value: typing.Any) -> bool:
+    """Did a float array change? NaN is considered equal to NaN."""
+    # Comparing lists is fast, but only reliable for "equal"
+    # because NaN != NaN (unless the two NaNs are the same object).
+    if type(old_value) is list and type(new_value) is list and old_value == new_value:
+        return False
+    return not np.array_equal(old_value, new_value, equal_nan=True)
+
 
 @dataclasses.dataclass
 class SetWriteResult:
@@ -127,18 +159,28 @@ class WriteTopic(BaseTopic):
             )
         self._has_data = False
         self._data = self.DataType()
-        # Record which field names are float, double or array of either,
-        # to make it easy to compare float fields with nan equal.
-        self._float_field_names = set()
-        for name, value in vars(self._data).items():
+        # Is self._data also held by the caller of `set_write`?
+        # If so, it is copied before it is next modified in place.
+        self._data_shared = False
+        # Dict of field name: function to determine if the value changed,
+        # chosen by the kind of field, so that `set` can quickly compare
+        # old and new values, with float NaNs considered equal.
+        self._field_comparators: dict[str, _ComparatorType] = dict()
+        for name, value in get_data_dict(self._data).items():
             if isinstance(value, list):
                 # In our SAL schemas arrays are fixed length
                 # and must contain at least one element.
-                elt = value[0]
+                is_float = isinstance(value[0], float)
+                comparator = _float_array_changed if is_float else _array_changed
             else:
-                elt = value
-            if isinstance(elt, float):
-                self._float_field_names.add(name)
+                is_float = isinstance(value, float)
+                comparator = _float_changed if is_float else _scalar_changed
+            self._field_comparators[name] = comparator
+        # Dict of array field name: dtype, if numpy_arrays true, else None.
+        self._array_dtypes: dict[str, np.dtype] | None = None
+        # Should `write` return without waiting for the message to be
+        # handed to the Kafka producer? Only supported for telemetry.
+        self._unacknowledged = False
 
         salinfo.add_writer(self)
 
@@ -163,6 +205,7 @@ class WriteTopic(BaseTopic):
         if not isinstance(data, self.DataType):
             raise TypeError(f"data={data!r} must be an instance of {self.DataType}")
         self._data = data
+        self._data_shared = False
         self._has_data = True
 
     @property
@@ -174,6 +217,44 @@ class WriteTopic(BaseTopic):
         """
         return self._has_data
 
+    @property
+    def numpy_arrays(self) -> bool:
+        """Are array fields of `data` stored as `numpy.ndarray`?
+
+        If False (the default) array fields are stored as provided
+        (lists, unless you set them to arrays).
+        If True `set` converts array field values to numpy arrays
+        with the dtype specified by the topic schema
+        (without copying values that are already such arrays),
+        and setting this true converts the array fields of `data`.
+        Setting this false converts array fields of `data` that are
+        numpy arrays back to lists.
+        This avoids repeated conversions when comparing new values
+        to old values in `set`, which is helpful for topics
+        with large arrays.
+
+        Messages may be written with either representation.
+        """
+        return self._array_dtypes is not None
+
+    @numpy_arrays.setter
+    def numpy_arrays(self, numpy_arrays: bool) -> None:
+        if numpy_arrays == self.numpy_arrays:
+            return
+        array_dtypes = self.get_array_dtypes()
+        # Replace the message rather than modifying it in place,
+        # in case it is shared with the caller of `set_write`.
+        data_dict = self._copy_data_dict()
+        for name, dtype in array_dtypes.items():
+            value = data_dict[name]
+            if numpy_arrays:
+                data_dict[name] = np.asarray(value, dtype=dtype)
+            elif isinstance(value, np.ndarray):
+                data_dict[name] = value.tolist()
+        self._data = self.DataType(**data_dict)
+        self._data_shared = False
+        self._array_dtypes = array_dtypes if numpy_arrays else None
+
     def basic_close(self) -> None:
         """A synchronous and possibly less thorough version of `close`.
 
@@ -210,7 +291,8 @@ class WriteTopic(BaseTopic):
             * Any key whose value is `None` is checked for existence,
               but the value of the field is not changed.
             * If the field being set is an array then the value must be
-              an array of the same length.
+              an array of the same length. It may be a list or a
+              `numpy.ndarray`; see `numpy_arrays` for details.
 
         Returns
         -------
@@ -234,8 +316,12 @@ class WriteTopic(BaseTopic):
         did_change = not self.has_data
 
         # Set a copy of the data, in case any of the data is invalid.
-        data_dict = vars(self.data)
-        unknown_fields = kwargs.keys() - data_dict.keys()
+        # A message with a __dict__ is modified in place, unless the
+        # message is shared with the caller of `set_write`.
+        data_dict = (
+            self._copy_data_dict() if self._data_shared else get_data_dict(self.data)
+        )
+        unknown_fields = kwargs.keys() - self._field_comparators.keys()
         if unknown_fields:
             raise AttributeError(
                 f"{self.attr_name} has no fields {sorted(unknown_fields)}"
@@ -248,17 +334,18 @@ class WriteTopic(BaseTopic):
                 # Keep the old value
                 continue
 
+            if self._array_dtypes is not None and field_name in self._array_dtypes:
+                try:
+                    value = np.asarray(value, dtype=self._array_dtypes[field_name])
+                except Exception as e:
+                    raise TypeError(
+                        f"Cannot set {self.attr_name}.{field_name}={value!r}; wrong type."
+                    ) from e
+
             old_value = data_dict[field_name]
             if not did_change:
                 try:
-                    # array_equal works for sequences of all kinds,
-                    # as well as strings and scalars
-                    is_float = field_name in self._float_field_names
-                    did_change |= not np.array_equal(
-                        old_value,
-                        value,
-                        equal_nan=is_float,  # type: ignore
-                    )
+                    did_change = self._field_comparators[field_name](old_value, value)
                 except Exception as e:
                     raise TypeError(
                         f"Cannot set {self.attr_name}.{field_name}={value!r}; wrong type."
@@ -266,6 +353,9 @@ class WriteTopic(BaseTopic):
             data_dict[field_name] = value
         # Check the data by creating a DataType, because no checking is done
         # when directly setting attributes of a dataclass.
+        # This is the only validation of the new values, so it is worth
+        # the allocation; `set_write` returns this message, rather than
+        # making another.
         self.data = self.DataType(**data_dict)
         return did_change
 
@@ -292,6 +382,9 @@ class WriteTopic(BaseTopic):
         -------
         result : `SetWriteResult`
             The resulting data and some flags.
+            The data is a shallow snapshot: it is not changed by later
+            calls to `set` or `write`, but array fields are shared
+            with `data`, so do not modify them in place.
 
         Notes
         -----
@@ -308,20 +401,41 @@ class WriteTopic(BaseTopic):
                 self.default_force_output if force_output is None else force_output
             )
         if do_output:
-            data = await self.write()
-        else:
-            data = self.data
-        return SetWriteResult(did_change=did_change, was_written=do_output, data=data)
-
-    async def write(self) -> type_hints.BaseMsgType:
+            await self.write(snapshot=False)
+        # Return self.data instead of a copy, and copy it before
+        # it is next modified in place.
+        self._data_shared = True
+        return SetWriteResult(
+            did_change=did_change, was_written=do_output, data=self.data
+        )
+
+    @typing.overload
+    async def write(
+        self, *, snapshot: typing.Literal[True] = ...
+    ) -> type_hints.BaseMsgType: ...
+
+    @typing.overload
+    async def write(self, *, snapshot: typing.Literal[False]) -> None: ...
+
+    async def write(self, *, snapshot: bool = True) -> type_hints.BaseMsgType | None:
         """Write the current data and return a copy of the data written.
 
+        Parameters
+        ----------
+        snapshot : `bool`, optional
+            Return a copy of the data written?
+            Specify False if you do not need the returned data, e.g. for
+            high-rate telemetry, to avoid constructing a new message.
+
         Returns
         -------
-        data : self.DataType
-            The data that was written.
-            This can be useful to avoid race conditions
-            (as found in RemoteCommand).
+        data : self.DataType | `None`
+            The data that was written, if ``snapshot`` true, else `None`.
+            This is a shallow copy of `data`: it is not changed
+            by later calls to `set` or `write`, which can be useful
+            to avoid race conditions (as found in RemoteCommand),
+            but array fields are shared with `data`,
+            so do not modify them in place.
 
         Raises
         ------
@@ -330,13 +444,16 @@ class WriteTopic(BaseTopic):
         """
         self.salinfo.assert_running()
 
-        data = self._prepare_data_to_write()
-        data_dict = vars(data)
-        await self.salinfo.write_data(topic_info=self.topic_info, data_dict=data_dict)
-        return data
+        data_dict = self._prepare_data_to_write()
+        await self.salinfo.write_data(
+            topic_info=self.topic_info,
+            data_dict=data_dict,
+            acknowledged=not self._unacknowledged,
+        )
+        return self.DataType(**data_dict) if snapshot else None
 
-    def _prepare_data_to_write(self) -> type_hints.BaseMsgType:
-        """Prepare self.data to be written and return a copy of the result.
+    def _prepare_data_to_write(self) -> dict[str, typing.Any]:
+        """Prepare self.data to be written and return a dict of the result.
 
         Set the following fields:
 
@@ -347,7 +464,15 @@ class WriteTopic(BaseTopic):
         * salIndex, if self.index is not 0
 
         Does not check self.salinfo.running
+
+        The returned dict is a (shallow) copy, so it is not affected
+        by later changes to self.data. It is suitable as input to
+        the serializer, and it avoids copying the message itself.
         """
+        if self._data_shared:
+            # Do not change the message returned by `set_write`.
+            self._data = copy.copy(self._data)
+            self._data_shared = False
         current_tai = utils.current_tai()
         self.data.private_sndStamp = current_tai
         self.data.private_efdStamp = utils.utc_from_tai_unix(current_tai)
@@ -362,4 +487,17 @@ class WriteTopic(BaseTopic):
         # and the user can override it.
         if self.salinfo.index != 0:
             self.data.salIndex = self.salinfo.index
-        return copy.copy(self.data)
+        return self._copy_data_dict()
+
+    def _copy_data_dict(self) -> dict[str, typing.Any]:
+        """Get a dict of field name: value for `data`
+        that is independent of `data`.
+
+        Only copies the dict if it is the message's ``__dict__``;
+        `get_data_dict` already returns a new dict for messages
+        that use ``__slots__``.
+        """
+        try:
+            return vars(self._data).copy()
+        except TypeError:
+            return get_data_dict(self._data)
@@ -0,0 +1,166 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import unittest
+
+import pytest
+from lsst.ts import salobj, utils
+
+index_gen = utils.index_generator()
+
+
+class CommandSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test CommandScheduler with commands of the Test component.
+
+    The commands are never read, so no Kafka broker is needed.
+    """
+
+    async def asyncSetUp(self) -> None:
+        salobj.set_test_topic_subname()
+        self.domain = salobj.Domain()
+        self.salinfo = salobj.SalInfo(
+            domain=self.domain, name="Test", index=next(index_gen)
+        )
+        self.scheduler = salobj.topics.CommandScheduler(max_concurrent=1)
+        # List of (command attr_name, index) in the order commands started.
+        self.started: list[tuple[str, int]] = []
+        # Event that allows running commands to finish.
+        self.finish_event = asyncio.Event()
+
+    async def asyncTearDown(self) -> None:
+        await self.salinfo.close()
+        await self.domain.close()
+
+    def make_command(self, name: str) -> salobj.topics.ControllerCommand:
+        """Make a controller command."""
+        return salobj.topics.ControllerCommand(salinfo=self.salinfo, name=name)
+
+    async def run_command(self, attr_name: str, index: int) -> None:
+        async with self.scheduler.reserve(attr_name):
+            self.started.append((attr_name, index))
+            await self.finish_event.wait()
+
+    def start_command(self, attr_name: str, index: int) -> asyncio.Task:
+        return asyncio.create_task(self.run_command(attr_name, index))
+
+    async def test_errors(self) -> None:
+        with pytest.raises(ValueError):
+            salobj.topics.CommandScheduler(max_concurrent=0)
+        with pytest.raises(ValueError):
+            self.scheduler.max_concurrent = 0
+        with pytest.raises(ValueError):
+            self.scheduler.add_command(self.make_command("wait"), max_concurrent=0)
+
+    async def test_add_command(self) -> None:
+        command = self.make_command("wait")
+        assert self.scheduler.get_policy("cmd_wait") is None
+        self.scheduler.add_command(command, priority=2, max_concurrent=None)
+        assert command.allow_multiple_callbacks
+        assert command.scheduler is self.scheduler
+        assert self.scheduler.get_policy("cmd_wait") == salobj.topics.CommandPolicy(
+            priority=2, max_concurrent=None, urgent=False
+        )
+
+    async def test_priority_and_urgent(self) -> None:
+        self.scheduler.add_command(self.make_command("wait"))
+        self.scheduler.add_command(self.make_command("setScalars"), priority=1)
+        self.scheduler.add_command(self.make_command("fault"), urgent=True)
+
+        tasks = [self.start_command("cmd_wait", i) for i in range(3)]
+        tasks.append(self.start_command("cmd_setScalars", 0))
+        # Commands that are not scheduled run immediately.
+        tasks.append(self.start_command("cmd_setArrays", 0))
+        await asyncio.sleep(0)
+        assert self.started == [("cmd_wait", 0), ("cmd_setArrays", 0)]
+        assert self.scheduler.num_running == 1
+        assert self.scheduler.num_queued == 3
+        assert self.scheduler.queue_depths == dict(cmd_wait=2, cmd_setScalars=1)
+        assert self.scheduler.max_queue_depth == 3
+
+        # An urgent command runs immediately, despite the backlog.
+        tasks.append(self.start_command("cmd_fault", 0))
+        await asyncio.sleep(0)
+        assert self.started[-1] == ("cmd_fault", 0)
+        assert self.scheduler.num_running == 2
+
+        # The setScalars command jumps ahead of the queued wait commands.
+        self.finish_event.set()
+        await asyncio.gather(*tasks)
+        assert self.started[3:] == [
+            ("cmd_setScalars", 0),
+            ("cmd_wait", 1),
+            ("cmd_wait", 2),
+        ]
+        assert self.scheduler.num_running == 0
+        assert self.scheduler.num_queued == 0
+        assert self.scheduler.num_scheduled == 5
+
+    async def test_per_command_limit(self) -> None:
+        self.scheduler.max_concurrent = None
+        self.scheduler.add_command(self.make_command("wait"), max_concurrent=2)
+        self.scheduler.add_command(self.make_command("setLogLevel"), priority=-1)
+
+        tasks = [self.start_command("cmd_wait", i) for i in range(3)]
+        tasks.append(self.start_command("cmd_setLogLevel", 0))
+        await asyncio.sleep(0)
+        # A queued wait command, blocked by its own limit,
+        # does not block the lower priority setLogLevel command.
+        assert self.started == [
+            ("cmd_wait", 0),
+            ("cmd_wait", 1),
+            ("cmd_setLogLevel", 0),
+        ]
+        assert self.scheduler.queue_depths == dict(cmd_wait=1)
+
+        # Cancelling a queued command removes it from the queue.
+        tasks[2].cancel()
+        await asyncio.sleep(0)
+        assert self.scheduler.num_queued == 0
+        self.finish_event.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert len(self.started) == 3
+        assert self.scheduler.num_running == 0
+
+    async def test_raise_max_concurrent(self) -> None:
+        self.scheduler.add_command(self.make_command("wait"), max_concurrent=None)
+
+        tasks = [self.start_command("cmd_wait", i) for i in range(4)]
+        await asyncio.sleep(0)
+        assert self.started == [("cmd_wait", 0)]
+        assert self.scheduler.num_queued == 3
+
+        # Raising the limit starts queued commands right away,
+        # without waiting for a running command to finish.
+        self.scheduler.max_concurrent = 3
+        await asyncio.sleep(0)
+        assert self.started == [("cmd_wait", i) for i in range(3)]
+        assert self.scheduler.num_running == 3
+        assert self.scheduler.num_queued == 1
+
+        self.scheduler.max_concurrent = None
+        await asyncio.sleep(0)
+        assert self.started == [("cmd_wait", i) for i in range(4)]
+        assert self.scheduler.num_queued == 0
+
+        self.finish_event.set()
+        await asyncio.gather(*tasks)
+        assert self.scheduler.num_running == 0
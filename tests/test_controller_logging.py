@@ -164,3 +164,47 @@ class ControllerLoggingTestCase(
             assert msg.functionName != ""
             assert msg.lineNumber > 0
             assert msg.process == os.getpid()
+
+    async def test_log_rate_limit(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, config_dir=TEST_CONFIG_DIR
+        ):
+            handler = self.csc.sal_log_handler
+            await self.remote.evt_logLevel.next(flush=False, timeout=STD_TIMEOUT)
+            await asyncio.sleep(NO_DATA_TIMEOUT)
+            self.remote.evt_logMessage.flush()
+
+            # Identical messages logged in a burst are coalesced.
+            repeated_message = "repeated message"
+            for i in range(5):
+                self.csc.log.warning(repeated_message)
+            await self.assert_next_sample(
+                topic=self.remote.evt_logMessage,
+                message=f"{repeated_message} (message repeated 5 times)",
+            )
+            assert handler.num_coalesced == 4
+
+            # There is no rate limit by default.
+            assert handler.rate_limit is None
+
+            # Messages over the rate limit are dropped, and reported,
+            # but warnings are never rate limited.
+            handler.rate_limit = 1
+            handler.rate_burst = 3
+            for i in range(10):
+                self.csc.log.info(f"message {i}")
+            self.csc.log.warning("warning message")
+            for i in range(3):
+                await self.assert_next_sample(
+                    topic=self.remote.evt_logMessage, message=f"message {i}"
+                )
+            await self.assert_next_sample(
+                topic=self.remote.evt_logMessage, message="warning message"
+            )
+            msg = await self.remote.evt_logMessage.next(
+                flush=False, timeout=STD_TIMEOUT
+            )
+            assert msg.message.startswith("Dropped 7 log messages")
+            assert handler.num_rate_limited == 7
+            assert handler.num_dropped == 7
+            assert handler.num_queue_full == 0
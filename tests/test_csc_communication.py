@@ -175,6 +175,83 @@ class CommunicateTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCa
             await self.remote.evt_heartbeat.next(flush=False, timeout=timeout)
             await self.remote.evt_heartbeat.next(flush=False, timeout=timeout)
 
+            # Changing the interval reschedules the heartbeat.
+            heartbeat_interval = self.csc.heartbeat_interval / 2
+            self.csc.heartbeat_interval = heartbeat_interval
+            assert self.csc._heartbeat_callback is not None
+            assert self.csc._heartbeat_callback.interval == heartbeat_interval
+            with pytest.raises(ValueError):
+                self.csc.heartbeat_interval = 0
+            assert self.csc.heartbeat_interval == heartbeat_interval
+
+    async def test_read_latest_heartbeat(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.STANDBY):
+            await self.remote.evt_heartbeat.next(flush=True, timeout=STD_TIMEOUT)
+            await self.remote.evt_heartbeat.next(flush=False, timeout=STD_TIMEOUT)
+            with pytest.raises(ValueError):
+                await self.remote.salinfo.read_latest_data(
+                    "evt_heartbeat", num_messages=0
+                )
+
+            data_list = await self.remote.salinfo.read_latest_data(
+                "evt_heartbeat", num_messages=2, timeout=STD_TIMEOUT
+            )
+            assert len(data_list) == 2
+            assert data_list[0].private_sndStamp < data_list[1].private_sndStamp
+            for data in data_list:
+                assert data.salIndex == self.csc.salinfo.index
+                assert data.private_origin == self.csc.domain.origin
+
+            # A SalInfo with index 0 reads messages for all indices.
+            async with salobj.SalInfo(
+                domain=self.csc.domain, name="Test", index=0
+            ) as salinfo:
+                await salinfo.start()
+                data_list = await salinfo.read_latest_data(
+                    "evt_heartbeat", num_messages=1, timeout=STD_TIMEOUT
+                )
+                assert len(data_list) == 1
+
+            # The CSC's own heartbeat is not a duplicate.
+            assert await self.csc.check_for_duplicate_heartbeat() == 0
+
+    async def test_check_for_duplicate_heartbeat(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.STANDBY):
+            await self.remote.evt_heartbeat.next(flush=False, timeout=STD_TIMEOUT)
+            async with salobj.Domain() as domain, salobj.Controller(
+                name="Test",
+                index=self.csc.salinfo.index,
+                write_only=True,
+                domain=domain,
+            ) as other:
+                # Change origin so heartbeat private_origin differs.
+                domain.origin += 1
+
+                # The last heartbeat of a dead instance is not a duplicate,
+                # though it is recent.
+                await other.evt_heartbeat.write()  # type: ignore[attr-defined]
+                while True:
+                    data = await self.remote.evt_heartbeat.next(
+                        flush=False, timeout=STD_TIMEOUT
+                    )
+                    if data.private_origin == domain.origin:
+                        break
+                assert await self.csc.check_for_duplicate_heartbeat() == 0
+
+                # A live instance is a duplicate.
+                async def write_heartbeats() -> None:
+                    while True:
+                        await other.evt_heartbeat.write()  # type: ignore[attr-defined]
+                        await asyncio.sleep(self.csc.heartbeat_interval)
+
+                heartbeat_task = asyncio.create_task(write_heartbeats())
+                try:
+                    assert (
+                        await self.csc.check_for_duplicate_heartbeat() == domain.origin
+                    )
+                finally:
+                    heartbeat_task.cancel()
+
     async def test_bin_script_run(self) -> None:
         """Test running the Test CSC from the bin script.
 
@@ -0,0 +1,102 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import pathlib
+import typing
+import unittest
+
+from lsst.ts import salobj, utils
+
+index_gen = utils.index_generator()
+TEST_DATA_DIR = pathlib.Path(__file__).resolve().parent / "data"
+TEST_CONFIG_DIR = TEST_DATA_DIR / "configs" / "good_no_site_file"
+
+# Standard timeout (sec)
+# Long to avoid unnecessary timeouts on slow CI systems.
+STD_TIMEOUT = 60
+
+
+class CscHostTestCase(unittest.IsolatedAsyncioTestCase):
+    def run(self, result: typing.Any) -> None:  # type: ignore
+        """Override `run` to set a random LSST_TOPIC_SUBNAME
+        and set LSST_SITE=test for every test.
+        """
+        salobj.set_test_topic_subname()
+        with utils.modify_environ(LSST_SITE="test"):
+            super().run(result)
+
+    async def test_host(self) -> None:
+        async with salobj.CscHost() as host:
+            indices = [next(index_gen) for i in range(2)]
+            cscs = [
+                host.add_csc(
+                    salobj.TestCsc,
+                    index=index,
+                    config_dir=TEST_CONFIG_DIR,
+                    initial_state=salobj.State.ENABLED,
+                )
+                for index in indices
+            ]
+            # A CSC that cannot be constructed does not affect the others.
+            bad_index = next(index_gen)
+            assert (
+                host.add_csc(
+                    salobj.TestCsc, index=bad_index, initial_state=salobj.State.FAULT
+                )
+                is None
+            )
+            assert list(host.failures) == [f"TestCsc:{bad_index}"]
+            await host.start()
+            assert len(host.failures) == 1
+
+            csc0, csc1 = cscs
+            assert csc0 is not None and csc1 is not None
+            assert csc0.domain is host.domain
+            assert csc1.domain is host.domain
+            assert csc0.salinfo.pool is csc1.salinfo.pool
+            assert csc0.salinfo.component_info is csc1.salinfo.component_info
+            assert set(csc0.salinfo._producers.values()) == set(
+                csc1.salinfo._producers.values()
+            )
+            # The domain flushes the shared producers, not each SalInfo.
+            assert host.domain._shared_flush_task is not None
+            assert not host.domain._shared_flush_task.done()
+            assert csc0.salinfo._flush_loop_task.done()
+
+            remotes = [
+                salobj.Remote(domain=host.domain, name="Test", index=index)
+                for index in indices
+            ]
+            for remote in remotes:
+                await remote.start_task
+                await remote.cmd_setScalars.set_start(int0=5, timeout=STD_TIMEOUT)
+
+            # Closing one CSC does not affect the other.
+            await csc0.close()
+            assert not host.done_task.done()
+            await remotes[1].cmd_setScalars.set_start(int0=6, timeout=STD_TIMEOUT)
+            assert csc1.evt_scalars.data.int0 == 6
+
+            # The host is done when all CSCs are done.
+            host.signal_handler()
+            await host.done_task
+        assert not host.domain.isopen
@@ -0,0 +1,137 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import typing
+import unittest
+
+import numpy as np
+import pytest
+from lsst.ts import salobj
+
+# Maximum rate for the decimator (Hz).
+MAX_RATE = 10
+# Decimation interval (sec).
+INTERVAL = 1 / MAX_RATE
+
+
+class DecimatorTestCase(salobj.MessageTypesMixin, unittest.IsolatedAsyncioTestCase):
+    """Test Decimator with messages of Test topics."""
+
+    def setUp(self) -> None:
+        self.output_list: list[typing.Any] = []
+
+    def make_decimator(self, mode: salobj.topics.DecimationMode) -> None:
+        self.decimator = salobj.topics.Decimator(
+            max_rate_hz=MAX_RATE, mode=mode, output=self.output_list.extend
+        )
+
+    def test_constructor_errors(self) -> None:
+        for bad_max_rate in (0, -1):
+            with pytest.raises(ValueError):
+                salobj.topics.Decimator(
+                    max_rate_hz=bad_max_rate,
+                    mode=salobj.topics.DecimationMode.LATEST,
+                    output=self.output_list.extend,
+                )
+        with pytest.raises(ValueError):
+            salobj.topics.Decimator(
+                max_rate_hz=MAX_RATE, mode="bad", output=self.output_list.extend
+            )
+
+    async def test_first(self) -> None:
+        self.make_decimator(salobj.topics.DecimationMode.FIRST)
+        messages = [self.make_scalars(int0=i) for i in range(5)]
+        assert self.decimator.decimate(messages) == messages[0:1]
+        assert self.decimator.num_dropped == 4
+        await asyncio.sleep(INTERVAL * 2)
+        assert self.output_list == []
+        new_message = self.make_scalars(int0=5)
+        assert self.decimator.decimate([new_message]) == [new_message]
+        assert self.decimator.num_dropped == 4
+
+    async def test_latest(self) -> None:
+        self.make_decimator(salobj.topics.DecimationMode.LATEST)
+        messages = [self.make_scalars(int0=i) for i in range(5)]
+        assert self.decimator.decimate(messages) == messages[0:1]
+        assert self.output_list == []
+        assert self.decimator.num_dropped == 3
+        await asyncio.sleep(INTERVAL * 2)
+        assert self.output_list == messages[-1:]
+
+        # Messages for different SAL indices are decimated separately.
+        message1 = self.make_scalars(salIndex=1)
+        message2 = self.make_scalars(salIndex=2)
+        assert self.decimator.decimate([message1, message2]) == [message1, message2]
+
+        self.decimator.close()
+        assert self.decimator.decimate([self.make_scalars(salIndex=1)]) != []
+
+    async def test_mean(self) -> None:
+        self.make_decimator(salobj.topics.DecimationMode.MEAN)
+        messages = [
+            self.make_scalars(int0=int(i), float0=i, double0=i) for i in (1.0, 2.0, 6.0)
+        ]
+        assert self.decimator.decimate(messages) == []
+        assert self.decimator.num_dropped == 2
+        await asyncio.sleep(INTERVAL * 2)
+        assert len(self.output_list) == 1
+        data = self.output_list[0]
+        assert data is not messages[-1]
+        assert type(data) is type(messages[-1])
+        # Integer fields are from the latest message.
+        assert data.int0 == 6
+        assert data.float0 == pytest.approx(3)
+        assert data.double0 == pytest.approx(3)
+        # The input messages are not modified.
+        assert messages[-1].double0 == 6
+
+    async def test_mean_arrays(self) -> None:
+        self.make_decimator(salobj.topics.DecimationMode.MEAN)
+        num_elements = len(self.make_arrays().double0)
+        messages = [
+            self.make_arrays(
+                int0=[int(i)] * num_elements,
+                double0=[i, -i] + [0.0] * (num_elements - 2),
+                # As read by a topic with numpy_arrays true.
+                float0=np.full(num_elements, i, dtype=np.float32),
+            )
+            for i in (1.0, 2.0, 6.0)
+        ]
+        assert self.decimator.decimate(messages) == []
+        await asyncio.sleep(INTERVAL * 2)
+        assert len(self.output_list) == 1
+        data = self.output_list[0]
+        assert data.int0 == [6] * num_elements
+        assert isinstance(data.double0, list)
+        assert data.double0[0:2] == pytest.approx([3, -3])
+        assert data.float0.dtype == np.float32
+        np.testing.assert_allclose(data.float0, np.full(num_elements, 3))
+        # The input messages are not modified.
+        assert messages[-1].double0[0] == 6
+        np.testing.assert_allclose(messages[-1].float0, np.full(num_elements, 6))
+
+
+class FrozenDecimatorTestCase(DecimatorTestCase):
+    """Test Decimator with frozen messages that use ``__slots__``."""
+
+    slots = True
+    frozen = True
@@ -0,0 +1,126 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import unittest
+
+import pytest
+from lsst.ts import salobj
+
+
+class DeadbandFilterTestCase(salobj.MessageTypesMixin, unittest.TestCase):
+    """Test DeadbandFilter with messages of Test topics."""
+
+    def test_default(self) -> None:
+        """With no tolerances every change to a public field is significant,
+        but changes to private fields are not.
+        """
+        scalars_filter = salobj.topics.DeadbandFilter()
+        assert scalars_filter(self.make_scalars())
+        assert not scalars_filter(self.make_scalars())
+        assert not scalars_filter(self.make_scalars(private_sndStamp=1.0))
+        # A filter is for one topic.
+        arrays_filter = salobj.topics.DeadbandFilter()
+        for make_message, field_name, value in (
+            (self.make_scalars, "boolean0", True),
+            (self.make_scalars, "int0", 1),
+            (self.make_scalars, "double0", 1e-10),
+            (self.make_scalars, "string0", "a"),
+            (self.make_arrays, "double0", [0.0, 1e-10]),
+            (self.make_arrays, "int0", [0, 0, 1]),
+        ):
+            with self.subTest(
+                make_message=make_message.__name__, field_name=field_name
+            ):
+                message_filter = (
+                    scalars_filter
+                    if make_message == self.make_scalars
+                    else arrays_filter
+                )
+                message_filter.reset()
+                assert message_filter(make_message())
+                assert message_filter(make_message(**{field_name: value}))
+                assert not message_filter(make_message(**{field_name: value}))
+
+    def test_tolerances(self) -> None:
+        message_filter = salobj.topics.DeadbandFilter(
+            abs_tolerance=dict(double0=0.1),
+            ignore_fields=["int0"],
+        )
+        assert message_filter(self.make_scalars(double0=1.0))
+        assert not message_filter(self.make_scalars(double0=1.09, int0=5))
+        assert message_filter(self.make_scalars(double0=1.11))
+        # The comparison is to the last message kept,
+        # so slow drifts are eventually reported.
+        assert not message_filter(self.make_scalars(double0=1.2))
+        assert message_filter(self.make_scalars(double0=1.22))
+
+        message_filter = salobj.topics.DeadbandFilter(rel_tolerance=dict(double0=0.1))
+        assert message_filter(self.make_arrays(double0=[1.0, 2.0, 3.0]))
+        assert not message_filter(self.make_arrays(double0=[1.09, 2.19, 3.29]))
+        assert message_filter(self.make_arrays(double0=[1.0, 2.0, 3.31]))
+
+    def test_fields(self) -> None:
+        message_filter = salobj.topics.DeadbandFilter(
+            fields=["double0"], default_abs_tolerance=0.5
+        )
+        assert message_filter(self.make_scalars())
+        assert not message_filter(self.make_scalars(int0=1, string0="changed"))
+        assert not message_filter(self.make_scalars(double0=0.5))
+        assert message_filter(self.make_scalars(double0=0.6))
+
+        message_filter = salobj.topics.DeadbandFilter(fields=["no_such_field"])
+        with pytest.raises(AttributeError):
+            message_filter(self.make_scalars())
+        message_filter = salobj.topics.DeadbandFilter(
+            abs_tolerance=dict(no_such_field=1)
+        )
+        with pytest.raises(AttributeError):
+            message_filter(self.make_scalars())
+
+    def test_nan(self) -> None:
+        message_filter = salobj.topics.DeadbandFilter(default_abs_tolerance=1)
+        assert message_filter(self.make_scalars(double0=math.nan))
+        assert not message_filter(self.make_scalars(double0=math.nan))
+        assert message_filter(self.make_scalars(double0=0.0))
+        assert message_filter(self.make_scalars(double0=math.inf))
+        assert not message_filter(self.make_scalars(double0=math.inf))
+        assert message_filter(self.make_scalars(double0=-math.inf))
+
+        message_filter = salobj.topics.DeadbandFilter(default_abs_tolerance=1)
+        assert message_filter(self.make_arrays(double0=[math.nan]))
+        assert not message_filter(self.make_arrays(double0=[math.nan]))
+
+    def test_sal_index(self) -> None:
+        """Messages for different SAL indices are compared separately."""
+        message_filter = salobj.topics.DeadbandFilter()
+        assert message_filter(self.make_scalars(salIndex=1))
+        assert message_filter(self.make_scalars(salIndex=2))
+        assert not message_filter(self.make_scalars(salIndex=1))
+        assert message_filter(self.make_scalars(salIndex=1, int0=1))
+        assert not message_filter(self.make_scalars(salIndex=2))
+
+
+class FrozenDeadbandFilterTestCase(DeadbandFilterTestCase):
+    """Test DeadbandFilter with frozen messages that use ``__slots__``."""
+
+    slots = True
+    frozen = True
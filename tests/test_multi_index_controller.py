@@ -0,0 +1,118 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import typing
+import unittest
+
+import pytest
+from lsst.ts import salobj, utils
+from lsst.ts.xml import type_hints
+
+index_gen = utils.index_generator()
+
+# Standard timeout (sec)
+# Long to avoid unnecessary timeouts on slow CI systems.
+STD_TIMEOUT = 60
+# Timeout for commands that should not be acknowledged (sec).
+NO_DATA_TIMEOUT = 1
+
+
+class Handler(salobj.Controller):
+    """Handle the setScalars command for one index of Test."""
+
+    def __init__(self, index: int, domain: salobj.Domain) -> None:
+        super().__init__("Test", index=index, write_only=True, domain=domain)
+
+    async def do_setScalars(self, data: type_hints.BaseMsgType) -> None:
+        await self.evt_scalars.set_write(int0=data.int0)  # type: ignore
+
+
+class MultiIndexControllerTestCase(unittest.IsolatedAsyncioTestCase):
+    def run(self, result: typing.Any) -> None:  # type: ignore
+        """Override `run` to set a random LSST_TOPIC_SUBNAME
+        for every test.
+        """
+        salobj.set_test_topic_subname()
+        super().run(result)
+
+    async def test_dispatch(self) -> None:
+        indices = [next(index_gen) for i in range(2)]
+        async with salobj.MultiIndexController(
+            name="Test", indices=indices, handler_factory=Handler
+        ) as controller:
+            assert controller.salinfo.index == 0
+            assert controller.salinfo.read_indices == frozenset(indices)
+            assert list(controller.handlers) == sorted(indices)
+            for index, handler in controller.handlers.items():
+                assert handler.salinfo.index == index
+                assert handler.domain is controller.domain
+                assert handler.salinfo.pool is controller.salinfo.pool
+
+            remotes = [
+                salobj.Remote(domain=controller.domain, name="Test", index=index)
+                for index in indices
+            ]
+            for i, remote in enumerate(remotes):
+                await remote.start_task
+                await remote.cmd_setScalars.set_start(int0=i + 1, timeout=STD_TIMEOUT)
+                data = await remote.evt_scalars.next(flush=False, timeout=STD_TIMEOUT)
+                assert data.salIndex == indices[i]
+                assert data.int0 == i + 1
+                handler = controller.handlers[indices[i]]
+                assert handler.evt_scalars.data.int0 == i + 1
+
+            # Handler has no do_wait method.
+            with pytest.raises(salobj.AckError):
+                await remotes[0].cmd_wait.start(timeout=STD_TIMEOUT)
+
+            # Commands for other indices are ignored without being decoded.
+            other_remote = salobj.Remote(
+                domain=controller.domain, name="Test", index=next(index_gen)
+            )
+            await other_remote.start_task
+            with pytest.raises(salobj.AckTimeoutError):
+                await other_remote.cmd_setScalars.set_start(
+                    int0=5, timeout=NO_DATA_TIMEOUT
+                )
+            assert controller.salinfo.num_index_filtered >= 1
+        assert not controller.domain.isopen
+
+    async def test_errors(self) -> None:
+        index = next(index_gen)
+
+        def make_read_write_handler(
+            index: int, domain: salobj.Domain
+        ) -> salobj.Controller:
+            return salobj.Controller("Test", index=index, domain=domain)
+
+        def make_wrong_index_handler(index: int, domain: salobj.Domain) -> Handler:
+            return Handler(index=index + 1, domain=domain)
+
+        for indices in ([], [0, index]):
+            with pytest.raises(ValueError):
+                salobj.MultiIndexController(
+                    name="Test", indices=indices, handler_factory=Handler
+                )
+        for handler_factory in (make_read_write_handler, make_wrong_index_handler):
+            with pytest.raises(ValueError):
+                salobj.MultiIndexController(
+                    name="Test", indices=[index], handler_factory=handler_factory
+                )
@@ -0,0 +1,168 @@
+# This file is part of ts_salobj.
+#
+# Developed for the Rubin Observatory Telescope and Site System.
+# This product includes software developed by the LSST Project
+# (https://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import time
+import unittest
+
+import pytest
+from lsst.ts import salobj
+
+# Interval between calls (seconds). Short, so the tests run quickly.
+INTERVAL = 0.1
+
+
+class PeriodicSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.scheduler = salobj.PeriodicScheduler()
+        # List of (name, scheduler tick) for each call.
+        self.calls: list[tuple[str, int]] = []
+
+    def tearDown(self) -> None:
+        self.scheduler.close()
+
+    def make_callback(
+        self, name: str
+    ) -> salobj.periodic_scheduler.PeriodicCallbackType:
+        def callback() -> None:
+            self.calls.append((name, self.scheduler.num_ticks))
+
+        return callback
+
+    async def test_errors(self) -> None:
+        callback = self.make_callback("a")
+        with pytest.raises(ValueError):
+            self.scheduler.add(callback, interval=0)
+        with pytest.raises(ValueError):
+            self.scheduler.add(callback, interval=INTERVAL, delay=-1)
+        periodic = self.scheduler.add(callback, interval=INTERVAL)
+        for bad_interval in (0, -1):
+            with pytest.raises(ValueError):
+                periodic.interval = bad_interval
+        assert periodic.interval == INTERVAL
+
+    async def test_shared_ticks(self) -> None:
+        periodic_a = self.scheduler.add(
+            self.make_callback("a"), interval=INTERVAL, delay=None
+        )
+        periodic_b = self.scheduler.add(
+            self.make_callback("b"), interval=INTERVAL, delay=None
+        )
+        assert self.scheduler.num_callbacks == 2
+        await asyncio.sleep(INTERVAL * 3.5)
+        assert periodic_a.num_calls >= 3
+        assert periodic_b.num_calls >= 3
+        # Both callbacks start on a multiple of the interval,
+        # so they are called on the same ticks.
+        ticks_a = [tick for name, tick in self.calls if name == "a"]
+        ticks_b = [tick for name, tick in self.calls if name == "b"]
+        assert set(ticks_a) & set(ticks_b)
+        assert self.scheduler.num_ticks < periodic_a.num_calls + periodic_b.num_calls
+        assert self.scheduler.max_drift >= self.scheduler.last_drift >= 0
+
+        # A cancelled callback is not called again.
+        periodic_a.cancel()
+        num_calls = periodic_a.num_calls
+        await asyncio.sleep(INTERVAL * 2)
+        assert periodic_a.num_calls == num_calls
+        assert self.scheduler.num_callbacks == 1
+
+    async def test_first_interval(self) -> None:
+        """The second call is a full interval after the first,
+        even if the first call is not on a multiple of the interval.
+        """
+        call_times: list[float] = []
+        loop = asyncio.get_running_loop()
+        # Start just before a multiple of the interval.
+        await asyncio.sleep((INTERVAL * 0.9 - loop.time() % INTERVAL) % INTERVAL)
+        periodic = self.scheduler.add(
+            lambda: call_times.append(loop.time()), interval=INTERVAL
+        )
+        await asyncio.sleep(INTERVAL * 2.5)
+        assert periodic.num_calls >= 2
+        assert call_times[1] - call_times[0] >= INTERVAL * 0.9
+
+    async def test_change_interval(self) -> None:
+        long_interval = INTERVAL * 100
+        periodic = self.scheduler.add(self.make_callback("a"), interval=long_interval)
+        await asyncio.sleep(INTERVAL / 2)
+        assert periodic.num_calls == 1
+        # The next call is rescheduled, rather than waiting
+        # for the next call at the old interval.
+        periodic.interval = INTERVAL
+        await asyncio.sleep(INTERVAL * 3)
+        assert periodic.num_calls >= 3
+        assert self.scheduler.num_callbacks == 1
+
+        periodic.interval = long_interval
+        num_calls = periodic.num_calls
+        await asyncio.sleep(INTERVAL * 2)
+        assert periodic.num_calls == num_calls
+
+    async def test_coroutine_callbacks(self) -> None:
+        num_finished = 0
+
+        async def slow_callback() -> None:
+            nonlocal num_finished
+            await asyncio.sleep(INTERVAL * 1.5)
+            num_finished += 1
+
+        async def failing_callback() -> None:
+            raise RuntimeError("Failed on purpose")
+
+        periodic_slow = self.scheduler.add(slow_callback, interval=INTERVAL)
+        periodic_failing = self.scheduler.add(failing_callback, interval=INTERVAL)
+        await asyncio.sleep(INTERVAL * 4.5)
+        # A call is skipped while the previous call is running.
+        assert periodic_slow.num_skipped > 0
+        assert num_finished > 0
+        # Exceptions are logged and the callback is called again.
+        assert periodic_failing.num_calls >= 4
+
+    async def test_add_from_callback(self) -> None:
+        added: list[salobj.PeriodicCallback] = []
+
+        def adding_callback() -> None:
+            if not added:
+                added.append(
+                    self.scheduler.add(self.make_callback("b"), interval=INTERVAL)
+                )
+
+        periodic = self.scheduler.add(adding_callback, interval=INTERVAL)
+        await asyncio.sleep(INTERVAL * 4.5)
+        assert len(added) == 1
+        assert added[0].num_calls >= 3
+        # There is only one chain of timers, so every tick calls
+        # at least one callback.
+        assert self.scheduler.num_ticks <= periodic.num_calls + added[0].num_calls
+
+    async def test_late_timer(self) -> None:
+        # Block the event loop for several intervals on the first call.
+        time_to_block = INTERVAL * 3.5
+
+        def blocking_callback() -> None:
+            if periodic.num_calls == 1:
+                time.sleep(time_to_block)
+
+        periodic = self.scheduler.add(blocking_callback, interval=INTERVAL)
+        await asyncio.sleep(time_to_block + INTERVAL * 1.5)
+        assert periodic.num_skipped >= 2
+        assert self.scheduler.max_drift >= INTERVAL * 2
@@ -29,6 +29,7 @@ import unittest
 
 import pytest
 import yaml
+from confluent_kafka import TopicPartition
 from lsst.ts import salobj, utils
 from lsst.ts.salobj.topics import ReadTopic, WriteTopic
 
@@ -334,6 +335,170 @@ class SalInfoTestCase(unittest.IsolatedAsyncioTestCase):
             assert salinfo._consumer is None
             assert salinfo._read_loop_task.done()
 
+    async def test_producer_profiles(self) -> None:
+        index = next(index_gen)
+        tel_profile = {"linger.ms": 5, "compression.type": "lz4"}
+        arrays_profile = {"compression.type": "zstd"}
+        async with (
+            salobj.Domain() as domain,
+            salobj.SalInfo(
+                domain=domain,
+                name="Test",
+                index=index,
+                producer_profiles={"tel_": tel_profile, "tel_arrays": arrays_profile},
+            ) as salinfo,
+        ):
+            assert salinfo.get_producer_profile("cmd_setScalars") == {}
+            assert salinfo.get_producer_profile("tel_scalars") == tel_profile
+            assert salinfo.get_producer_profile("tel_arrays") == arrays_profile
+
+            write_topics = {
+                attr_name: WriteTopic(salinfo=salinfo, attr_name=attr_name)
+                for attr_name in ("evt_scalars", "tel_scalars", "tel_arrays")
+            }
+            read_topic = ReadTopic(
+                salinfo=salinfo, attr_name="tel_arrays", max_history=0
+            )
+            await salinfo.start()
+
+            # There is one producer for each distinct profile,
+            # and messages are written with the correct producer.
+            assert len(salinfo._producers) == 3
+            assert len(set(salinfo._topic_producers.values())) == 3
+            write_topic = write_topics["tel_arrays"]
+            write_topic.set(int0=[1, 2, 3, 4, 5])
+            await write_topic.write()
+            data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+            assert data.int0 == [1, 2, 3, 4, 5]
+
+        # Profiles can be read from a file.
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml") as fp:
+            yaml.safe_dump({"tel_": tel_profile}, fp)
+            fp.flush()
+            with utils.modify_environ(LSST_KAFKA_PRODUCER_PROFILES=fp.name):
+                async with (
+                    salobj.Domain() as domain,
+                    salobj.SalInfo(domain=domain, name="Test", index=index) as salinfo,
+                ):
+                    assert salinfo.producer_profiles == {"tel_": tel_profile}
+
+    async def test_priority_topics(self) -> None:
+        index = next(index_gen)
+        for priority_topics, expect_consumer, expect_priority_consumer in (
+            (None, True, False),
+            (["evt_scalars"], True, True),
+            (["evt_", "tel_"], False, True),
+        ):
+            with self.subTest(priority_topics=priority_topics):
+                async with (
+                    salobj.Domain() as domain,
+                    salobj.SalInfo(
+                        domain=domain,
+                        name="Test",
+                        index=index,
+                        priority_topics=priority_topics,
+                    ) as salinfo,
+                ):
+                    assert salinfo.is_priority_topic("evt_scalars") == (
+                        priority_topics is not None
+                    )
+                    assert salinfo.is_priority_topic("evt_arrays") == (
+                        priority_topics is not None and "evt_" in priority_topics
+                    )
+                    assert not salinfo.is_priority_topic("cmd_setScalars")
+
+                    write_topics = dict()
+                    read_topics = dict()
+                    for attr_name in ("evt_scalars", "tel_arrays"):
+                        write_topics[attr_name] = WriteTopic(
+                            salinfo=salinfo, attr_name=attr_name
+                        )
+                        read_topics[attr_name] = ReadTopic(
+                            salinfo=salinfo, attr_name=attr_name, max_history=0
+                        )
+                    await salinfo.start()
+                    assert (salinfo._consumer is not None) == expect_consumer
+                    assert (
+                        salinfo._priority_consumer is not None
+                    ) == expect_priority_consumer
+
+                    for value in (1, 2):
+                        data_dicts = dict(
+                            evt_scalars=dict(int0=value),
+                            tel_arrays=dict(int0=[value] * 5),
+                        )
+                        for attr_name, data_dict in data_dicts.items():
+                            await write_topics[attr_name].set_write(**data_dict)
+                        for attr_name, data_dict in data_dicts.items():
+                            data = await read_topics[attr_name].next(
+                                flush=False, timeout=STD_TIMEOUT
+                            )
+                            assert data.int0 == data_dict["int0"]
+
+    async def test_history_offsets_per_consumer(self) -> None:
+        """Test that reassigning or losing the partitions of one consumer
+        does not affect historical data for the other consumer.
+        """
+
+        class FakeConsumer:
+            def __init__(self) -> None:
+                self.partitions: list[TopicPartition] = []
+
+            def get_watermark_offsets(
+                self, partition: TopicPartition, cached: bool
+            ) -> tuple[int, int]:
+                return (0, 10)
+
+            def assign(self, partitions: list[TopicPartition]) -> None:
+                self.partitions = partitions
+
+            def assignment(self) -> list[TopicPartition]:
+                return self.partitions
+
+        index = next(index_gen)
+        async with salobj.Domain() as domain:
+            salinfo = salobj.SalInfo(
+                domain=domain,
+                name="Test",
+                index=index,
+                priority_topics=["evt_scalars"],
+            )
+            kafka_names = {
+                attr_name: ReadTopic(
+                    salinfo=salinfo, attr_name=attr_name, max_history=1
+                ).topic_info.kafka_name
+                for attr_name in ("evt_scalars", "evt_arrays")
+            }
+            salinfo._num_consumers = 2
+            consumer = FakeConsumer()
+            priority_consumer = FakeConsumer()
+            priority_partitions = [TopicPartition(kafka_names["evt_scalars"], 0)]
+            partitions = [TopicPartition(kafka_names["evt_arrays"], 0)]
+
+            salinfo._blocking_on_assign_callback(priority_consumer, priority_partitions)
+            assert salinfo._history_offsets == {kafka_names["evt_scalars"]: 9}
+            assert not salinfo._history_offsets_retrieved
+
+            # Reassigning the priority consumer before the main consumer
+            # has been assigned does not release start.
+            salinfo._blocking_on_assign_callback(priority_consumer, priority_partitions)
+            assert salinfo._history_offsets == {}
+            assert not salinfo._history_offsets_retrieved
+            assert not salinfo._is_history_read()
+
+            salinfo._blocking_on_assign_callback(consumer, partitions)
+            assert salinfo._history_offsets == {kafka_names["evt_arrays"]: 9}
+            assert salinfo._history_offsets_retrieved
+            assert not salinfo._is_history_read()
+
+            # Losing the priority consumer's partitions
+            # does not affect the main consumer's history.
+            salinfo._blocking_on_lost_callback(priority_consumer, priority_partitions)
+            assert salinfo._history_offsets == {kafka_names["evt_arrays"]: 9}
+
+            salinfo._blocking_on_lost_callback(consumer, partitions)
+            assert salinfo._is_history_read()
+
     async def test_reject_old_topic_data(self) -> None:
         index = next(index_gen)
         read_topics: dict[str, ReadTopic] = {}
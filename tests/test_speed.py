@@ -24,6 +24,7 @@ import contextlib
 import os
 import pathlib
 import time
+import typing
 import unittest
 import warnings
 from collections.abc import AsyncGenerator
@@ -82,6 +83,20 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
                 "and the controller does nothing in reponse to the command.",
                 unit=u.ct / u.second,
             ),
+            verify.Metric(
+                name="salobj.IssueCommandsUnderLoad",
+                description="The rate at which salobj can issue commands and await a reply, "
+                "while the remote is also reading Test_forceActuatorData as fast as "
+                "the controller can write it.",
+                unit=u.ct / u.second,
+            ),
+            verify.Metric(
+                name="salobj.IssueCommandsUnderLoad_priority",
+                description="The rate at which salobj can issue commands and await a reply, "
+                "while the remote is also reading Test_forceActuatorData as fast as "
+                "the controller can write it, with ackcmd as a priority topic.",
+                unit=u.ct / u.second,
+            ),
             verify.Metric(
                 name="salobj.ReadTest_forceActuatorData",
                 description="The rate at which salobj can read Test_forceActuatorData samples. "
@@ -94,12 +109,38 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
                 "This is one of our smallest topics.",
                 unit=u.ct / u.second,
             ),
+            verify.Metric(
+                name="salobj.SetTest_scalars",
+                description="The rate at which salobj can call set on Test_logevent_scalars, "
+                "setting every field to its current value (so nothing changes). "
+                "This measures the cost of change detection.",
+                unit=u.ct / u.second,
+            ),
+            verify.Metric(
+                name="salobj.SetTest_arrays",
+                description="The rate at which salobj can call set on Test_logevent_arrays, "
+                "setting every field to its current value (so nothing changes). "
+                "This measures the cost of change detection.",
+                unit=u.ct / u.second,
+            ),
             verify.Metric(
                 name="salobj.WriteTest_forceActuatorData",
                 description="The rate at which salobj can write Test_forceActuatorData samples. "
                 "This is one of our largest topics.",
                 unit=u.ct / u.second,
             ),
+            verify.Metric(
+                name="salobj.WriteTest_forceActuatorData_lowLatency",
+                description="The rate at which salobj can write Test_forceActuatorData samples "
+                "using the low-latency producer profile (no lingering or compression).",
+                unit=u.ct / u.second,
+            ),
+            verify.Metric(
+                name="salobj.WriteTest_forceActuatorData_bulk",
+                description="The rate at which salobj can write Test_forceActuatorData samples "
+                "using the bulk producer profile (lingering, large batches and lz4 compression).",
+                unit=u.ct / u.second,
+            ),
             verify.Metric(
                 name="salobj.WriteTest_logLevel",
                 description="The rate at which salobj can write Test_logevent_logLevel samples. "
@@ -130,11 +171,16 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
 
     @contextlib.asynccontextmanager
     async def make_remote_and_topic_writer(
-        self,
+        self, **remote_kwargs: typing.Any
     ) -> AsyncGenerator[salobj.Remote, None]:
         """Make a remote and launch a topic writer in a subprocess.
 
         Return the remote.
+
+        Parameters
+        ----------
+        **remote_kwargs : `dict` [`str`, `typing.Any`]
+            Additional keyword arguments for the remote.
         """
         script_path = self.datadir / "topic_writer.py"
         process = await asyncio.create_subprocess_exec(
@@ -142,7 +188,7 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
         )
         try:
             async with salobj.Domain() as domain, salobj.Remote(
-                domain=domain, name="Test", index=self.index
+                domain=domain, name="Test", index=self.index, **remote_kwargs
             ) as remote:
                 yield remote
                 await salobj.set_summary_state(
@@ -206,6 +252,53 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
                 )
             )
 
+    async def test_command_speed_under_load(self) -> None:
+        """Test the speed of commands while the remote is flooded
+        with telemetry, with and without ackcmd as a priority topic.
+        """
+        for metric_name, priority_topics in (
+            ("salobj.IssueCommandsUnderLoad", None),
+            ("salobj.IssueCommandsUnderLoad_priority", ["ack_"]),
+        ):
+            self.index = next(index_gen)
+            self.start_time = utils.current_tai()
+            async with self.make_remote_and_topic_writer(
+                priority_topics=priority_topics
+            ) as remote:
+                summary_state = await remote.evt_summaryState.next(
+                    flush=False, timeout=60
+                )
+                while summary_state.private_sndStamp < self.start_time:
+                    print(f"Discarding old topic: {summary_state}")
+                    summary_state = await remote.evt_summaryState.next(
+                        flush=False, timeout=60
+                    )
+
+                await salobj.set_summary_state(
+                    remote=remote,
+                    state=salobj.State.ENABLED,
+                    override="arrays",
+                    timeout=STD_TIMEOUT,
+                )
+                # Wait for the first sample so we know the writer is running.
+                await remote.tel_arrays.next(flush=False, timeout=STD_TIMEOUT)
+
+                num_commands = 100
+                t0 = time.monotonic()
+                for _ in range(num_commands):
+                    await remote.cmd_fault.start(timeout=STD_TIMEOUT)
+                dt = time.monotonic() - t0
+                command_speed = num_commands / dt
+                print(
+                    f"Issued {command_speed:0.0f} fault commands/second "
+                    f"under telemetry load with {priority_topics=} "
+                    f"({num_commands} commands)"
+                )
+
+                self.insert_measurement(
+                    verify.Measurement(metric_name, command_speed * u.ct / u.second)
+                )
+
     async def test_read_speed(self) -> None:
         async with self.make_remote_and_topic_writer() as remote:
             summary_state = await remote.evt_summaryState.next(flush=False, timeout=60)
@@ -284,6 +377,38 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
                 )
             )
 
+    async def test_set_speed(self) -> None:
+        async with salobj.Controller(
+            name="Test", index=self.index, do_callbacks=False
+        ) as controller:
+            num_samples = 10000
+
+            for topic, metric_name in (
+                (controller.evt_scalars, "salobj.SetTest_scalars"),
+                (controller.evt_arrays, "salobj.SetTest_arrays"),
+            ):
+                # Set every field, except the private fields.
+                data_dict = {
+                    key: value
+                    for key, value in vars(topic.data).items()
+                    if not key.startswith("private_")
+                }
+                topic.set(**data_dict)
+                t0 = time.monotonic()
+                for _ in range(num_samples):
+                    did_change = topic.set(**data_dict)
+                dt = time.monotonic() - t0
+                assert not did_change
+                set_speed = num_samples / dt
+                print(
+                    f"Called {topic.attr_name}.set {set_speed:0.0f} times/second "
+                    f"({num_samples} calls)"
+                )
+
+                self.insert_measurement(
+                    verify.Measurement(metric_name, set_speed * u.ct / u.second)
+                )
+
     async def test_write_speed(self) -> None:
         async with salobj.Controller(
             name="Test", index=self.index, do_callbacks=False
@@ -323,6 +448,38 @@ class SpeedTestCase(unittest.IsolatedAsyncioTestCase):
                 )
             )
 
+    async def test_write_speed_profiles(self) -> None:
+        num_samples = 1000
+        for profile_name, profile in (
+            ("lowLatency", {"linger.ms": 0, "compression.type": "none"}),
+            (
+                "bulk",
+                {"linger.ms": 5, "batch.size": 1000000, "compression.type": "lz4"},
+            ),
+        ):
+            async with salobj.Controller(
+                name="Test",
+                index=self.index,
+                do_callbacks=False,
+                producer_profiles={"tel_": profile},
+            ) as controller:
+                t0 = time.monotonic()
+                for _ in range(num_samples):
+                    await controller.tel_arrays.write()
+                dt = time.monotonic() - t0
+                write_speed = num_samples / dt
+                print(
+                    f"Wrote {write_speed:0.0f} arrays samples/second "
+                    f"with the {profile_name} profile ({num_samples} samples)"
+                )
+
+                self.insert_measurement(
+                    verify.Measurement(
+                        f"salobj.WriteTest_forceActuatorData_{profile_name}",
+                        write_speed * u.ct / u.second,
+                    )
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
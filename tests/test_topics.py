@@ -21,18 +21,25 @@
 
 import asyncio
 import collections
+import concurrent.futures
+import contextlib
 import copy
+import dataclasses
 import itertools
 import math
+import multiprocessing
 import os
 import pathlib
+import threading
 import time
 import typing
 import unittest
 from collections.abc import Iterable, Sequence
+from unittest.mock import patch
 
 import numpy as np
 import pytest
+from confluent_kafka import KafkaError
 from lsst.ts import salobj, utils
 
 # Long enough to perform any reasonable operation
@@ -45,6 +52,24 @@ NO_DATA_TIMEOUT = 1
 
 np.random.seed(47)
 
+# Queue to which `process_pool_callback` reports,
+# set in each worker process by `set_process_pool_queue`.
+process_pool_queue: typing.Any = None
+
+
+def set_process_pool_queue(queue: typing.Any) -> None:
+    """Initialize a process pool worker for `process_pool_callback`."""
+    global process_pool_queue
+    process_pool_queue = queue
+
+
+def process_pool_callback(data_dict: dict[str, typing.Any]) -> None:
+    """Callback for a read topic whose callback_executor is a process pool.
+
+    Report the process ID, the type of the data and the data.
+    """
+    process_pool_queue.put((os.getpid(), type(data_dict), data_dict))
+
 
 class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
     def basic_make_csc(
@@ -260,6 +285,10 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     )
                     assert nread == i + 1
                 await tasks[3]
+                # The acks for the first three commands are ignored
+                # before being decoded; the unfiltered reader sees them all.
+                assert salinfo.num_ackcmd_filtered == 3
+                assert salinfo0.num_ackcmd_filtered == 0
                 assert not tasks[0].done()  # Origin did not match.
                 assert not tasks[1].done()  # Identity did not match.
                 assert not tasks[2].done()  # No identity.
@@ -298,6 +327,131 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             with pytest.raises(asyncio.TimeoutError):
                 await self.remote.tel_scalars.next(flush=False, timeout=NO_DATA_TIMEOUT)
 
+            # write without a snapshot; the written data is independent
+            # of later changes to the topic's data
+            scalars_dict3 = self.csc.make_random_scalars_dict()
+            self.csc.tel_scalars.set(**scalars_dict3)
+            assert await self.csc.tel_scalars.write(snapshot=False) is None
+            self.csc.tel_scalars.set(**scalars_dict1)
+            data = await self.remote.tel_scalars.next(flush=False, timeout=STD_TIMEOUT)
+            self.csc.assert_scalars_equal(data, scalars_dict3)
+
+            # set_write returns the topic's data, without copying it,
+            # but later calls to set and write do not change that data
+            result = await self.csc.tel_scalars.set_write(**scalars_dict3)
+            assert result.data is self.csc.tel_scalars.data
+            snd_stamp = result.data.private_sndStamp
+            await self.csc.tel_scalars.write(snapshot=False)
+            self.csc.tel_scalars.set(**scalars_dict1)
+            assert result.data.private_sndStamp == snd_stamp
+            self.csc.assert_scalars_equal(result.data, scalars_dict3)
+
+    async def test_unacknowledged_telemetry_write(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            write_topic = self.csc.tel_scalars
+            assert not write_topic.unacknowledged
+            # The thread for unacknowledged writes is made when needed.
+            assert self.csc.salinfo._unacknowledged_write_pool is None
+            write_topic.unacknowledged = True
+            assert write_topic.unacknowledged
+
+            num_messages = 10
+            for int0 in range(num_messages):
+                await write_topic.set_write(int0=int0)
+            # Messages are read in order.
+            for int0 in range(num_messages):
+                data = await self.remote.tel_scalars.next(
+                    flush=False, timeout=STD_TIMEOUT
+                )
+                assert data.int0 == int0
+            assert self.csc.salinfo.num_pending_writes == 0
+            assert self.csc.salinfo.num_delivery_errors == 0
+            assert self.csc.salinfo._unacknowledged_write_pool is not None
+
+            # Array fields are copied, so they may be modified in place
+            # as soon as write returns.
+            self.csc.tel_arrays.unacknowledged = True
+            arrays_dict = self.csc.make_random_arrays_dict()
+            expected_arrays_dict = copy.deepcopy(arrays_dict)
+            self.csc.tel_arrays.set(**arrays_dict)
+            await self.csc.tel_arrays.write(snapshot=False)
+            for value in arrays_dict.values():
+                value[:] = 0
+            data = await self.remote.tel_arrays.next(flush=False, timeout=STD_TIMEOUT)
+            self.csc.assert_arrays_equal(data, expected_arrays_dict)
+
+            # A message that cannot be written does not raise,
+            # but is counted.
+            write_topic.set(int0="not an int")
+            await write_topic.write(snapshot=False)
+            await asyncio.sleep(EVENT_DELAY)
+            assert self.csc.salinfo.num_pending_writes == 0
+            assert self.csc.salinfo.num_delivery_errors == 1
+            assert self.csc.salinfo.delivery_error_counts == {"tel_scalars": 1}
+
+            # Messages are dropped if too many writes are pending.
+            with patch("lsst.ts.salobj.sal_info.MAX_PENDING_UNACKNOWLEDGED_WRITES", 0):
+                await write_topic.set_write(int0=1)
+            assert self.csc.salinfo.num_pending_writes == 0
+            assert self.csc.salinfo.delivery_error_counts == {"tel_scalars": 2}
+
+            # Acknowledged writes raise.
+            write_topic.unacknowledged = False
+            with pytest.raises(Exception):
+                await write_topic.write()
+            assert self.csc.salinfo.num_delivery_errors == 2
+
+    async def test_coalesced_telemetry_write(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            write_topic = self.csc.tel_scalars
+            assert not write_topic.coalesce
+            write_topic.coalesce = True
+            assert write_topic.coalesce
+            assert write_topic.num_coalesced == 0
+
+            # Writing does not yield to the event loop, so the writer
+            # has no chance to send any but the last of these messages.
+            num_messages = 10
+            for int0 in range(num_messages):
+                result = await write_topic.set_write(int0=int0)
+                assert result.data.int0 == int0
+            data = await self.remote.tel_scalars.next(flush=False, timeout=STD_TIMEOUT)
+            assert data.int0 == num_messages - 1
+            with pytest.raises(asyncio.TimeoutError):
+                await self.remote.tel_scalars.next(flush=False, timeout=NO_DATA_TIMEOUT)
+            assert write_topic.num_coalesced == num_messages - 1
+
+            # Messages written slowly are all sent.
+            for int0 in range(3):
+                await write_topic.set_write(int0=int0)
+                data = await self.remote.tel_scalars.next(
+                    flush=False, timeout=STD_TIMEOUT
+                )
+                assert data.int0 == int0
+            assert write_topic.num_coalesced == num_messages - 1
+            assert self.csc.salinfo.num_delivery_errors == 0
+
+            # Delivery failures are counted, without logging a traceback.
+            class FailingProducer:
+                def produce(
+                    self,
+                    *args: typing.Any,
+                    on_delivery: typing.Any,
+                    **kwargs: typing.Any,
+                ) -> None:
+                    on_delivery(KafkaError(KafkaError._MSG_TIMED_OUT), None)
+
+            salinfo = self.csc.salinfo
+            with patch.dict(
+                salinfo._topic_producers,
+                {write_topic.topic_info.kafka_name: FailingProducer()},
+            ), patch.object(salinfo.log, "exception") as log_exception:
+                for int0 in range(3):
+                    await write_topic.set_write(int0=int0)
+                    await asyncio.sleep(EVENT_DELAY)
+            assert salinfo.delivery_error_counts == {"tel_scalars": 3}
+            log_exception.assert_not_called()
+
     async def test_controller_event_write(self) -> None:
         """Test ControllerEvent.set, write, and set_write.
 
@@ -634,6 +788,261 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             for cmd_data, tel_data in zip(cmd_data_list, tel_data_list):
                 self.csc.assert_scalars_equal(cmd_data, tel_data)
 
+    async def test_callback_executor(self) -> None:
+        num_commands = 3
+        loop = asyncio.get_running_loop()
+        main_thread_id = threading.get_ident()
+
+        tel_data_list: list[salobj.BaseMsgType] = []
+        tel_thread_ids: set[int] = set()
+        tel_future: asyncio.Future = asyncio.Future()
+
+        def tel_callback(data: salobj.BaseMsgType) -> None:
+            tel_thread_ids.add(threading.get_ident())
+            tel_data_list.append(data)
+            if len(tel_data_list) == num_commands:
+                loop.call_soon_threadsafe(tel_future.set_result, None)
+
+        async def async_callback(data: salobj.BaseMsgType) -> None:
+            pass
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            async with self.make_csc(initial_state=salobj.State.ENABLED):
+                read_topic = self.remote.tel_scalars
+                assert read_topic.callback_executor is None
+                with pytest.raises(TypeError):
+                    read_topic.callback_executor = "not an executor"  # type: ignore
+                read_topic.callback_executor = executor
+                assert read_topic.callback_executor is executor
+                with pytest.raises(TypeError):
+                    read_topic.callback = async_callback
+                read_topic.callback = tel_callback
+                assert read_topic.executor_queue_depth == 0
+
+                cmd_data_list = await self.set_scalars(num_commands=num_commands)
+                await asyncio.wait_for(tel_future, timeout=STD_TIMEOUT)
+
+                assert main_thread_id not in tel_thread_ids
+                assert len(tel_data_list) == num_commands
+                for cmd_data, tel_data in zip(cmd_data_list, tel_data_list):
+                    self.csc.assert_scalars_equal(cmd_data, tel_data)
+
+    async def test_callback_process_pool(self) -> None:
+        num_commands = 3
+        mp_context = multiprocessing.get_context("spawn")
+        queue = mp_context.Queue()
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=mp_context,
+            initializer=set_process_pool_queue,
+            initargs=(queue,),
+        ) as executor:
+            async with self.make_csc(initial_state=salobj.State.ENABLED):
+                read_topic = self.remote.tel_scalars
+                read_topic.callback_executor = executor
+                read_topic.callback = process_pool_callback
+
+                cmd_data_list = await self.set_scalars(num_commands=num_commands)
+                loop = asyncio.get_running_loop()
+                for cmd_data in cmd_data_list:
+                    pid, data_type, data_dict = await loop.run_in_executor(
+                        None, queue.get, True, STD_TIMEOUT
+                    )
+                    # The callback ran in another process, and received
+                    # a dict, because messages cannot be pickled.
+                    assert pid != os.getpid()
+                    assert data_type is dict
+                    self.csc.assert_scalars_equal(cmd_data, data_dict)
+
+    async def test_message_filter(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            read_topic = self.remote.tel_scalars
+            assert read_topic.message_filter is None
+            with pytest.raises(TypeError):
+                read_topic.message_filter = "not callable"  # type: ignore
+            read_topic.message_filter = salobj.topics.DeadbandFilter(
+                abs_tolerance=dict(double0=0.5), fields=["int0", "double0"]
+            )
+            assert read_topic.num_filtered == 0
+
+            for int0, double0 in ((1, 0), (1, 0.4), (2, 0.4), (2, 0.8), (2, 1.0)):
+                await self.csc.tel_scalars.set_write(int0=int0, double0=double0)
+            for int0, double0 in ((1, 0), (2, 0.4), (2, 1.0)):
+                data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+                assert data.int0 == int0
+                assert data.double0 == pytest.approx(double0)
+            with pytest.raises(asyncio.TimeoutError):
+                await read_topic.next(flush=False, timeout=NO_DATA_TIMEOUT)
+            assert read_topic.num_filtered == 2
+
+    async def test_numpy_arrays(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            read_topic = self.remote.tel_arrays
+            write_topic = self.csc.tel_arrays
+            assert not read_topic.numpy_arrays
+            assert not write_topic.numpy_arrays
+            array_dtypes = read_topic.get_array_dtypes()
+            assert "string0" not in array_dtypes
+            for field_name, dtype in array_dtypes.items():
+                assert dtype == np.dtype(self.csc.field_type[field_name])
+
+            # Changing the mode does not modify a message
+            # returned by set_write.
+            result = await write_topic.set_write(force_output=True)
+            write_topic.numpy_arrays = True
+            assert write_topic.numpy_arrays
+            for field_name, dtype in array_dtypes.items():
+                value = getattr(write_topic.data, field_name)
+                assert isinstance(value, np.ndarray)
+                assert value.dtype == dtype
+                assert isinstance(getattr(result.data, field_name), list)
+
+            # Lists are converted; values that are already arrays
+            # of the correct dtype are not copied.
+            arrays_dict = self.csc.make_random_arrays_dict()
+            arrays_dict["int0"] = arrays_dict["int0"].tolist()
+            assert write_topic.set(**arrays_dict)
+            assert isinstance(write_topic.data.int0, np.ndarray)
+            assert write_topic.data.double0 is arrays_dict["double0"]
+            assert not write_topic.set(**arrays_dict)
+
+            # Data is read as lists by default.
+            await write_topic.write()
+            data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+            self.csc.assert_arrays_equal(data, arrays_dict)
+            assert isinstance(data.double0, list)
+
+            read_topic.numpy_arrays = True
+            assert read_topic.numpy_arrays
+            await write_topic.write()
+            data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+            self.csc.assert_arrays_equal(data, arrays_dict)
+            for field_name, dtype in array_dtypes.items():
+                value = getattr(data, field_name)
+                assert isinstance(value, np.ndarray)
+                assert value.dtype == dtype
+
+            # Turning the mode off converts array fields back to lists.
+            result = await write_topic.set_write(force_output=True)
+            write_topic.numpy_arrays = False
+            assert not write_topic.numpy_arrays
+            self.csc.assert_arrays_equal(write_topic.data, arrays_dict)
+            for field_name in array_dtypes:
+                assert isinstance(getattr(write_topic.data, field_name), list)
+                assert isinstance(getattr(result.data, field_name), np.ndarray)
+
+    async def test_slots(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED), salobj.Remote(
+            domain=self.csc.domain,
+            name=self.csc.salinfo.name,
+            index=self.csc.salinfo.index,
+            slots=True,
+            frozen=True,
+        ) as remote:
+            assert remote.salinfo.slots
+            assert remote.salinfo.frozen
+            write_topic = remote.cmd_setScalars
+            read_topic = remote.evt_scalars
+            for topic in (write_topic, read_topic):
+                data = topic.DataType()
+                assert not hasattr(data, "__dict__")
+                assert data.salIndex == 0
+            data_dict = salobj.topics.get_data_dict(write_topic.DataType())
+            assert (
+                data_dict.keys() == vars(self.remote.cmd_setScalars.DataType()).keys()
+            )
+
+            # Write topics are not frozen; read topics are.
+            scalars_dict = self.csc.make_random_scalars_dict()
+            assert write_topic.set(**scalars_dict)
+            ackcmd = await write_topic.start(timeout=STD_TIMEOUT)
+            assert ackcmd.ack == salobj.SalRetCode.CMD_COMPLETE
+            data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+            self.csc.assert_scalars_equal(data, scalars_dict)
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                data.int0 = 0
+
+    async def test_wait_for(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            read_topic = self.remote.evt_scalars
+            await self.csc.evt_scalars.set_write(int0=1)
+            data = await read_topic.aget(timeout=STD_TIMEOUT)
+            assert data.int0 == 1
+
+            # The current message matches.
+            data = await read_topic.wait_for(
+                lambda data: data.int0 == 1, timeout=STD_TIMEOUT
+            )
+            assert data.int0 == 1
+            with pytest.raises(asyncio.TimeoutError):
+                await read_topic.wait_for(
+                    lambda data: data.int0 == 1,
+                    timeout=NO_DATA_TIMEOUT,
+                    include_current=False,
+                )
+
+            # Several waiters on one topic, each waiting for a new message.
+            tasks = [
+                asyncio.create_task(
+                    read_topic.wait_for(
+                        lambda data, int0=int0: data.int0 == int0,
+                        timeout=STD_TIMEOUT,
+                    )
+                )
+                for int0 in (2, 3, 3)
+            ]
+            await asyncio.sleep(0)
+            for int0 in (2, 4, 3):
+                await self.csc.evt_scalars.set_write(int0=int0)
+            data_list = await asyncio.gather(*tasks)
+            assert [data.int0 for data in data_list] == [2, 3, 3]
+            assert read_topic._waiters == dict()
+
+            # An exception raised by the predicate is propagated.
+            task = asyncio.create_task(
+                read_topic.wait_for(lambda data: 1 / 0, include_current=False)
+            )
+            await asyncio.sleep(0)
+            await self.csc.evt_scalars.set_write(int0=5)
+            with pytest.raises(ZeroDivisionError):
+                await asyncio.wait_for(task, timeout=STD_TIMEOUT)
+
+            # wait_for does not consume queued data.
+            for int0 in (1, 2, 4, 3, 5):
+                data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+                assert data.int0 == int0
+
+    async def test_set_max_rate(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            read_topic = self.remote.tel_scalars
+            assert read_topic.max_rate_hz is None
+            with pytest.raises(ValueError):
+                read_topic.set_max_rate(0)
+            read_topic.set_max_rate(1, mode=salobj.topics.DecimationMode.LATEST)
+            assert read_topic.max_rate_hz == 1
+            assert read_topic.num_decimated == 0
+
+            for int0 in range(5):
+                await self.csc.tel_scalars.set_write(int0=int0)
+            # The first message is queued immediately,
+            # the last message at the end of the interval.
+            for int0 in (0, 4):
+                data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+                assert data.int0 == int0
+            with pytest.raises(asyncio.TimeoutError):
+                await read_topic.next(flush=False, timeout=NO_DATA_TIMEOUT)
+            assert read_topic.num_decimated == 3
+
+            # Clearing the limit keeps the drop count.
+            read_topic.set_max_rate(None)
+            assert read_topic.max_rate_hz is None
+            for int0 in range(3):
+                await self.csc.tel_scalars.set_write(int0=int0)
+            for int0 in range(3):
+                data = await read_topic.next(flush=False, timeout=STD_TIMEOUT)
+                assert data.int0 == int0
+            assert read_topic.num_decimated == 3
+
     # TODO DM-37502: modify this to expect construction to raise,
     # once we drop support for synchronous callback functions.
     # Possibly combine it with test_callbacks?
@@ -707,6 +1116,112 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             # This should time out.
             with salobj.assertRaisesAckTimeoutError():
                 await self.remote.cmd_wait.set_start(duration=-2, timeout=0.5)
+            # No command is waiting, so no deadline is still live.
+            assert all(
+                entry[-1] is None for entry in self.remote.salinfo._ack_deadlines
+            )
+
+    async def test_command_timeout_extended(self) -> None:
+        """Test that a CMD_INPROGRESS ack extends the deadline
+        by its timeout, and no more.
+        """
+        timeout = 1
+        in_progress_timeout = 1
+        duration = 4
+
+        async def slow_wait(data: salobj.BaseMsgType) -> None:
+            await self.csc.cmd_wait.ack_in_progress(data, timeout=in_progress_timeout)
+            await asyncio.sleep(duration)
+
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            self.csc.cmd_wait.callback = slow_wait
+            t0 = time.monotonic()
+            with salobj.assertRaisesAckTimeoutError(
+                ack=salobj.SalRetCode.CMD_INPROGRESS
+            ):
+                await self.remote.cmd_wait.set_start(timeout=timeout)
+            elapsed = time.monotonic() - t0
+            # Not timed out at the original deadline...
+            assert elapsed >= timeout + in_progress_timeout - 0.1
+            # ...but timed out at the new deadline,
+            # well before the command finished.
+            assert elapsed < duration - 1
+
+    async def test_running_cmd_cleanup(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            salinfo = self.remote.salinfo
+            cmd = self.remote.cmd_wait
+            duration = 2  # Long enough to outlast the retention time.
+            salinfo.running_cmd_retention = 0.2
+
+            # A command whose caller stops waiting for acknowledgements
+            # is forgotten after the retention time.
+            ackcmd = await cmd.set_start(
+                duration=duration, wait_done=False, timeout=STD_TIMEOUT
+            )
+            assert ackcmd.ack == salobj.SalRetCode.CMD_INPROGRESS
+            assert salinfo.num_running_cmds == 1
+            await asyncio.sleep(salinfo.running_cmd_retention * 2)
+            assert salinfo.num_running_cmds == 0
+            assert salinfo.num_expired_cmds == 1
+            with pytest.raises(RuntimeError):
+                await cmd.next_ackcmd(ackcmd, timeout=STD_TIMEOUT)
+
+            # A command whose caller is cancelled is forgotten at once.
+            task = asyncio.create_task(
+                cmd.set_start(duration=duration, timeout=STD_TIMEOUT)
+            )
+            while salinfo.num_running_cmds == 0:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert salinfo.num_running_cmds == 0
+            assert salinfo.num_expired_cmds == 1
+
+            # The oldest running command is evicted to make room.
+            salinfo.running_cmd_retention = STD_TIMEOUT
+            salinfo.max_running_cmds = 1
+            ackcmd = await cmd.set_start(
+                duration=duration, wait_done=False, timeout=STD_TIMEOUT
+            )
+            await self.remote.cmd_setScalars.start(timeout=STD_TIMEOUT)
+            assert salinfo.num_evicted_cmds == 1
+            assert salinfo.num_running_cmds == 0
+            assert salinfo.max_num_running_cmds == 1
+            with pytest.raises(RuntimeError):
+                await cmd.next_ackcmd(ackcmd, timeout=STD_TIMEOUT)
+
+    async def test_ack_coalesce_window(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            assert self.csc.cmd_wait.ack_coalesce_window == 0
+            with pytest.raises(ValueError):
+                self.csc.cmd_wait.ack_coalesce_window = -1
+            window = 1  # seconds
+            self.csc.cmd_wait.ack_coalesce_window = window
+
+            # A command that finishes within the window is only
+            # acknowledged once, with its final acknowledgement.
+            ackcmd = await self.remote.cmd_wait.set_start(
+                duration=0.1, wait_done=False, timeout=STD_TIMEOUT
+            )
+            assert ackcmd.ack == salobj.SalRetCode.CMD_COMPLETE
+            assert self.csc.cmd_wait.num_coalesced_acks == 1
+
+            # A slower command is acknowledged as in progress when the window
+            # ends, and that still extends the command timeout.
+            duration = window * 2
+            t0 = time.monotonic()
+            ackcmd = await self.remote.cmd_wait.set_start(
+                duration=duration, wait_done=False, timeout=STD_TIMEOUT
+            )
+            assert ackcmd.ack == salobj.SalRetCode.CMD_INPROGRESS
+            assert time.monotonic() - t0 >= window * 0.9
+            ackcmd = await self.remote.cmd_wait.next_ackcmd(
+                ackcmd, timeout=window * 1.5
+            )
+            assert ackcmd.ack == salobj.SalRetCode.CMD_COMPLETE
+            assert self.csc.cmd_wait.num_coalesced_acks == 1
 
     async def test_controller_command_get_next(self) -> None:
         """Test ControllerCommand get and next methods.
@@ -1055,6 +1570,153 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             expected_duration = max(*durations)
             assert abs(measured_duration - expected_duration) < 1
 
+    async def test_start_many(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            cmd = self.remote.cmd_wait
+            duration = 1  # seconds
+            num_commands = 4
+            data_list = [cmd.DataType(duration=duration) for _ in range(num_commands)]
+            with pytest.raises(ValueError):
+                await cmd.start_many(data_list, max_in_flight=0)
+
+            # Run at most two commands at a time.
+            t0 = time.monotonic()
+            ackcmds = await cmd.start_many(
+                data_list, timeout=STD_TIMEOUT, max_in_flight=2
+            )
+            measured_duration = time.monotonic() - t0
+            assert len(ackcmds) == num_commands
+            for ackcmd in ackcmds:
+                assert ackcmd.ack == salobj.SalRetCode.CMD_COMPLETE
+            seq_nums = [ackcmd.private_seqNum for ackcmd in ackcmds]
+            for seq_num in seq_nums:
+                assert cmd.min_seq_num <= seq_num <= cmd.max_seq_num
+            if max(seq_nums) < cmd.max_seq_num:
+                assert seq_nums == list(range(seq_nums[0], seq_nums[0] + num_commands))
+            assert measured_duration == pytest.approx(duration * 2, abs=1)
+            assert not self.remote.salinfo._running_cmds
+
+            # The CSC rejects the commands when it is not enabled.
+            await self.remote.cmd_disable.start(timeout=STD_TIMEOUT)
+            results = await cmd.start_many(
+                data_list, timeout=STD_TIMEOUT, return_exceptions=True
+            )
+            assert len(results) == num_commands
+            for result in results:
+                assert isinstance(result, salobj.AckError)
+            with pytest.raises(salobj.AckError):
+                await cmd.start_many(data_list, timeout=STD_TIMEOUT)
+            assert not self.remote.salinfo._running_cmds
+
+    async def test_max_concurrent_callbacks(self) -> None:
+        """Test that max_concurrent_callbacks limits how many instances
+        of the same command run at the same time.
+        """
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            assert self.csc.cmd_wait.max_concurrent_callbacks is None
+            with pytest.raises(ValueError):
+                self.csc.cmd_wait.max_concurrent_callbacks = 0
+            # The new limit takes effect without setting the callback again.
+            assert self.csc.cmd_wait.has_callback
+            self.csc.cmd_wait.max_concurrent_callbacks = 2
+            assert self.csc.cmd_wait.max_concurrent_callbacks == 2
+            assert self.csc.cmd_wait.num_running_callbacks == 0
+
+            duration = 2  # seconds
+            num_commands = 3
+            tasks = []
+            for _ in range(num_commands):
+                task = asyncio.create_task(
+                    self.remote.cmd_wait.set_start(
+                        duration=duration,
+                        timeout=STD_TIMEOUT + duration * num_commands,
+                    )
+                )
+                # make sure the command is sent before the command data
+                # is modified by the next loop iteration
+                await asyncio.sleep(0)
+                tasks.append(task)
+            t0 = time.monotonic()
+            await asyncio.sleep(duration / 2)
+            assert self.csc.cmd_wait.num_running_callbacks == 2
+            assert self.csc.cmd_wait.nqueued == 1
+            ackcmds = await asyncio.gather(*tasks)
+            measured_duration = time.monotonic() - t0
+            for ackcmd in ackcmds:
+                assert ackcmd.ack == salobj.SalRetCode.CMD_COMPLETE
+            assert self.csc.cmd_wait.num_running_callbacks == 0
+
+            expected_duration = duration * 2
+            assert abs(measured_duration - expected_duration) < 1
+
+    async def test_change_max_concurrent_callbacks(self) -> None:
+        """Test that changing max_concurrent_callbacks while messages
+        are queued does not lose any messages.
+        """
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            read_topic = self.remote.evt_scalars
+            int0_values: list[int] = []
+
+            async def callback(data: typing.Any) -> None:
+                await asyncio.sleep(0)
+                int0_values.append(data.int0)
+
+            read_topic.allow_multiple_callbacks = True
+            read_topic.callback = callback
+            # Let the callback loop start waiting for data.
+            await asyncio.sleep(0)
+            num_messages = 0
+            for max_concurrent in (1, None, 2, None, 1, None):
+                # Queue messages and change the limit before
+                # the callback loop or workers can run.
+                read_topic._queue_data(
+                    [read_topic.DataType(int0=num_messages + i) for i in range(3)]
+                )
+                num_messages += 3
+                read_topic.max_concurrent_callbacks = max_concurrent
+                await asyncio.sleep(0)
+
+            async def wait_for_all_messages() -> None:
+                while len(int0_values) < num_messages:
+                    await asyncio.sleep(0.01)
+
+            await asyncio.wait_for(wait_for_all_messages(), timeout=STD_TIMEOUT)
+            assert sorted(int0_values) == list(range(num_messages))
+            assert read_topic.nqueued == 0
+
+    async def test_command_scheduler(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            scheduler = self.csc.command_scheduler
+            scheduler.add_command(self.csc.cmd_wait, max_concurrent=1)
+            scheduler.add_command(self.csc.cmd_setScalars, urgent=True)
+
+            duration = 2  # seconds
+            num_waits = 2
+            wait_tasks = []
+            for _ in range(num_waits):
+                wait_tasks.append(
+                    asyncio.create_task(
+                        self.remote.cmd_wait.set_start(
+                            duration=duration,
+                            timeout=STD_TIMEOUT + duration * num_waits,
+                        )
+                    )
+                )
+                await asyncio.sleep(0)
+            t0 = time.monotonic()
+            await asyncio.sleep(duration / 2)
+            assert scheduler.queue_depths == dict(cmd_wait=1)
+
+            # The urgent command does not wait for the queued wait commands.
+            await self.remote.cmd_setScalars.set_start(int0=5, timeout=STD_TIMEOUT)
+            assert time.monotonic() - t0 < duration
+
+            await asyncio.gather(*wait_tasks)
+            measured_duration = time.monotonic() - t0
+            assert measured_duration == pytest.approx(duration * num_waits, abs=1)
+            assert scheduler.max_queue_depth == 1
+            assert scheduler.num_scheduled == num_waits + 1
+
     async def test_multiple_sequential_commands(self) -> None:
         """Test that commands prohibiting multiple callbacks are executed
         one after the other.
@@ -1279,6 +1941,56 @@ class TopicsTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     duration=-5, wait_done=False, timeout=NO_DATA_TIMEOUT
                 )
 
+    async def test_command_start_stream(self) -> None:
+        async with self.make_csc(initial_state=salobj.State.ENABLED):
+            cmd = self.remote.cmd_wait
+            duration = 0.1  # Arbitrary short value so the test runs quickly
+            ackcmds = [
+                ackcmd
+                async for ackcmd in cmd.start_stream(
+                    cmd.DataType(duration=duration), timeout=STD_TIMEOUT
+                )
+            ]
+            assert [ackcmd.ack for ackcmd in ackcmds] == [
+                salobj.SalRetCode.CMD_INPROGRESS,
+                salobj.SalRetCode.CMD_COMPLETE,
+            ]
+            assert ackcmds[0].timeout == pytest.approx(duration)
+            assert not self.remote.salinfo._running_cmds
+
+            # Specify a negative duration to avoid the
+            # CMD_INPROGRESS command ack that extends the timeout.
+            with salobj.assertRaisesAckTimeoutError():
+                async for ackcmd in cmd.start_stream(
+                    cmd.DataType(duration=-5), timeout=NO_DATA_TIMEOUT
+                ):
+                    pass
+            assert not self.remote.salinfo._running_cmds
+
+            # Closing the stream after breaking out early
+            # stops tracking the command and disarms its deadline.
+            async with contextlib.aclosing(
+                cmd.start_stream(cmd.DataType(duration=duration), timeout=STD_TIMEOUT)
+            ) as ackcmd_stream:
+                async for ackcmd in ackcmd_stream:
+                    assert ackcmd.ack == salobj.SalRetCode.CMD_INPROGRESS
+                    assert len(self.remote.salinfo._running_cmds) == 1
+                    break
+            assert not self.remote.salinfo._running_cmds
+            assert all(
+                entry[-1] is None for entry in self.remote.salinfo._ack_deadlines
+            )
+            # Let the command finish, so it does not affect what follows.
+            await asyncio.sleep(duration + EVENT_DELAY)
+
+            # A failed command raises AckError.
+            await self.remote.cmd_disable.start(timeout=STD_TIMEOUT)
+            with salobj.assertRaisesAckError():
+                async for ackcmd in cmd.start_stream(
+                    cmd.DataType(duration=duration), timeout=STD_TIMEOUT
+                ):
+                    pass
+
     async def test_command_seq_num(self) -> None:
         async with self.make_csc(initial_state=salobj.State.ENABLED):
             prev_max_seq_num = None